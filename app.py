@@ -1,27 +1,59 @@
 import os
 import json
 import asyncio
-import base64
+import audio_protocol
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 from fastapi.staticfiles import StaticFiles
 from dotenv import load_dotenv
-from interview_agent import InterviewAgent
+from interview_agent import InterviewAgent, TTS_MODEL, tts_flights, extraction_flights
+from tts_cache import TTSCache
+from extraction_cache import ExtractionCache
+from session_store import create_session_store
+from session_lifecycle import SessionLifecycle
+from replay_buffer import ReplayBuffer
+from single_flight import SingleFlight, SingleFlightConflict, payload_hash
+from model_router import ModelRouter, parse_mapping
+from deadlines import CallPolicy, DeadlineExceeded, deadline
+from job_postings import JobPostingRegistry
+from client_pool import ClientPool, CHAT_MODEL
+from stub_backends import StubBackends
+from call_scheduler import CallScheduler, SchedulerBusy
 import uvicorn
-from typing import Dict, Any, Set
+from typing import Callable, Dict, Any, Set, List, Optional, Union
 import time
-from PyPDF2 import PdfReader
-from io import BytesIO
+import uuid
+from resume_ingest import ResumeIngestor, ResumeIngestionError
+from observability import (REGISTRY, STAGE_SECONDS, RESUME_BYTES, WS_MESSAGES_SENT, WS_BYTES_SENT,
+                           get_logger, get_sampled_logger)
 
 # Load environment variables
 load_dotenv()
 
-app = FastAPI()
+logger = get_logger("app")
+# Per-message logs (connects, received events) are sampled so they stay off the hot path
+hot_logger = get_sampled_logger("app")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    reaper = asyncio.create_task(reap_sessions())
+    yield
+    reaper.cancel()
+    await job_postings.close()
+    live_sessions.close()
+    resume_ingestor.shutdown()
+    await client_pool.aclose()
+
+app = FastAPI(lifespan=lifespan)
 
 # Get the port from environment variable (Railway sets this)
 PORT = int(os.getenv("PORT", 8000))
 
+# Time the closing message gets to play before the feedback is sent
+CLOSING_PLAYBACK_SECONDS = float(os.getenv("CLOSING_PLAYBACK_SECONDS", 5))
+
 # Configure CORS
 app.add_middleware(
     CORSMiddleware,
@@ -31,112 +63,424 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Dictionary to store active interview sessions
-interview_sessions = {}
+# Serialized session state shared by all workers, so a reconnect can land anywhere
+session_store = create_session_store(
+    os.getenv("SESSION_STORE", "memory"),
+    path=os.getenv("SESSION_DB_PATH", "sessions.db"),
+    ttl_seconds=float(os.getenv("SESSION_TTL_SECONDS", 2 * 60 * 60))
+)
+
+# TTS audio shared by every session; closings and intros repeat a lot across candidates
+tts_cache = TTSCache(
+    max_bytes=int(os.getenv("TTS_CACHE_MAX_BYTES", 64 * 1024 * 1024)),
+    disk_dir=os.getenv("TTS_CACHE_DIR") or None
+)
+
+# PDF parsing runs in a process pool with page, byte and time limits
+resume_ingestor = ResumeIngestor(
+    max_workers=int(os.getenv("RESUME_WORKERS", 2)),
+    max_bytes=int(os.getenv("RESUME_MAX_BYTES", 10 * 1024 * 1024)),
+    max_pages=int(os.getenv("RESUME_MAX_PAGES", 20)),
+    timeout_seconds=float(os.getenv("RESUME_TIMEOUT_SECONDS", 15))
+)
+
+# Personal information extracted per resume, so reconnects and retries skip the GPT-4 call
+extraction_cache = ExtractionCache(
+    max_entries=int(os.getenv("EXTRACTION_CACHE_MAX_ENTRIES", 1000)),
+    ttl_seconds=float(os.getenv("EXTRACTION_CACHE_TTL_SECONDS", 24 * 60 * 60))
+)
+
+# OpenAI clients shared by every session, with a bounded pool of keep-alive connections,
+# or local stubs (MODEL_BACKEND=stub) for load tests
+http2_setting = os.getenv("OPENAI_HTTP2")
+if os.getenv("MODEL_BACKEND", "openai") == "stub":
+    client_pool = StubBackends.from_env(model_name=CHAT_MODEL)
+else:
+    client_pool = ClientPool(
+        max_connections=int(os.getenv("OPENAI_MAX_CONNECTIONS", 100)),
+        max_keepalive_connections=int(os.getenv("OPENAI_MAX_KEEPALIVE_CONNECTIONS", 20)),
+        http2=None if http2_setting is None else http2_setting.lower() in ("1", "true", "yes")
+    )
+
+# Chat model tiers, from the most capable to the fastest, the tier each prompt kind uses and
+# the latency budgets (seconds, p90) past which a kind falls back to a faster tier
+model_tiers = parse_mapping(os.getenv("LLM_TIERS", f"quality={CHAT_MODEL},fast=gpt-3.5-turbo"))
+router = ModelRouter(
+    model_tiers,
+    lambda model_name: client_pool.chat_model(model_name),
+    routes=parse_mapping(os.getenv("LLM_ROUTES", "extraction=fast,analysis=fast,closing=fast,repair=fast")),
+    budgets={kind: float(seconds) for kind, seconds in parse_mapping(os.getenv(
+        "LLM_LATENCY_BUDGETS", "extraction=4,introduction=8,first_question=5,analysis=4,next_question=5,closing=4"
+    )).items()},
+    window_seconds=float(os.getenv("LLM_ROUTING_WINDOW_SECONDS", 60))
+)
+
+# Every outbound model call queues here: per-model rate limits, priorities and fairness
+chat_limits = {
+    'requests_per_second': float(os.getenv("LLM_REQUESTS_PER_SECOND", 8)),
+    'burst': float(os.getenv("LLM_BURST", 16)),
+    'max_concurrency': int(os.getenv("LLM_MAX_CONCURRENCY", 32))
+}
+scheduler = CallScheduler(
+    limits={
+        **{model_name: chat_limits for model_name in {CHAT_MODEL, *model_tiers.values()}},
+        TTS_MODEL: {
+            'requests_per_second': float(os.getenv("TTS_REQUESTS_PER_SECOND", 8)),
+            'burst': float(os.getenv("TTS_BURST", 16)),
+            'max_concurrency': int(os.getenv("TTS_MAX_CONCURRENCY", 32))
+        }
+    },
+    max_queue=int(os.getenv("SCHEDULER_MAX_QUEUE", 500))
+)
+
+# How extraction and feedback calls ask for JSON: function (forced function call), json_schema
+# (strict structured outputs, newer models only), json_object or none
+STRUCTURED_OUTPUT = os.getenv("STRUCTURED_OUTPUT", "function")
+
+# Every event gets a deadline that all of its model and TTS calls share. Within it, each call
+# has a timeout, is hedged with a duplicate once slower than the recent p95 and is retried
+# a bounded number of times
+TURN_DEADLINE_SECONDS = float(os.getenv("TURN_DEADLINE_SECONDS", 45))
+hedge_percentile = float(os.getenv("HEDGE_PERCENTILE", 0.95))
+call_retries = int(os.getenv("CALL_MAX_RETRIES", 1))
+llm_policy = CallPolicy("llm", timeout=float(os.getenv("LLM_TIMEOUT_SECONDS", 20)), max_retries=call_retries,
+                        hedge_percentile=hedge_percentile)
+tts_policy = CallPolicy("tts", timeout=float(os.getenv("TTS_TIMEOUT_SECONDS", 10)), max_retries=call_retries,
+                        hedge_percentile=hedge_percentile)
+
+# Per job description: a requirements digest that replaces the raw description in prompts and a
+# bank of seed questions with cached audio, built in the background and shared by every candidate
+job_postings = JobPostingRegistry(
+    lambda job_description: InterviewAgent(
+        job_description, "", tts_cache=tts_cache, client_pool=client_pool, scheduler=scheduler,
+        session_id="job-postings", router=router, llm_policy=llm_policy, tts_policy=tts_policy,
+        structured_output=STRUCTURED_OUTPUT
+    ),
+    bank_size=int(os.getenv("JOB_BANK_SIZE", 8)),
+    max_postings=int(os.getenv("JOB_POSTINGS_MAX", 200)),
+    build_after=int(os.getenv("JOB_POSTING_BUILD_AFTER", 1))
+)
+JOB_BANK_QUESTIONS = int(os.getenv("JOB_BANK_QUESTIONS", 2))
+
+# A start_interview or submit_answer that arrives (e.g. over a second socket) while the same
+# client's identical request is still running waits for that one instead of running again
+session_flights = SingleFlight("session")
+
+# Clients that asked for streamed question audio (question_chunk / question_end events)
+streaming_clients: Set[str] = set()
+
+def session_state(client_id: str, interview_agent: InterviewAgent) -> Dict[str, Any]:
+    """What is saved for a session, in the session store and when it is spilled to disk"""
+    return {
+        'agent': interview_agent.to_state(),
+        'stream': client_id in streaming_clients,
+        'revision': live_sessions.revision(client_id)
+    }
+
+# Live interview agents in this worker, expired when idle and spilled to disk under memory
+# pressure; the session store is the source of truth
+live_sessions = SessionLifecycle(
+    session_state,
+    idle_seconds=float(os.getenv("SESSION_IDLE_SECONDS", 30 * 60)),
+    max_bytes=int(os.getenv("SESSION_MEMORY_MAX_BYTES", 256 * 1024 * 1024)),
+    spill_dir=os.getenv("SESSION_SPILL_DIR", "session_spill")
+)
+
+async def reap_sessions():
+    """Background task expiring idle live sessions and purging expired stored ones"""
+    interval = float(os.getenv("SESSION_REAP_INTERVAL_SECONDS", 30))
+    while True:
+        await live_sessions.wait_for_reap(interval)
+        try:
+            expired = await live_sessions.reap()
+            for client_id in expired:
+                streaming_clients.discard(client_id)
+            await session_store.purge_expired()
+        except Exception as e:
+            logger.error("Error reaping sessions: %s", e)
+
+class Connection:
+    """One client's socket, with its bounded outbound queue and the writer task draining it"""
+    
+    def __init__(self, client_id: str, websocket: WebSocket, audio_encoding: str, max_queue: int):
+        self.client_id = client_id
+        self.websocket = websocket
+        self.audio_encoding = audio_encoding
+        self.queue: asyncio.Queue = asyncio.Queue(max_queue)
+        self.writer: Optional[asyncio.Task] = None
+        self.open = True
 
 class ConnectionManager:
-    def __init__(self):
-        self.active_connections: Dict[str, WebSocket] = {}
-        self.connection_locks: Dict[str, asyncio.Lock] = {}
-        self.connection_status: Dict[str, bool] = {}
-        self.global_lock = asyncio.Lock()  # Add global lock for connection management
+    def __init__(self, max_queue: int = 64, send_timeout: float = 5.0, grace_seconds: float = 120.0,
+                 replay_events: int = 32, replay_bytes: int = 8 * 1024 * 1024,
+                 on_expire: Optional[Callable[[str], None]] = None):
+        """
+        Initialize the manager
+        
+        Args:
+            max_queue (int): Outbound messages buffered per connection
+            send_timeout (float): Seconds a sender waits for room in a full queue before the
+                client is treated as a slow consumer and disconnected
+            grace_seconds (float): How long a disconnected client's replay buffer is kept
+                for a reconnect
+            replay_events (int): Outbound events kept per client for replay
+            replay_bytes (int): Audio bytes kept per client for replay
+            on_expire: Called with the client id when the grace period ends without a reconnect
+        """
+        # Only touched from the event loop, between awaits, so no lock is needed
+        self.connections: Dict[str, Connection] = {}
+        self.max_queue = max_queue
+        self.send_timeout = send_timeout
+        self.slow_consumers = 0
+        self.grace_seconds = grace_seconds
+        self.replay_events = replay_events
+        self.replay_bytes = replay_bytes
+        self.on_expire = on_expire
+        self.replay_buffers: Dict[str, ReplayBuffer] = {}
+        self.grace_timers: Dict[str, asyncio.Task] = {}
+        self.counts = {"resumed": 0, "replayed_events": 0, "replay_gaps": 0}
     
-    async def connect(self, websocket: WebSocket, client_id: str):
+    async def connect(self, websocket: WebSocket, client_id: str, audio_encoding: str = audio_protocol.BASE64,
+                      last_seq: Optional[int] = None):
+        """
+        Accept a connection; with the last seq the client saw, replay the events it missed
+        """
         try:
-            print(f"Attempting to connect client {client_id}")
-            
-            # Use global lock for connection management
-            async with self.global_lock:
-                # Create a lock for this client if it doesn't exist
-                if client_id not in self.connection_locks:
-                    print(f"Creating new connection lock for client {client_id}")
-                    self.connection_locks[client_id] = asyncio.Lock()
-                
-                # Check if there's an existing connection
-                if client_id in self.active_connections:
-                    print(f"Found existing connection for client {client_id}, cleaning up")
-                    try:
-                        # Try to close the existing connection gracefully
-                        await self.active_connections[client_id].close()
-                    except Exception as e:
-                        print(f"Error closing existing connection for client {client_id}: {str(e)}")
-                    self.disconnect(client_id)
-                
-                print(f"Accepting WebSocket connection for client {client_id}")
-                # Accept the connection
-                await websocket.accept()
-                
-                # Store the connection
-                self.active_connections[client_id] = websocket
-                self.connection_status[client_id] = True
-                
-                print(f"Connection established for client {client_id}")
-                
-                # Send initial connection success message
-                print(f"Sending connection confirmation to client {client_id}")
-                await self.send_personal_message({
-                    "event": "connection_established",
-                    "data": {"client_id": client_id}
-                }, client_id)
-                
+            await websocket.accept()
         except Exception as e:
-            print(f"Error during connection for client {client_id}: {str(e)}")
-            self.disconnect(client_id)
+            logger.error("Error accepting connection for client %s: %s", client_id, e)
             raise HTTPException(status_code=500, detail="Failed to establish connection")
+        
+        connection = Connection(client_id, websocket, audio_protocol.negotiate_encoding(audio_encoding), self.max_queue)
+        previous = self.connections.get(client_id)
+        self.connections[client_id] = connection
+        connection.writer = asyncio.create_task(self._write(connection))
+        if previous is not None:
+            # A reconnect replaces the old socket; close it without holding up this one
+            hot_logger.info("Replacing existing connection for client %s", client_id)
+            asyncio.create_task(self._close(previous))
+        timer = self.grace_timers.pop(client_id, None)
+        if timer is not None:
+            timer.cancel()
+        hot_logger.info("Connection established for client %s", client_id)
+        
+        buffer = self.replay_buffers.setdefault(client_id, ReplayBuffer(self.replay_events, self.replay_bytes))
+        missed = buffer.since(last_seq) if last_seq is not None else []
+        if missed is None:
+            self.counts["replay_gaps"] += 1
+        elif last_seq is not None:
+            self.counts["resumed"] += 1
+            self.counts["replayed_events"] += len(missed)
+        
+        # Send initial connection success message, confirming the audio encoding, then the
+        # missed events, as one queue item so nothing sent meanwhile gets in between
+        frames = [{
+            "event": "connection_established",
+            "data": {
+                "client_id": client_id,
+                "audio_encoding": connection.audio_encoding,
+                "audio_encodings": list(audio_protocol.AUDIO_ENCODINGS),
+                "last_seq": buffer.last_seq,
+                "resumed": last_seq is not None and missed is not None,
+                "replayed": len(missed or [])
+            }
+        }]
+        for _, message, audio, audio_field in missed or []:
+            frames.extend(self._frames(connection, message, audio, audio_field))
+        await self._send_frames(frames, connection)
     
-    def disconnect(self, client_id: str):
-        print(f"Disconnecting client {client_id}")
-        self.connection_status[client_id] = False
-        if client_id in self.active_connections:
-            print(f"Removing active connection for client {client_id}")
-            del self.active_connections[client_id]
-        if client_id in self.connection_locks:
-            print(f"Removing connection lock for client {client_id}")
-            del self.connection_locks[client_id]
-        print(f"Connection cleanup completed for client {client_id}")
+    def is_connected(self, client_id: str, websocket: Optional[WebSocket] = None) -> bool:
+        """Whether the client is connected (through this socket, if one is given)"""
+        connection = self.connections.get(client_id)
+        return connection is not None and connection.open and (websocket is None or connection.websocket is websocket)
     
-    async def send_personal_message(self, message: Dict[str, Any], client_id: str):
-        if not self.connection_status.get(client_id, False):
-            print(f"Connection not active for client {client_id}")
-            return False
-            
-        if client_id not in self.active_connections:
-            print(f"No active connection for client {client_id}")
-            return False
-            
-        if client_id not in self.connection_locks:
-            print(f"No connection lock for client {client_id}")
-            return False
-            
+    def disconnect(self, client_id: str, websocket: Optional[WebSocket] = None):
+        """
+        Forget the client's connection (only if it is still this socket, when one is given)
+        
+        The client's replay buffer is kept for the grace period, so it can reconnect and resume.
+        """
+        connection = self.connections.get(client_id)
+        if connection is None or (websocket is not None and connection.websocket is not websocket):
+            return
+        del self.connections[client_id]
+        connection.open = False
+        if connection.writer:
+            connection.writer.cancel()
+        if client_id not in self.grace_timers:
+            self.grace_timers[client_id] = asyncio.create_task(self._expire_after_grace(client_id))
+        hot_logger.info("Disconnected client %s", client_id)
+    
+    async def _expire_after_grace(self, client_id: str):
+        await asyncio.sleep(self.grace_seconds)
+        del self.grace_timers[client_id]
+        self.replay_buffers.pop(client_id, None)
+        if self.on_expire:
+            self.on_expire(client_id)
+    
+    async def _close(self, connection: Connection):
+        connection.open = False
+        if connection.writer:
+            connection.writer.cancel()
         try:
-            async with self.connection_locks[client_id]:
-                if client_id in self.active_connections and self.connection_status.get(client_id, False):
-                    print(f"Sending message to client {client_id}: {message}")
-                    await self.active_connections[client_id].send_json(message)
-                    return True
-                else:
-                    print(f"Connection not ready for client {client_id}")
-                    return False
+            await connection.websocket.close()
         except Exception as e:
-            print(f"Error sending message to client {client_id}: {str(e)}")
-            self.disconnect(client_id)
+            hot_logger.info("Error closing connection for client %s: %s", connection.client_id, e)
+    
+    async def flush(self, client_id: str):
+        """Wait until everything queued for the client has been written"""
+        connection = self.connections.get(client_id)
+        if connection is not None and connection.open:
+            await connection.queue.join()
+    
+    async def send_personal_message(self, message: Dict[str, Any], client_id: str):
+        return await self._send_event(client_id, message)
+    
+    async def send_audio_message(self, message: Dict[str, Any], audio: bytes, client_id: str,
+                                 audio_field: str = 'question'):
+        """
+        Send an event that carries question audio, in the client's negotiated encoding
+        
+        In base64 mode the audio is embedded in message["data"][audio_field]. In binary
+        mode that field is left empty and the raw audio follows as a binary frame.
+        """
+        return await self._send_event(client_id, message, audio, audio_field)
+    
+    async def _send_event(self, client_id: str, message: Dict[str, Any], audio: Optional[bytes] = None,
+                          audio_field: Optional[str] = None) -> bool:
+        """Number the event and keep it for replay, then send it if the client is connected"""
+        buffer = self.replay_buffers.setdefault(client_id, ReplayBuffer(self.replay_events, self.replay_bytes))
+        buffer.append(message, audio, audio_field)
+        connection = self.connections.get(client_id)
+        if connection is None or not connection.open:
+            hot_logger.info("No active connection for client %s, %s kept for replay", client_id, message.get("event"))
             return False
+        return await self._send_frames(self._frames(connection, message, audio, audio_field), connection)
+    
+    def _frames(self, connection: Connection, message: Dict[str, Any], audio: Optional[bytes],
+                audio_field: Optional[str]) -> List[Union[Dict[str, Any], bytes]]:
+        """The frames carrying an event (and its audio) in the connection's audio encoding"""
+        if audio is None:
+            return [message]
+        message = {**message, "data": dict(message["data"])}
+        data = message["data"]
+        if connection.audio_encoding == audio_protocol.BINARY:
+            data[audio_field] = None
+            data['audio_bytes'] = len(audio)
+            frame = audio_protocol.encode_audio_frame(
+                message["event"], data.get('question_number') or 0, data.get('index', 0), audio
+            )
+            return [message, frame]
+        
+        with STAGE_SECONDS.time(stage="base64_encode"):
+            data[audio_field] = audio_protocol.encode_base64_audio(audio)
+        return [message]
+    
+    async def _send_frames(self, frames: List[Union[Dict[str, Any], bytes]], connection: Connection) -> bool:
+        """
+        Queue JSON and binary frames to be written back to back by the connection's writer task
+        
+        Returns as soon as the frames are queued. If the queue stays full for send_timeout
+        seconds the client is a slow consumer and is disconnected.
+        """
+        try:
+            connection.queue.put_nowait(frames)
+        except asyncio.QueueFull:
+            try:
+                await asyncio.wait_for(connection.queue.put(frames), self.send_timeout)
+            except asyncio.TimeoutError:
+                logger.warning("Client %s is not keeping up (%d messages queued), disconnecting",
+                               connection.client_id, connection.queue.qsize())
+                self.slow_consumers += 1
+                self.disconnect(connection.client_id, connection.websocket)
+                await self._close(connection)
+                return False
+        return True
+    
+    async def _write(self, connection: Connection):
+        """Writer task: send queued frames in order until the connection goes away"""
+        while True:
+            frames = await connection.queue.get()
+            try:
+                with STAGE_SECONDS.time(stage="ws_send"):
+                    for frame in frames:
+                        if isinstance(frame, bytes):
+                            await connection.websocket.send_bytes(frame)
+                            WS_BYTES_SENT.inc(len(frame), frame="binary")
+                            WS_MESSAGES_SENT.inc(event="audio_frame")
+                        else:
+                            # Serialized as starlette's send_json does, so the size can be counted
+                            text = json.dumps(frame, separators=(",", ":"), ensure_ascii=False)
+                            await connection.websocket.send_text(text)
+                            WS_BYTES_SENT.inc(len(text), frame="json")
+                            WS_MESSAGES_SENT.inc(event=frame.get("event"))
+            except Exception as e:
+                logger.warning("Error sending message to client %s: %s", connection.client_id, e)
+                self.disconnect(connection.client_id, connection.websocket)
+                return
+            finally:
+                connection.queue.task_done()
+    
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "connections": len(self.connections),
+            "queued_messages": sum(connection.queue.qsize() for connection in self.connections.values()),
+            "slow_consumers": self.slow_consumers,
+            "replay_buffers": len(self.replay_buffers),
+            **self.counts
+        }
 
-manager = ConnectionManager()
+def end_session(client_id: str):
+    """Drop the live agent of a client that did not come back within the grace period"""
+    live_sessions.remove(client_id)
+    streaming_clients.discard(client_id)
+
+manager = ConnectionManager(
+    max_queue=int(os.getenv("WS_SEND_QUEUE", 64)),
+    send_timeout=float(os.getenv("WS_SEND_TIMEOUT_SECONDS", 5)),
+    grace_seconds=float(os.getenv("RESUME_GRACE_SECONDS", 120)),
+    replay_events=int(os.getenv("REPLAY_BUFFER_EVENTS", 32)),
+    replay_bytes=int(os.getenv("REPLAY_BUFFER_MAX_BYTES", 8 * 1024 * 1024)),
+    on_expire=end_session
+)
 
 @app.get("/")
 async def index():
     return {"status": "API is running"}
 
+@app.get("/stats")
+async def stats():
+    return {
+        "live_sessions": live_sessions.stats(),
+        "tts_cache": tts_cache.stats(),
+        "extraction_cache": extraction_cache.stats(),
+        "client_pool": client_pool.stats(),
+        "scheduler": scheduler.stats(),
+        "router": router.stats(),
+        "call_policies": {'llm': llm_policy.stats(), 'tts': tts_policy.stats()},
+        "job_postings": job_postings.stats(),
+        "single_flight": {
+            "session": session_flights.stats(),
+            "tts": tts_flights.stats(),
+            "extraction": extraction_flights.stats()
+        },
+        "connections": manager.stats()
+    }
+
+@app.get("/metrics")
+async def metrics():
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4")
+
 @app.websocket("/ws/{client_id}")
 async def websocket_endpoint(websocket: WebSocket, client_id: str):
     try:
-        print(f"WebSocket endpoint called for client {client_id}")
-        await manager.connect(websocket, client_id)
+        # A reconnect passes the last seq it received to have the missed events replayed
+        last_seq = websocket.query_params.get("last_seq")
+        await manager.connect(websocket, client_id, websocket.query_params.get("audio", audio_protocol.BASE64),
+                              int(last_seq) if last_seq and last_seq.isdigit() else None)
         
-        while manager.connection_status.get(client_id, False):
+        while manager.is_connected(client_id, websocket):
             try:
-                print(f"Waiting for message from client {client_id}")
                 # Handle JSON messages
                 message = await websocket.receive_text()
                 
@@ -145,79 +489,238 @@ async def websocket_endpoint(websocket: WebSocket, client_id: str):
                     event = data.get("event")
                     payload = data.get("data", {})
                     
-                    print(f"Received message from client {client_id}: {event} : {payload}")
+                    # Event name and size only: payloads carry resumes and answers
+                    hot_logger.info("Received %s (%d bytes) from client %s", event, len(message), client_id)
                     
-                    if event == "start_interview":
-                        await handle_start_interview(client_id, payload)
-                    elif event == "submit_answer":
-                        await handle_submit_answer(client_id, payload)
+                    # The turn's deadline reaches every call made for the event, including the
+                    # single-flight task (which copies this context)
+                    async with live_sessions.active(client_id):
+                        with deadline(TURN_DEADLINE_SECONDS):
+                            # Only an identical payload joins the call in flight; a different one is refused
+                            if event == "start_interview":
+                                await session_flights.do((client_id, event),
+                                                         lambda: handle_start_interview(client_id, payload),
+                                                         operation=event, fingerprint=payload_hash(payload))
+                            elif event == "submit_answer":
+                                await session_flights.do((client_id, event),
+                                                         lambda: handle_submit_answer(client_id, payload),
+                                                         operation=event, fingerprint=payload_hash(payload))
                 except json.JSONDecodeError:
-                    print(f"Received invalid JSON from client {client_id}")
+                    logger.warning("Received invalid JSON from client %s", client_id)
                     continue
                     
             except WebSocketDisconnect:
-                print(f"WebSocket disconnected for client {client_id}")
+                hot_logger.info("WebSocket disconnected for client %s", client_id)
                 break
+            except DeadlineExceeded as e:
+                logger.warning("Turn deadline exceeded for client %s: %s", client_id, e)
+                await manager.send_personal_message({
+                    "event": "timeout",
+                    "data": {'message': 'The interviewer took too long to respond, please send that again'}
+                }, client_id)
+            except SingleFlightConflict as e:
+                logger.warning("Refused request from client %s: %s", client_id, e)
+                await manager.send_personal_message({
+                    "event": "error",
+                    "data": {'message': 'A different request is already in progress, please wait for it to finish'}
+                }, client_id)
+            except SchedulerBusy as e:
+                logger.warning("Rejected request from client %s: %s", client_id, e)
+                await manager.send_personal_message({
+                    "event": "busy",
+                    "data": {
+                        'message': 'The server is busy, please retry shortly',
+                        'retry_after': round(e.retry_after, 1)
+                    }
+                }, client_id)
             except Exception as e:
-                print(f"Error processing message for client {client_id}: {str(e)}")
+                logger.exception("Error processing message for client %s", client_id)
                 await manager.send_personal_message({
                     "event": "error",
                     "data": {'message': 'An error occurred while processing your request'}
                 }, client_id)
     except Exception as e:
-        print(f"Error in websocket connection for client {client_id}: {str(e)}")
+        logger.error("Error in websocket connection for client %s: %s", client_id, e)
     finally:
-        print(f"Cleaning up WebSocket connection for client {client_id}")
-        manager.disconnect(client_id)
-        if client_id in interview_sessions:
-            del interview_sessions[client_id]
-        print(f"WebSocket connection cleanup completed for client {client_id}")
+        # The live agent and the replay buffer are kept for the grace period, so a candidate
+        # who lost signal can reconnect and resume (end_session runs if they don't)
+        manager.disconnect(client_id, websocket)
+
+def agent_options(client_id: str) -> Dict[str, Any]:
+    """Constructor arguments shared by new and restored interview agents"""
+    async def notify_queued(info: Dict[str, Any]):
+        # Backpressure: let the client know a call is waiting for a free slot
+        await manager.send_personal_message({
+            "event": "queued",
+            "data": {
+                'position': info['position'],
+                'estimated_wait': round(info['estimated_wait'], 1)
+            }
+        }, client_id)
+    
+    return {
+        'overlap_analysis': True,
+        'speculate_closing': True,
+        'tts_cache': tts_cache,
+        'extraction_cache': extraction_cache,
+        'client_pool': client_pool,
+        'scheduler': scheduler,
+        'session_id': client_id,
+        'router': router,
+        'llm_policy': llm_policy,
+        'tts_policy': tts_policy,
+        'structured_output': STRUCTURED_OUTPUT,
+        'bank_questions': JOB_BANK_QUESTIONS,
+        'on_wait': notify_queued
+    }
+
+async def save_session(client_id: str, interview_agent: InterviewAgent):
+    """Persist the session after a step, once any background analysis has landed"""
+    await interview_agent.await_pending_analyses()
+    state = session_state(client_id, interview_agent)
+    state['revision'] = uuid.uuid4().hex
+    await session_store.save(client_id, state)
+    live_sessions.record(client_id, state)
+
+async def get_session(client_id: str) -> Optional[InterviewAgent]:
+    """
+    Return the live agent for this client, restoring it from the session store if needed
+    
+    With a store shared by several workers, the candidate may have reconnected to another
+    worker and answered there since; the live agent is then stale (its revision is not the
+    stored one) and the stored state is restored instead.
+    """
+    interview_agent = live_sessions.get(client_id)
+    if interview_agent is not None:
+        if not session_store.shared:
+            return interview_agent
+        state = await session_store.load(client_id)
+        if state is None or state.get('revision') == live_sessions.revision(client_id):
+            return interview_agent
+        hot_logger.info("Session for client %s moved on in another worker", client_id)
+    else:
+        # Saved by any worker after every step, so never older than a copy this worker
+        # spilled to disk under memory pressure; the spilled copy is only the fallback
+        spilled = await live_sessions.take_spilled(client_id)
+        state = await session_store.load(client_id) or spilled
+        if state is None:
+            return None
+    
+    hot_logger.info("Restoring session for client %s", client_id)
+    job_posting = job_postings.get(state['agent']['job_description'], new_candidate=False)
+    interview_agent = InterviewAgent.from_state(state['agent'], job_posting=job_posting, **agent_options(client_id))
+    live_sessions.add(client_id, interview_agent, state.get('revision'))
+    if state['stream']:
+        streaming_clients.add(client_id)
+    else:
+        streaming_clients.discard(client_id)
+    return interview_agent
+
+async def stream_question(client_id: str, events) -> Dict[str, Any]:
+    """
+    Forward a streamed question to the client as ordered audio chunks
+    
+    Sends one question_chunk event per synthesized sentence and a final question_end
+    event, and returns the agent's question_end event. A sentence whose speech couldn't
+    be generated is sent as text, flagged with audio_unavailable, as in send_question.
+    """
+    end_event = {}
+    async for event in events:
+        if event["event"] == "question_chunk" and not event['audio']:
+            logger.warning("Sending chunk %d of question %d to client %s without audio", event['index'],
+                           event['question_number'], client_id)
+            await manager.send_personal_message({
+                "event": "question_chunk",
+                "data": {
+                    'question_number': event['question_number'],
+                    'index': event['index'],
+                    'audio': None,
+                    'text': event['text'],
+                    'audio_unavailable': True
+                }
+            }, client_id)
+        elif event["event"] == "question_chunk":
+            await manager.send_audio_message({
+                "event": "question_chunk",
+                "data": {
+                    'question_number': event['question_number'],
+                    'index': event['index']
+                }
+            }, event['audio'], client_id, audio_field='audio')
+        else:
+            end_event = event
+    
+    await manager.send_personal_message({
+        "event": "question_end",
+        "data": {
+            'question_number': end_event['question_number'],
+            'interview_complete': end_event['interview_complete']
+        }
+    }, client_id)
+    return end_event
+
+async def send_question(message: Dict[str, Any], question: str, audio: Optional[bytes], client_id: str):
+    """
+    Send a question event with its audio
+    
+    If the speech couldn't be generated (the TTS call failed or ran out of time) the
+    question is sent as text instead, flagged with audio_unavailable, rather than
+    failing the turn: the question is already part of the interview.
+    """
+    if audio:
+        return await manager.send_audio_message(message, audio, client_id)
+    logger.warning("Sending question %s to client %s without audio", message["data"].get('question_number'), client_id)
+    return await manager.send_personal_message({
+        **message,
+        "data": {**message["data"], 'question': None, 'text': question, 'audio_unavailable': True}
+    }, client_id)
+
+async def send_feedback(client_id: str, interview_agent: InterviewAgent, playback_seconds: float = 0.0):
+    """
+    Send the final feedback and clean up the session
+    
+    The agent starts generating the feedback as soon as the last answer is in, so it
+    overlaps the closing message; it is sent once both are done.
+    """
+    feedback, _ = await asyncio.gather(
+        interview_agent.agenerate_feedback(),
+        asyncio.sleep(playback_seconds)  # let the closing message play
+    )
+    await manager.send_personal_message({
+        "event": "interview_complete",
+        "data": {
+            'message': 'Interview completed',
+            'feedback': feedback
+        }
+    }, client_id)
+    
+    # Clean up the session
+    live_sessions.remove(client_id)
+    await session_store.delete(client_id)
 
 async def handle_start_interview(client_id: str, data: Dict[str, Any]):
     """
     Start a new interview session
     data: {
         "job_description": "...",
-        "resume": "base64 encoded resume string"
+        "resume": "base64 encoded resume string",
+        "stream": true  # optional, stream the question audio sentence by sentence
     }
     """
     job_description = data.get('job_description', '')
     resume_base64 = data.get('resume', '')
     
-    print("Received resume data:", resume_base64[:100] + "..." if len(resume_base64) > 100 else resume_base64)
-    
-    # Decode base64 resume to string
+    # Decode and parse the resume in the worker pool, off the event loop
     try:
-        if not resume_base64:
-            raise ValueError("Empty resume data received")
-            
-        # Remove data URL prefix if present
-        if resume_base64.startswith('data:'):
-            resume_base64 = resume_base64.split(',')[1]
-            
-        # Check if the string is properly padded
-        padding = len(resume_base64) % 4
-        if padding:
-            resume_base64 += '=' * (4 - padding)
-            
-        print("Attempting to decode base64 resume...")
-        # Decode base64 to bytes
-        pdf_bytes = base64.b64decode(resume_base64)
-        
-        # Read PDF content
-        pdf_file = BytesIO(pdf_bytes)
-        pdf_reader = PdfReader(pdf_file)
+        ingested = await resume_ingestor.ingest_base64(resume_base64)
+        resume_text = ingested["text"]
         
-        # Extract text from all pages
-        resume_text = ""
-        for page in pdf_reader.pages:
-            resume_text += page.extract_text() + "\n"
-            
-        print("Successfully decoded resume")
-    except Exception as e:
-        print(f"Error decoding resume: {str(e)}")
-        print(f"Resume data type: {type(resume_base64)}")
-        print(f"Resume data length: {len(resume_base64)}")
+        STAGE_SECONDS.observe(ingested["timings"]["total_seconds"], stage="pdf_parse")
+        RESUME_BYTES.inc(ingested["bytes"])
+        hot_logger.info("Parsed resume for client %s: %d pages, %d bytes in %.0fms", client_id,
+                        ingested['pages'], ingested['bytes'], ingested["timings"]["total_seconds"] * 1000)
+    except ResumeIngestionError as e:
+        logger.warning("Rejected resume from client %s (%d base64 chars): %s", client_id, len(resume_base64), e)
         await manager.send_personal_message({
             "event": "error",
             "data": {'message': f'Invalid resume format: {str(e)}. Please provide a valid PDF resume.'}
@@ -227,27 +730,44 @@ async def handle_start_interview(client_id: str, data: Dict[str, Any]):
     # Create a new interview agent
     interview_agent = InterviewAgent(
         job_description=job_description,
-        resume=resume_text
+        resume=resume_text,
+        job_posting=job_postings.get(job_description),
+        **agent_options(client_id)
     )
     
-    # Store the interview agent in the sessions dictionary
-    interview_sessions[client_id] = interview_agent
+    # Register the interview agent as a live session
+    live_sessions.add(client_id, interview_agent)
+    
+    if data.get('stream', False):
+        streaming_clients.add(client_id)
+        await manager.send_personal_message({
+            "event": "interview_started",
+            "data": {
+                'message': 'Interview started successfully',
+                'question': None,
+                'question_number': 1,
+                'streaming': True
+            }
+        }, client_id)
+        await stream_question(client_id, interview_agent.astream_start_interview())
+        await save_session(client_id, interview_agent)
+        return
     
     # Initialize the interview
-    response = interview_agent.start_interview()
+    response = await interview_agent.astart_interview()
     
-    # Get the audio data from the response
-    audio_data = next((v for k, v in response.items() if k != "question_number"), None)
+    # Get the question and audio data from the response
+    question, audio_data = next(((k, v) for k, v in response.items() if k != "question_number"), (None, None))
     
-    # Send only the audio data to the client
-    await manager.send_personal_message({
+    # Send only the audio data to the client (or the text, if the speech couldn't be generated)
+    await send_question({
         "event": "interview_started",
         "data": {
             'message': 'Interview started successfully',
-            'question': audio_data,
             'question_number': response['question_number']
         }
-    }, client_id)
+    }, question, audio_data, client_id)
+    await save_session(client_id, interview_agent)
 
 async def handle_submit_answer(client_id: str, data: Dict[str, Any]):
     """
@@ -258,69 +778,65 @@ async def handle_submit_answer(client_id: str, data: Dict[str, Any]):
     """
     answer = data.get('answer', '')
     
-    if client_id not in interview_sessions:
+    interview_agent = await get_session(client_id)
+    if interview_agent is None:
         await manager.send_personal_message({
             "event": "error",
             "data": {'message': 'Invalid session or session expired'}
         }, client_id)
         return
     
-    interview_agent = interview_sessions[client_id]
+    if client_id in streaming_clients:
+        end_event = await stream_question(client_id, interview_agent.astream_process_answer(answer))
+        if end_event.get('interview_complete', False):
+            await send_feedback(client_id, interview_agent, CLOSING_PLAYBACK_SECONDS)
+        else:
+            await save_session(client_id, interview_agent)
+        return
     
     # Process the answer and get the next question
-    response = interview_agent.process_answer(answer)
+    response = await interview_agent.aprocess_answer(answer)
     
     if response.get('interview_complete', False):
         # Get the closing message and audio
         closing_message = next((k for k in response.keys() if k != "question_number" and k != "interview_complete"), None)
         closing_audio = response[closing_message] if closing_message else None
+        playback_seconds = 0.0
         
         if closing_message and closing_audio:
             # First send the closing message
-            await manager.send_personal_message({
+            await manager.send_audio_message({
                 "event": "interview_closing",
                 "data": {
                     'message': 'Interview closing',
-                    'question': closing_audio,
                     'question_number': response['question_number']
                 }
-            }, client_id)
-            
-            # Wait a bit to let the closing message play
-            await asyncio.sleep(5)
+            }, closing_audio, client_id)
+            playback_seconds = CLOSING_PLAYBACK_SECONDS
         
-        # Then send the feedback
-        feedback = interview_agent.generate_feedback()
-        await manager.send_personal_message({
-            "event": "interview_complete",
-            "data": {
-                'message': 'Interview completed',
-                'feedback': feedback
-            }
-        }, client_id)
-        
-        # Clean up the session
-        del interview_sessions[client_id]
+        # Then send the feedback (already being generated) once the closing has played
+        await send_feedback(client_id, interview_agent, playback_seconds)
     else:
         # Get the question and audio data from the response
         question = next((k for k in response.keys() if k != "question_number" and k != "interview_complete"), None)
         audio_data = response[question] if question else None
         
-        if not question or not audio_data:
+        if not question:
             await manager.send_personal_message({
                 "event": "error",
                 "data": {'message': 'Error generating next question'}
             }, client_id)
+            await save_session(client_id, interview_agent)
             return
             
         # Send the next question
-        await manager.send_personal_message({
+        await send_question({
             "event": "next_question",
             "data": {
-                'question': audio_data,  # Send the audio data
                 'question_number': response['question_number']
             }
-        }, client_id)
+        }, question, audio_data, client_id)
+        await save_session(client_id, interview_agent)
 
 if __name__ == '__main__':
     uvicorn.run("app:app", host="0.0.0.0", port=PORT, reload=False)  # Set reload to False in production
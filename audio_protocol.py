@@ -0,0 +1,65 @@
+"""
+Wire formats for question audio sent over the WebSocket.
+
+Two encodings are supported and negotiated when the socket connects
+(ws://.../ws/{client_id}?audio=binary):
+
+- "base64": the audio is base64 encoded into the JSON event, as before
+- "binary": the JSON event only carries metadata and is immediately followed by a
+  binary frame made of a fixed 6-byte header and the raw MP3 bytes
+
+Binary header (network byte order):
+    version (uint8) | kind (uint8) | question_number (uint16) | chunk index (uint16)
+"""
+
+import base64
+import struct
+from typing import Dict, Tuple
+from tts_cache import CachedAudio
+
+BASE64 = "base64"
+BINARY = "binary"
+AUDIO_ENCODINGS = (BASE64, BINARY)
+
+PROTOCOL_VERSION = 1
+AUDIO_HEADER = struct.Struct("!BBHH")
+
+# Frame kinds, one per event that carries audio
+AUDIO_FRAME_KINDS: Dict[str, int] = {
+    "interview_started": 1,
+    "next_question": 2,
+    "interview_closing": 3,
+    "question_chunk": 4,
+}
+
+
+def negotiate_encoding(requested: str) -> str:
+    """Return the encoding to use for a client, falling back to base64"""
+    return requested if requested in AUDIO_ENCODINGS else BASE64
+
+
+def encode_base64_audio(audio: bytes) -> str:
+    # Cached audio keeps its encoding, so repeat sends don't re-encode
+    if isinstance(audio, CachedAudio):
+        return audio.base64()
+    return base64.b64encode(audio).decode('utf-8')
+
+
+def encode_audio_frame(event: str, question_number: int, index: int, audio: bytes) -> bytes:
+    """Build a binary audio frame for the given event"""
+    header = AUDIO_HEADER.pack(PROTOCOL_VERSION, AUDIO_FRAME_KINDS[event], question_number, index)
+    return header + audio
+
+
+def decode_audio_frame(frame: bytes) -> Tuple[str, int, int, bytes]:
+    """
+    Parse a binary audio frame (the client side of encode_audio_frame)
+    
+    Returns:
+        Tuple of (event, question_number, index, audio)
+    """
+    version, kind, question_number, index = AUDIO_HEADER.unpack_from(frame)
+    if version != PROTOCOL_VERSION:
+        raise ValueError(f"Unsupported audio frame version: {version}")
+    event = next(name for name, value in AUDIO_FRAME_KINDS.items() if value == kind)
+    return event, question_number, index, frame[AUDIO_HEADER.size:]
@@ -0,0 +1,6 @@
+"""
+Latency and throughput benchmarks for the interview backend.
+Each module runs against the local stub backends and can be run directly, e.g.:
+
+    python -m benchmarks.startup
+"""
@@ -0,0 +1,135 @@
+"""
+Session construction cost and upstream connections, per-session clients vs the shared pool.
+
+A local mock of the OpenAI HTTP API (chat completions and speech) counts the TCP
+connections it accepts. Sessions run concurrently against it, each building an agent,
+starting the interview and answering two questions.
+"""
+
+import asyncio
+import json
+import time
+from langchain.memory import ConversationBufferMemory
+from langchain_openai import ChatOpenAI
+from openai import OpenAI, AsyncOpenAI
+from client_pool import ClientPool
+from interview_agent import InterviewAgent
+from stub_backends import StubChatModel
+from benchmarks.common import JOB_DESCRIPTION, RESUME, ANSWER, Timer
+
+SESSIONS = 50
+SERVER_LATENCY = 0.02
+MAX_CONNECTIONS = 10
+
+
+class MockOpenAIServer:
+    """Minimal HTTP/1.1 keep-alive server speaking just enough of the OpenAI API"""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.connections = 0
+        self.requests = 0
+        self.handlers = set()
+        self.responder = StubChatModel()._default_response
+
+    async def start(self) -> str:
+        self.server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        port = self.server.sockets[0].getsockname()[1]
+        return f"http://127.0.0.1:{port}/v1"
+
+    async def stop(self):
+        self.server.close()
+        for task in self.handlers:
+            task.cancel()
+        await asyncio.gather(*self.handlers, return_exceptions=True)
+        await self.server.wait_closed()
+
+    async def _handle(self, reader, writer):
+        self.connections += 1
+        self.handlers.add(asyncio.current_task())
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                request_line, *header_lines = head.decode("latin-1").split("\r\n")
+                headers = {line.split(":", 1)[0].lower(): line.split(":", 1)[1].strip()
+                           for line in header_lines if ":" in line}
+                body = await reader.readexactly(int(headers.get("content-length", 0)))
+                self.requests += 1
+                await asyncio.sleep(self.latency)
+                content_type, payload = self._respond(request_line.split(" ")[1], json.loads(body or b"{}"))
+                writer.write((f"HTTP/1.1 200 OK\r\nContent-Type: {content_type}\r\n"
+                              f"Content-Length: {len(payload)}\r\n\r\n").encode() + payload)
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            writer.close()
+
+    def _respond(self, path: str, request: dict):
+        if path.endswith("/audio/speech"):
+            return "audio/mpeg", b"ID3" + request["input"].encode()
+        prompt = "\n".join(message["content"] for message in request["messages"])
+        return "application/json", json.dumps({
+            "id": "chatcmpl-mock", "object": "chat.completion", "created": 0, "model": request["model"],
+            "choices": [{"index": 0, "finish_reason": "stop",
+                         "message": {"role": "assistant", "content": self.responder(prompt)}}],
+            "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0}
+        }).encode()
+
+
+def per_session_agent(base_url: str) -> InterviewAgent:
+    """What every session used to build: its own clients (and an unused memory)"""
+    agent = InterviewAgent(
+        JOB_DESCRIPTION, RESUME, max_questions=5,
+        llm=ChatOpenAI(temperature=0.5, model_name="gpt-4", openai_api_key="mock", base_url=base_url),
+        openai_client=OpenAI(api_key="mock", base_url=base_url),
+        async_openai_client=AsyncOpenAI(api_key="mock", base_url=base_url)
+    )
+    agent.memory = ConversationBufferMemory(return_messages=True, output_key="output", input_key="input")
+    return agent
+
+
+async def run(build):
+    server = MockOpenAIServer(SERVER_LATENCY)
+    base_url = await server.start()
+    build_times = []
+
+    async def session():
+        start = time.perf_counter()
+        agent = build(base_url)
+        build_times.append(time.perf_counter() - start)
+        await agent.astart_interview()
+        for _ in range(2):
+            await agent.aprocess_answer(ANSWER)
+        return agent
+
+    with Timer() as timer:
+        agents = await asyncio.gather(*(session() for _ in range(SESSIONS)))
+    # Close each distinct async client while the loop is still running
+    clients = {id(client): client for agent in agents
+               for client in (agent.async_openai_client, agent.llm.async_client._client)}
+    for client in clients.values():
+        await client.close()
+    await server.stop()
+    return sum(build_times) / len(build_times), server.connections, server.requests, timer.elapsed
+
+
+def main():
+    pools = []
+
+    def pooled_agent(base_url: str) -> InterviewAgent:
+        if not pools:
+            pools.append(ClientPool(api_key="mock", base_url=base_url, max_connections=MAX_CONNECTIONS,
+                                    max_keepalive_connections=MAX_CONNECTIONS))
+        return InterviewAgent(JOB_DESCRIPTION, RESUME, max_questions=5, client_pool=pools[0])
+
+    print(f"{SESSIONS} concurrent sessions, {SERVER_LATENCY * 1000:.0f}ms mock API latency")
+    print(f"{'clients':<22} {'build ms':>9} {'connections':>12} {'requests':>9} {'wall s':>7}")
+    for name, build in [("per session", per_session_agent),
+                        (f"shared pool (max {MAX_CONNECTIONS})", pooled_agent)]:
+        build_time, connections, requests, elapsed = asyncio.run(run(build))
+        print(f"{name:<22} {build_time * 1000:>9.2f} {connections:>12} {requests:>9} {elapsed:>7.2f}")
+
+
+if __name__ == "__main__":
+    main()
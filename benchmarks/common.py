@@ -0,0 +1,30 @@
+"""Shared fixtures for the benchmarks"""
+
+import time
+from interview_agent import InterviewAgent
+from stub_backends import StubChatModel, StubSpeechClient, AsyncStubSpeechClient
+from fakes import FakeWebSocket, JOB_DESCRIPTION, RESUME, ANSWER, make_pdf
+
+
+def make_agent(llm_latency: float = 0.0, tts_latency: float = 0.0, agent_class=InterviewAgent,
+               **kwargs) -> InterviewAgent:
+    """Build an InterviewAgent (or subclass) wired to the stub backends"""
+    return agent_class(
+        job_description=JOB_DESCRIPTION,
+        resume=RESUME,
+        llm=StubChatModel(latency=llm_latency),
+        openai_client=StubSpeechClient(latency=tts_latency),
+        async_openai_client=AsyncStubSpeechClient(latency=tts_latency),
+        **kwargs
+    )
+
+
+class Timer:
+    """Context manager that records the elapsed wall time in seconds"""
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.elapsed = time.perf_counter() - self.start
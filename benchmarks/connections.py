@@ -0,0 +1,116 @@
+"""
+Connection setup and outbound fan-out with the ConnectionManager.
+
+Compares the current manager (lock-free registry, one writer task and bounded queue per
+connection) with the previous design, which held a global lock across accept() and
+sent on the handler's own coroutine under a per-client lock. A few clients have a slow
+handshake or read slowly; the rest are fast.
+"""
+
+import asyncio
+import statistics
+import time
+import audio_protocol
+from app import ConnectionManager
+from benchmarks.common import FakeWebSocket
+
+CLIENTS = 2000
+SLOW_HANDSHAKES = 20
+HANDSHAKE_DELAY = 0.1
+FANOUT_CLIENTS = 500
+SLOW_READERS = 5
+READ_DELAY = 0.2
+MESSAGES = 20
+PAYLOAD = "x" * 2048
+
+
+class LegacyConnectionManager:
+    """The previous design, without its logging: global lock on connect, sends on the caller"""
+
+    def __init__(self):
+        self.active_connections = {}
+        self.connection_locks = {}
+        self.connection_status = {}
+        self.global_lock = asyncio.Lock()
+
+    async def connect(self, websocket, client_id: str, audio_encoding: str = audio_protocol.BASE64):
+        async with self.global_lock:
+            if client_id in self.active_connections:
+                await self.active_connections[client_id].close()
+            self.connection_locks.setdefault(client_id, asyncio.Lock())
+            await websocket.accept()
+            self.active_connections[client_id] = websocket
+            self.connection_status[client_id] = True
+            await self.send_personal_message({"event": "connection_established", "data": {}}, client_id)
+
+    async def send_personal_message(self, message, client_id: str):
+        async with self.connection_locks[client_id]:
+            await self.active_connections[client_id].send_json(message)
+        return True
+
+    async def flush(self, client_id: str):
+        pass
+
+
+async def connect_storm(manager_class):
+    manager = manager_class()
+    sockets = [FakeWebSocket(accept_delay=HANDSHAKE_DELAY if number < SLOW_HANDSHAKES else 0.0)
+               for number in range(CLIENTS)]
+    start = time.perf_counter()
+    await asyncio.gather(*(manager.connect(websocket, f"client-{number}") for number, websocket in enumerate(sockets)))
+    elapsed = time.perf_counter() - start
+    await asyncio.gather(*(manager.flush(f"client-{number}") for number in range(CLIENTS)))
+    return elapsed
+
+
+async def fanout(manager_class):
+    manager = manager_class()
+    sockets = [FakeWebSocket() for _ in range(FANOUT_CLIENTS)]
+    for number, websocket in enumerate(sockets):
+        await manager.connect(websocket, f"client-{number}")
+        if number < SLOW_READERS:
+            websocket.send_delay = READ_DELAY
+    handler_latencies = []
+
+    async def handler(client_id: str):
+        # An interview handler sending its events; its latency is time not spent on the interview
+        for index in range(MESSAGES):
+            start = time.perf_counter()
+            await manager.send_personal_message({"event": "question_chunk", "data": {"index": index, "audio": PAYLOAD}},
+                                                client_id)
+            handler_latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(handler(f"client-{number}") for number in range(SLOW_READERS, FANOUT_CLIENTS)))
+    fast_done = time.perf_counter() - start
+    slow_handlers = asyncio.gather(*(handler(f"client-{number}") for number in range(SLOW_READERS)))
+    slow_start = time.perf_counter()
+    await slow_handlers
+    slow_done = time.perf_counter() - slow_start
+    await asyncio.gather(*(manager.flush(f"client-{number}") for number in range(FANOUT_CLIENTS)))
+    sent = sum(len(websocket.frames) for websocket in sockets) - FANOUT_CLIENTS
+    return fast_done, slow_done, sent, handler_latencies
+
+
+def percentile(values, fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def main():
+    print(f"connect: {CLIENTS} clients at once, {SLOW_HANDSHAKES} with a {HANDSHAKE_DELAY * 1000:.0f}ms handshake")
+    print(f"fan-out: {FANOUT_CLIENTS} clients x {MESSAGES} messages of {len(PAYLOAD)} bytes, "
+          f"{SLOW_READERS} reading {READ_DELAY * 1000:.0f}ms per message")
+    for name, manager_class in [("global lock", LegacyConnectionManager), ("writer tasks", ConnectionManager)]:
+        connect_seconds = asyncio.run(connect_storm(manager_class))
+        fast_done, slow_done, sent, latencies = asyncio.run(fanout(manager_class))
+        print(f"{name}:")
+        print(f"  connect: {connect_seconds:.2f}s ({CLIENTS / connect_seconds:.0f} connections/s)")
+        print(f"  fan-out: {sent / (fast_done + slow_done):.0f} messages/s, fast clients' handlers done in "
+              f"{fast_done * 1000:.0f}ms, slow readers' handlers in {slow_done * 1000:.0f}ms")
+        print(f"  handler send latency: p50 {statistics.median(latencies) * 1e6:.0f}us  "
+              f"p99 {percentile(latencies, 0.99) * 1e6:.0f}us  max {max(latencies) * 1000:.0f}ms")
+
+
+if __name__ == "__main__":
+    main()
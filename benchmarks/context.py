@@ -0,0 +1,103 @@
+"""
+Prompt tokens and latency per turn across a full 10-question interview.
+
+Compares the bounded, compact transcript with the original layout: a list of LangChain
+messages (including every prompt that produced an introduction or question) whose repr
+was interpolated into each prompt, and which was appended again to the feedback call.
+The stub model charges prefill time per prompt token, so prompt size shows up as latency.
+
+Both agents make the feedback call only when it is asked for, so it is measured on its
+own row instead of overlapping the last answer.
+"""
+
+import asyncio
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
+from interview_agent import InterviewAgent
+from benchmarks.common import make_agent, Timer, ANSWER
+
+LLM_LATENCY = 0.05
+PROMPT_TOKEN_LATENCY = 0.00002  # 20ms per 1k prompt tokens
+QUESTIONS = 10
+
+
+class BoundedContextAgent(InterviewAgent):
+    """The current prompt layout, with the feedback call deferred until it is measured"""
+
+    def start_feedback(self):
+        pass
+
+    async def agenerate_feedback(self):
+        return await self._agenerate_feedback()
+
+
+class LegacyContextAgent(BoundedContextAgent):
+    """The original message-list layout, kept here for comparison only"""
+
+    def __init__(self, *args, **kwargs):
+        self.legacy_history = []
+        super().__init__(*args, **kwargs)
+
+    def _record_introduction(self, introduction: str):
+        super()._record_introduction(introduction)
+        self.legacy_history.append(SystemMessage(content=self._introduction_prompt(self.personal_info)))
+        self.legacy_history.append(AIMessage(content=introduction))
+
+    def _record_first_question(self, first_question: str):
+        super()._record_first_question(first_question)
+        self.legacy_history.append(SystemMessage(content=self._first_question_prompt()))
+        self.legacy_history.append(AIMessage(content=first_question))
+
+    def _record_answer(self, answer: str, analysis: str):
+        self.legacy_history.append(HumanMessage(content=answer))
+        self.legacy_history.append(SystemMessage(content=analysis))
+        return super()._record_answer(answer, analysis)
+
+    def _record_next_question(self, next_question: str):
+        super()._record_next_question(next_question)
+        self.legacy_history.append(AIMessage(content=next_question))
+
+    def _transcript(self, max_tokens=None) -> str:
+        return str(self.legacy_history)
+
+    def _feedback_messages(self):
+        messages = super()._feedback_messages()
+        assessment = f"PER-QUESTION ASSESSMENT:\n        {self.context.assessment(self.feedback_context_tokens)}"
+        messages[1].content = messages[1].content.replace(
+            assessment, f"CONVERSATION HISTORY:\n        {self.legacy_history}")
+        return messages + self.legacy_history
+
+
+async def run(agent: InterviewAgent):
+    llm = agent.llm
+    rows = []
+    await agent.astart_interview()
+    for turn in range(1, QUESTIONS + 1):
+        calls_before = len(llm.prompt_tokens)
+        with Timer() as timer:
+            await agent.aprocess_answer(ANSWER)
+        rows.append((f"answer {turn}", sum(llm.prompt_tokens[calls_before:]), timer.elapsed))
+    calls_before = len(llm.prompt_tokens)
+    with Timer() as timer:
+        await agent.agenerate_feedback()
+    rows.append(("feedback", sum(llm.prompt_tokens[calls_before:]), timer.elapsed))
+    return rows
+
+
+def build(agent_class):
+    agent = make_agent(LLM_LATENCY, agent_class=agent_class, max_questions=QUESTIONS)
+    agent.llm.prompt_token_latency = PROMPT_TOKEN_LATENCY
+    return agent
+
+
+def main():
+    legacy = asyncio.run(run(build(LegacyContextAgent)))
+    bounded = asyncio.run(run(build(BoundedContextAgent)))
+    print(f"{'turn':<10} {'legacy tokens':>14} {'legacy ms':>10} {'bounded tokens':>15} {'bounded ms':>11}")
+    for (name, old_tokens, old_time), (_, new_tokens, new_time) in zip(legacy, bounded):
+        print(f"{name:<10} {old_tokens:>14} {old_time * 1000:>10.1f} {new_tokens:>15} {new_time * 1000:>11.1f}")
+    print(f"{'total':<10} {sum(r[1] for r in legacy):>14} {sum(r[2] for r in legacy) * 1000:>10.1f} "
+          f"{sum(r[1] for r in bounded):>15} {sum(r[2] for r in bounded) * 1000:>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
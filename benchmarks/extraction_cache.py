@@ -0,0 +1,45 @@
+"""
+Hit rate and saved latency of the resume extraction cache.
+
+Simulates a day of session starts where some candidates reconnect or retry with the
+same PDF, and compares startup time with and without the cache.
+"""
+
+import asyncio
+import random
+from extraction_cache import ExtractionCache
+from benchmarks.common import make_agent, Timer, RESUME
+
+LLM_LATENCY = 0.05
+CANDIDATES = 40
+STARTS = 100
+
+
+async def run(cache):
+    rng = random.Random(7)
+    resumes = [RESUME + f"\nCandidate reference {i}" for i in range(CANDIDATES)]
+    # Every candidate starts once; the remaining starts are retries and reconnects
+    starts = resumes + [rng.choice(resumes) for _ in range(STARTS - CANDIDATES)]
+    rng.shuffle(starts)
+    with Timer() as timer:
+        for resume in starts:
+            agent = make_agent(LLM_LATENCY, extraction_cache=cache, generate_introduction=False)
+            agent.resume = resume
+            await agent.astart_interview()
+    return timer.elapsed
+
+
+def main():
+    uncached = asyncio.run(run(None))
+    cache = ExtractionCache()
+    cached = asyncio.run(run(cache))
+    stats = cache.stats()
+    print(f"{STARTS} starts for {CANDIDATES} distinct resumes, stub LLM latency {LLM_LATENCY * 1000:.0f}ms")
+    print(f"without cache: {uncached / STARTS * 1000:6.1f}ms per start")
+    print(f"with cache:    {cached / STARTS * 1000:6.1f}ms per start")
+    print(f"hit rate {stats['hit_rate']:.0%}, {stats['hits']} extraction calls skipped, "
+          f"{stats['saved_seconds']:.2f}s of model latency saved")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+End-of-interview latency: from the last answer to the feedback reaching the candidate.
+
+Compares the previous flow (closing message, a fixed playback pause, then one feedback
+call over the whole transcript) with incremental feedback (started as soon as the last
+answer is analyzed, over the per-answer assessments, overlapping closing playback).
+"""
+
+import asyncio
+from interview_agent import InterviewAgent
+from conversation_context import estimate_tokens
+from benchmarks.common import make_agent, Timer, ANSWER
+
+LLM_LATENCY = 0.3
+PROMPT_TOKEN_LATENCY = 0.00005  # 50ms per 1k prompt tokens
+PLAYBACK_SECONDS = 1.0  # 5s in production, scaled down
+QUESTIONS = 10
+
+
+class SequentialFeedbackAgent(InterviewAgent):
+    """The pre-change flow, kept here for comparison only"""
+
+    def start_feedback(self):
+        # Feedback only starts when it is asked for
+        pass
+
+    def _feedback_messages(self):
+        messages = super()._feedback_messages()
+        transcript = f"CONVERSATION HISTORY:\n{self._transcript(self.feedback_context_tokens)}"
+        messages[1].content = messages[1].content.replace("PER-QUESTION ASSESSMENT:", transcript)
+        return messages
+
+    async def agenerate_feedback(self):
+        self._feedback_task = None
+        self._feedback_task = asyncio.create_task(self._agenerate_feedback())
+        return await self._feedback_task
+
+
+async def end_of_interview(agent_class):
+    agent = make_agent(agent_class=agent_class, max_questions=QUESTIONS)
+    await agent.astart_interview()
+    for _ in range(QUESTIONS - 1):
+        await agent.aprocess_answer(ANSWER)
+    agent.llm.latency = LLM_LATENCY
+    agent.llm.prompt_token_latency = PROMPT_TOKEN_LATENCY
+
+    with Timer() as timer:
+        await agent.aprocess_answer(ANSWER)
+        if agent_class is SequentialFeedbackAgent:
+            await asyncio.sleep(PLAYBACK_SECONDS)
+            await agent.agenerate_feedback()
+        else:
+            await asyncio.gather(agent.agenerate_feedback(), asyncio.sleep(PLAYBACK_SECONDS))
+    feedback_tokens = estimate_tokens("\n".join(message.content for message in agent._feedback_messages()))
+    return timer.elapsed, feedback_tokens
+
+
+def main():
+    print(f"Last answer -> feedback delivered ({LLM_LATENCY * 1000:.0f}ms per call + prefill, "
+          f"{PLAYBACK_SECONDS:.1f}s closing playback)")
+    for name, agent_class in [("sequential", SequentialFeedbackAgent), ("incremental", InterviewAgent)]:
+        elapsed, tokens = asyncio.run(end_of_interview(agent_class))
+        print(f"  {name:<12} {elapsed * 1000:7.0f}ms   feedback prompt ~{tokens} tokens")
+
+
+if __name__ == "__main__":
+    main()
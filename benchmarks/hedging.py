@@ -0,0 +1,99 @@
+"""
+Turn latency against backends that occasionally stall, with and without call policies.
+
+Stub chat and TTS backends where STALL_RATE of the calls hang for STALL_SECONDS before
+answering (latencies are a tenth of real ones). SESSIONS candidates go through
+QUESTIONS questions at once, each event under a TURN_DEADLINE (an event that runs out
+of time is sent again, and counts until the candidate gets the question):
+  - no policy: calls only stop at the turn deadline (the previous behaviour had none)
+  - timeouts + retries: each call is cut off at its timeout and retried once
+  - timeouts + retries + hedging: calls slower than the recent p95 also get a duplicate
+"""
+
+import asyncio
+import statistics
+import time
+from deadlines import CallPolicy, DeadlineExceeded, deadline
+from stub_backends import StubChatModel, AsyncStubSpeechClient, StubSpeechClient, latency_distribution
+from benchmarks.common import JOB_DESCRIPTION, RESUME, ANSWER
+from interview_agent import InterviewAgent
+
+SESSIONS = 40
+QUESTIONS = 4
+LLM_LATENCY = "lognormal:0.1,0.3"
+TTS_LATENCY = "lognormal:0.05,0.3"
+STALL_RATE = 0.03
+STALL_SECONDS = 5.0
+TURN_DEADLINE = 3.0
+LLM_TIMEOUT = 1.0
+TTS_TIMEOUT = 0.5
+
+
+async def session(agent, turns, failures):
+    steps = [agent.astart_interview] + [lambda: agent.aprocess_answer(ANSWER)] * QUESTIONS
+    for step in steps:
+        # A turn that runs out of time is sent again, as the client does on a timeout event;
+        # the turn latency is until the candidate gets the question
+        start = time.perf_counter()
+        while True:
+            try:
+                with deadline(TURN_DEADLINE):
+                    response = await step()
+                break
+            except DeadlineExceeded:
+                failures["deadline"] += 1
+        if not any(value for value in response.values() if isinstance(value, bytes)):
+            failures["no_audio"] += 1
+        turns.append(time.perf_counter() - start)
+
+
+async def run(policies):
+    llm = StubChatModel(latency=latency_distribution(LLM_LATENCY, seed=1), stall_rate=STALL_RATE,
+                        stall_seconds=STALL_SECONDS, seed=3, record_prompts=False)
+    tts = AsyncStubSpeechClient(latency=latency_distribution(TTS_LATENCY, seed=2), stall_rate=STALL_RATE,
+                                stall_seconds=STALL_SECONDS, seed=4)
+    agents = [
+        InterviewAgent(JOB_DESCRIPTION, RESUME, max_questions=QUESTIONS, llm=llm, openai_client=StubSpeechClient(),
+                       async_openai_client=tts, **policies)
+        for _ in range(SESSIONS)
+    ]
+    turns, failures = [], {"deadline": 0, "no_audio": 0}
+    await asyncio.gather(*(session(agent, turns, failures) for agent in agents))
+    # Let the cancelled and background calls settle before the next run
+    await asyncio.gather(*(agent.agenerate_feedback() for agent in agents), return_exceptions=True)
+    return turns, failures, llm.calls, tts.calls, llm.stalls + tts.stalls
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def main():
+    print(f"{SESSIONS} sessions x {QUESTIONS + 1} turns; llm {LLM_LATENCY}, tts {TTS_LATENCY}, "
+          f"{STALL_RATE:.0%} of calls stall {STALL_SECONDS:.0f}s, turn deadline {TURN_DEADLINE:.0f}s")
+    configurations = [
+        ("no policy", {}),
+        ("timeouts + retries", {
+            "llm_policy": CallPolicy("llm", timeout=LLM_TIMEOUT, max_retries=1, retry_backoff=0.02, hedge_percentile=0),
+            "tts_policy": CallPolicy("tts", timeout=TTS_TIMEOUT, max_retries=1, retry_backoff=0.02, hedge_percentile=0)
+        }),
+        ("timeouts + retries + hedging", {
+            "llm_policy": CallPolicy("llm", timeout=LLM_TIMEOUT, max_retries=1, retry_backoff=0.02),
+            "tts_policy": CallPolicy("tts", timeout=TTS_TIMEOUT, max_retries=1, retry_backoff=0.02)
+        }),
+    ]
+    for name, policies in configurations:
+        turns, failures, llm_calls, tts_calls, stalls = asyncio.run(run(policies))
+        print(f"  {name:<29} turn p50 {statistics.median(turns) * 1000:5.0f}ms p95 {percentile(turns, 0.95) * 1000:5.0f}ms "
+              f"p99 {percentile(turns, 0.99) * 1000:5.0f}ms max {max(turns) * 1000:5.0f}ms | "
+              f"deadline exceeded {failures['deadline']}, sent without audio {failures['no_audio']} | "
+              f"calls llm {llm_calls} tts {tts_calls} (stalled {stalls})")
+        for policy in policies.values():
+            stats = policy.stats()
+            print(f"    {policy.name}: hedges {stats['hedges']} (won {stats['hedge_wins']}), "
+                  f"retries {stats['retries']}, timeouts {stats['timeouts']}")
+
+
+if __name__ == "__main__":
+    main()
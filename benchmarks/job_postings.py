@@ -0,0 +1,112 @@
+"""
+Per-candidate prompt tokens and time-to-first-question with and without the job posting
+registry (requirements digest and seed question bank).
+
+CANDIDATES candidates interview for the same (realistically long) job description, all
+at once, with QUESTIONS questions each. Stub latencies include prefill per prompt token,
+so shorter prompts are faster. With the registry, the posting is built once before the
+candidates arrive (its cost is shown separately, once per job description).
+"""
+
+import asyncio
+import statistics
+import time
+from job_postings import JobPostingRegistry
+from stub_backends import StubChatModel, AsyncStubSpeechClient, StubSpeechClient, latency_distribution
+from tts_cache import TTSCache
+from interview_agent import InterviewAgent
+from benchmarks.common import JOB_DESCRIPTION, RESUME, ANSWER
+
+CANDIDATES = 20
+QUESTIONS = 4
+LLM_LATENCY = "lognormal:0.3,0.3"
+PREFILL_PER_TOKEN = 0.0003
+TTS_LATENCY = 0.15
+# Job postings carry company, team, benefits and process sections the interviewer doesn't need
+POSTING = JOB_DESCRIPTION + """
+About us:
+We are a fast-growing fintech company on a mission to make financial data accessible to everyone. Founded in
+2015, we now serve more than 2,000 customers across 30 countries, from startups to Fortune 500 companies, and
+our platform processes billions of transactions every month. We are backed by leading investors and have
+offices in London, New York and Berlin, with a remote-first culture.
+
+The team:
+You will join the Data Platform team, a group of twelve engineers, data scientists and product managers who
+build the APIs and machine learning services behind our analytics products. We work in two-week sprints,
+practice code review and pair programming, and own our services in production.
+
+Responsibilities:
+- Design, build and maintain scalable backend services and APIs
+- Work with data scientists to take machine learning models to production
+- Improve the performance and reliability of our data pipelines
+- Mentor junior engineers and contribute to technical design reviews
+- Participate in the on-call rotation for the services you own
+
+What we offer:
+- Competitive salary and equity
+- 30 days of paid vacation plus public holidays
+- Flexible working hours and a home office budget
+- Annual learning budget of 2,000 EUR and conference attendance
+- Private health insurance and a pension plan
+- Regular team offsites and company-wide hackathons
+
+Our hiring process:
+1. A 30-minute call with a recruiter
+2. A technical interview with two engineers
+3. A system design interview
+4. A final conversation with the hiring manager
+
+We are an equal opportunity employer and value diversity. We do not discriminate on the basis of race,
+religion, color, national origin, gender, sexual orientation, age, marital status, veteran status or
+disability status. If you need any accommodation during the process, please let us know.
+"""
+
+
+async def candidate(agent):
+    start = time.perf_counter()
+    await agent.astart_interview()
+    first_question = time.perf_counter() - start
+    for _ in range(QUESTIONS):
+        await agent.aprocess_answer(ANSWER)
+    await agent.await_pending_analyses()
+    return first_question
+
+
+async def run(use_registry: bool):
+    llm = StubChatModel(latency=latency_distribution(LLM_LATENCY, seed=1), prompt_token_latency=PREFILL_PER_TOKEN)
+    tts = AsyncStubSpeechClient(latency=TTS_LATENCY)
+    tts_cache = TTSCache()
+
+    def make_agent(**kwargs):
+        return InterviewAgent(POSTING, RESUME, max_questions=QUESTIONS, llm=llm, openai_client=StubSpeechClient(),
+                              async_openai_client=tts, tts_cache=tts_cache, overlap_analysis=True, **kwargs)
+
+    posting, build = None, (0, 0, 0.0)
+    if use_registry:
+        registry = JobPostingRegistry(lambda job_description: make_agent())
+        start = time.perf_counter()
+        posting = registry.get(POSTING)
+        await posting.ready.wait()
+        build = (llm.calls, sum(llm.prompt_tokens), time.perf_counter() - start)
+        llm.calls, llm.prompt_tokens = 0, []
+
+    agents = [make_agent(job_posting=posting) for _ in range(CANDIDATES)]
+    first_questions = await asyncio.gather(*(candidate(agent) for agent in agents))
+    return first_questions, llm.calls / CANDIDATES, sum(llm.prompt_tokens) / CANDIDATES, build
+
+
+def main():
+    print(f"{CANDIDATES} candidates x {QUESTIONS} questions for one job posting; llm {LLM_LATENCY} "
+          f"+ {PREFILL_PER_TOKEN * 1000:.1f}ms prefill per prompt token, tts {TTS_LATENCY * 1000:.0f}ms")
+    for name, use_registry in [("raw job description", False), ("job posting registry", True)]:
+        first_questions, calls, tokens, build = asyncio.run(run(use_registry))
+        print(f"  {name:<21} per candidate: prompt tokens {tokens:6.0f}, llm calls {calls:4.1f} | "
+              f"time to first question p50 {statistics.median(first_questions) * 1000:5.0f}ms "
+              f"max {max(first_questions) * 1000:5.0f}ms")
+        if use_registry:
+            print(f"    built once per job description: {build[0]} llm calls, {build[1]} prompt tokens, "
+                  f"{build[2] * 1000:.0f}ms in the background")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+"""
+End-to-end load test of the WebSocket server against the stub backends.
+
+Starts the server (uvicorn, MODEL_BACKEND=stub) in a subprocess and drives N simulated
+candidates through the /ws/{client_id} protocol: start_interview with a PDF resume, then
+submit_answer until the interview completes. Reports p50/p95/p99 latency per event type,
+throughput, errors and the server's RSS.
+
+    python -m benchmarks.load --candidates 50 --llm-latency lognormal:0.5,0.4
+"""
+
+import argparse
+import asyncio
+import base64
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+from collections import defaultdict
+import websockets
+from benchmarks.common import RESUME, JOB_DESCRIPTION, ANSWER, make_pdf
+
+# Events that answer a request; the others (queued, interview_closing) are progress updates
+FINAL_EVENTS = {"interview_started", "next_question", "interview_complete", "question_end", "error", "busy"}
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def rss_bytes(pid: int) -> int:
+    with open(f"/proc/{pid}/status") as status:
+        for line in status:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) * 1024
+    return 0
+
+
+def percentile(values, fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def start_server(port: int, args) -> subprocess.Popen:
+    env = dict(os.environ,
+               MODEL_BACKEND="stub",
+               STUB_LLM_LATENCY=args.llm_latency,
+               STUB_TOKEN_LATENCY=args.token_latency,
+               STUB_TTS_LATENCY=args.tts_latency,
+               STUB_FAILURE_RATE=str(args.failure_rate),
+               STUB_SEED="42",
+               LLM_REQUESTS_PER_SECOND=str(args.llm_rps),
+               LLM_BURST=str(args.llm_rps),
+               TTS_REQUESTS_PER_SECOND=str(args.tts_rps),
+               TTS_BURST=str(args.tts_rps),
+               SESSION_STORE="memory",
+               CLOSING_PLAYBACK_SECONDS="0")
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app:app", "--host", "127.0.0.1", "--port", str(port),
+         "--log-level", "warning"],
+        env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        try:
+            urllib.request.urlopen(f"http://127.0.0.1:{port}/", timeout=1)
+            return server
+        except OSError:
+            time.sleep(0.2)
+    server.kill()
+    raise RuntimeError("Server did not start")
+
+
+async def candidate(port: int, number: int, resume_base64: str, stream: bool, latencies, counts):
+    """One simulated candidate; records the latency of each request by the event that answered it"""
+    async with websockets.connect(f"ws://127.0.0.1:{port}/ws/candidate-{number}", max_size=None) as ws:
+        json.loads(await ws.recv())  # connection_established
+
+        async def request(event: str, data: dict) -> str:
+            start = time.perf_counter()
+            await ws.send(json.dumps({"event": event, "data": data}))
+            while True:
+                message = json.loads(await ws.recv())
+                name = message["event"]
+                counts[name] += 1
+                if name in FINAL_EVENTS:
+                    latencies[name].append(time.perf_counter() - start)
+                    if name == "question_end" and message["data"]["interview_complete"]:
+                        # Streaming: the feedback follows the closing message
+                        continue
+                    return name
+                if name == "question_chunk" and message["data"]["index"] == 0:
+                    latencies["first_chunk"].append(time.perf_counter() - start)
+
+        result = await request("start_interview", {"job_description": JOB_DESCRIPTION,
+                                                   "resume": resume_base64, "stream": stream})
+        if result in ("error", "busy"):
+            return False
+        for _ in range(50):
+            result = await request("submit_answer", {"answer": ANSWER})
+            if result == "interview_complete":
+                return True
+            if result == "busy":
+                await asyncio.sleep(1)
+        return False
+
+
+async def drive(port: int, args, server_pid: int):
+    resume_base64 = base64.b64encode(make_pdf([RESUME])).decode()
+    latencies = defaultdict(list)
+    counts = defaultdict(int)
+    peak_rss = [rss_bytes(server_pid)]
+
+    async def sample_rss():
+        while True:
+            peak_rss.append(rss_bytes(server_pid))
+            await asyncio.sleep(0.2)
+
+    sampler = asyncio.create_task(sample_rss())
+    start = time.perf_counter()
+    results = await asyncio.gather(
+        *(candidate(port, number, resume_base64, args.stream, latencies, counts) for number in range(args.candidates)),
+        return_exceptions=True
+    )
+    elapsed = time.perf_counter() - start
+    sampler.cancel()
+    return results, latencies, counts, elapsed, peak_rss
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--candidates", type=int, default=20)
+    parser.add_argument("--llm-latency", default="lognormal:0.3,0.4", help="stub latency spec (seconds)")
+    parser.add_argument("--token-latency", default="0.005")
+    parser.add_argument("--tts-latency", default="uniform:0.1,0.3")
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    parser.add_argument("--llm-rps", type=float, default=1000, help="scheduler rate limit for the chat model")
+    parser.add_argument("--tts-rps", type=float, default=1000, help="scheduler rate limit for TTS")
+    parser.add_argument("--stream", action="store_true", help="use streamed question audio")
+    args = parser.parse_args()
+
+    port = free_port()
+    server = start_server(port, args)
+    try:
+        idle_rss = rss_bytes(server.pid)
+        results, latencies, counts, elapsed, peak_rss = asyncio.run(drive(port, args, server.pid))
+        stats = json.loads(urllib.request.urlopen(f"http://127.0.0.1:{port}/stats").read())
+    finally:
+        server.terminate()
+        server.wait()
+
+    completed = sum(1 for result in results if result is True)
+    crashed = [result for result in results if isinstance(result, Exception)]
+    answers = len(latencies["next_question"]) + len(latencies["interview_complete"]) + len(latencies["question_end"])
+    print(f"{args.candidates} candidates, llm {args.llm_latency}, tts {args.tts_latency}, "
+          f"failure rate {args.failure_rate}, {'streamed' if args.stream else 'whole'} audio")
+    print(f"{'event':<20} {'count':>6} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    for name, values in sorted(latencies.items()):
+        if not values:
+            continue
+        print(f"{name:<20} {len(values):>6} {percentile(values, 0.5) * 1000:>8.0f} "
+              f"{percentile(values, 0.95) * 1000:>8.0f} {percentile(values, 0.99) * 1000:>8.0f}")
+    print(f"completed interviews: {completed}/{args.candidates} in {elapsed:.1f}s "
+          f"({completed / elapsed:.2f} interviews/s, {answers / elapsed:.1f} responses/s)")
+    print(f"error events: {counts['error']}, busy events: {counts['busy']}, queued events: {counts['queued']}, "
+          f"client exceptions: {len(crashed)}")
+    print(f"server RSS: idle {idle_rss / 2**20:.1f} MiB, peak {max(peak_rss) / 2**20:.1f} MiB")
+    print(f"server stats: {json.dumps(stats['client_pool'])}")
+
+
+if __name__ == "__main__":
+    main()
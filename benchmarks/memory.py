@@ -0,0 +1,95 @@
+"""
+Retained memory per session at question 10.
+
+Compares the turn records with the previous layout, which kept a LangChain message list
+holding copies of the prompts that embed the job description and resume, a separate
+answers list and an (unused) ConversationBufferMemory. Clients are shared between the
+sessions, as they would be in the server, so only per-session state is counted.
+"""
+
+import asyncio
+import gc
+import tracemalloc
+from langchain.memory import ConversationBufferMemory
+from langchain_core.messages import HumanMessage, AIMessage, SystemMessage
+from interview_agent import InterviewAgent
+from stub_backends import StubChatModel, StubSpeechClient, AsyncStubSpeechClient
+from benchmarks.common import JOB_DESCRIPTION, RESUME, ANSWER
+
+SESSIONS = 200
+QUESTIONS = 10
+
+
+class LegacyHistoryAgent(InterviewAgent):
+    """The pre-change history layout, kept here for comparison only"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.legacy_history = []
+        self.answers = []
+        self.memory = ConversationBufferMemory(return_messages=True, output_key="output", input_key="input")
+
+    def _record_introduction(self, introduction: str):
+        # The system prompts used to embed the job description and resume
+        self.legacy_history.append(SystemMessage(content=self.session_prefix + self._introduction_prompt(self.personal_info)))
+        self.legacy_history.append(AIMessage(content=introduction))
+        super()._record_introduction(introduction)
+
+    def _record_first_question(self, first_question: str):
+        self.legacy_history.append(SystemMessage(content=self.session_prefix + self._first_question_prompt()))
+        self.legacy_history.append(AIMessage(content=first_question))
+        super()._record_first_question(first_question)
+
+    def _record_answer(self, answer: str, analysis: str):
+        self.legacy_history.append(HumanMessage(content=answer))
+        self.legacy_history.append(SystemMessage(content=analysis))
+        self.answers.append(answer)
+        return super()._record_answer(answer, analysis)
+
+    def _record_next_question(self, next_question: str):
+        self.legacy_history.append(AIMessage(content=next_question))
+        super()._record_next_question(next_question)
+
+
+async def build_sessions(agent_class, clients):
+    agents = []
+    for _ in range(SESSIONS):
+        # Unique copies, as each session's text arrives over its own socket
+        agent = agent_class("".join(list(JOB_DESCRIPTION)), "".join(list(RESUME)),
+                            max_questions=QUESTIONS + 1, **clients)
+        await agent.astart_interview()
+        for _ in range(QUESTIONS - 1):
+            await agent.aprocess_answer("".join(list(ANSWER)))
+        agents.append(agent)
+    return agents
+
+
+def measure(agent_class) -> float:
+    clients = {
+        "llm": StubChatModel(),
+        "openai_client": StubSpeechClient(),
+        "async_openai_client": AsyncStubSpeechClient()
+    }
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    agents = asyncio.run(build_sessions(agent_class, clients))
+    clients["llm"].prompt_tokens.clear()
+    clients["llm"].cached_tokens.clear()
+    gc.collect()
+    retained = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    assert all(agent.current_question_number == QUESTIONS for agent in agents)
+    return retained / SESSIONS
+
+
+def main():
+    legacy = measure(LegacyHistoryAgent)
+    compact = measure(InterviewAgent)
+    print(f"Retained bytes per session at question {QUESTIONS} ({SESSIONS} sessions)")
+    print(f"  message history + answers + memory: {legacy:10.0f}")
+    print(f"  turn records:                       {compact:10.0f}  ({100 * (1 - compact / legacy):.0f}% less)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+"""
+Provider-side prompt cache reuse across one interview.
+
+Every call starts with the same session prefix (role, job description, resume and
+profile), so after the first calls most prompt tokens can be served from the
+provider's prefix cache. The stub model simulates that cache and only charges
+prefill time for uncached tokens.
+"""
+
+import asyncio
+from benchmarks.common import make_agent, ANSWER
+
+QUESTIONS = 10
+
+
+async def run():
+    agent = make_agent(max_questions=QUESTIONS, overlap_analysis=True)
+    await agent.astart_interview()
+    for _ in range(QUESTIONS):
+        await agent.aprocess_answer(ANSWER)
+    await agent.agenerate_feedback()
+    return agent
+
+
+def main():
+    agent = asyncio.run(run())
+    llm = agent.llm
+    prompt_tokens = sum(llm.prompt_tokens)
+    cached_tokens = sum(llm.cached_tokens)
+    prefix_tokens = len(agent.session_prefix) // 4
+    print(f"calls: {llm.calls}, session prefix: ~{prefix_tokens} tokens")
+    print(f"prompt tokens: {prompt_tokens}, served from prefix cache: {cached_tokens} "
+          f"({cached_tokens / prompt_tokens:.0%})")
+    print(f"calls with a cached prefix: {sum(1 for tokens in llm.cached_tokens if tokens)} of {llm.calls}")
+
+
+if __name__ == "__main__":
+    main()
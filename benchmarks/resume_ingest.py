@@ -0,0 +1,78 @@
+"""
+Resume ingestion over a corpus of generated multi-page PDFs.
+
+Compares the old inline parse (PyPDF2 on the event loop, string +=) with the process
+pool ingestor at different worker counts. Besides parse time it reports the worst
+event-loop stall seen by a 5ms ticker, which is what other WebSockets experience.
+"""
+
+import asyncio
+import os
+import time
+from io import BytesIO
+from PyPDF2 import PdfReader
+from resume_ingest import ResumeIngestor
+from benchmarks.common import make_pdf, RESUME
+
+PAGE_COUNTS = [1, 5, 20, 50]
+WORKER_COUNTS = [1, 4]
+
+
+def corpus():
+    page_text = "\n".join(RESUME.strip().split("\n") * 3)
+    return {pages: make_pdf([page_text] * pages) for pages in PAGE_COUNTS}
+
+
+async def measure_stalls(work):
+    """Run work() while a ticker records the longest event-loop stall"""
+    worst = 0.0
+    done = False
+
+    async def ticker():
+        nonlocal worst
+        while not done:
+            before = time.perf_counter()
+            await asyncio.sleep(0.005)
+            worst = max(worst, time.perf_counter() - before - 0.005)
+
+    task = asyncio.create_task(ticker())
+    await asyncio.sleep(0)
+    start = time.perf_counter()
+    await work()
+    elapsed = time.perf_counter() - start
+    done = True
+    await task
+    return elapsed, worst
+
+
+async def inline(pdf_bytes):
+    reader = PdfReader(BytesIO(pdf_bytes))
+    resume_text = ""
+    for page in reader.pages:
+        resume_text += page.extract_text() + "\n"
+    return resume_text
+
+
+async def run(pdfs):
+    rows = []
+    for pages, pdf in pdfs.items():
+        rows.append(("inline (before)", pages, *await measure_stalls(lambda: inline(pdf))))
+    for workers in WORKER_COUNTS:
+        ingestor = ResumeIngestor(max_workers=workers, max_pages=max(PAGE_COUNTS), timeout_seconds=60)
+        # Warm the pool so process start-up isn't counted against the first document
+        await ingestor.ingest(pdfs[1])
+        for pages, pdf in pdfs.items():
+            rows.append((f"pool, {workers} workers", pages, *await measure_stalls(lambda: ingestor.ingest(pdf))))
+        ingestor.shutdown()
+    return rows
+
+
+def main():
+    print(f"CPU count: {os.cpu_count()}")
+    print(f"{'mode':<18} {'pages':>5} {'parse ms':>9} {'worst loop stall ms':>20}")
+    for mode, pages, elapsed, stall in asyncio.run(run(corpus())):
+        print(f"{mode:<18} {pages:>5} {elapsed * 1000:>9.1f} {stall * 1000:>20.1f}")
+
+
+if __name__ == "__main__":
+    main()
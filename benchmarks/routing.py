@@ -0,0 +1,77 @@
+"""
+Per-prompt-kind model routing, with a healthy and a degraded capable model.
+
+Stub tiers: "quality" (GPT-4-like, slow) and "fast". Latencies are a tenth of real
+ones. SESSIONS candidates go through QUESTIONS questions at once:
+  - one model: every prompt goes to the quality tier (the previous behaviour)
+  - routed: extraction, analysis and closing go to the fast tier
+  - routed + budgets: as routed, with latency budgets so question generation falls back
+    to the fast tier while the quality tier is over budget
+"""
+
+import asyncio
+import statistics
+import time
+from model_router import ModelRouter
+from stub_backends import StubChatModel, latency_distribution
+from benchmarks.common import make_agent, ANSWER
+
+SESSIONS = 30
+QUESTIONS = 3
+FAST_LATENCY = "lognormal:0.05,0.3"
+QUALITY_LATENCY = {"healthy": "lognormal:0.25,0.3", "degraded": "lognormal:0.9,0.4"}
+ROUTES = {"extraction": "fast", "analysis": "fast", "closing": "fast"}
+BUDGETS = {"first_question": 0.5, "next_question": 0.5}
+
+
+async def session(agent):
+    start = time.perf_counter()
+    await agent.astart_interview()
+    first_question = time.perf_counter() - start
+    turns = []
+    for _ in range(QUESTIONS):
+        start = time.perf_counter()
+        await agent.aprocess_answer(ANSWER)
+        turns.append(time.perf_counter() - start)
+    return first_question, turns
+
+
+async def run(quality_latency: str, routes, budgets):
+    models = {
+        "gpt-4": StubChatModel(latency=latency_distribution(quality_latency, seed=1), record_prompts=False,
+                               model_name="gpt-4"),
+        "gpt-3.5-turbo": StubChatModel(latency=latency_distribution(FAST_LATENCY, seed=2), record_prompts=False,
+                                       model_name="gpt-3.5-turbo")
+    }
+    router = None
+    if routes is not None:
+        router = ModelRouter({"quality": "gpt-4", "fast": "gpt-3.5-turbo"}, models.get, routes=routes,
+                             budgets=budgets)
+    agents = [make_agent(max_questions=QUESTIONS, router=router, overlap_analysis=True) for _ in range(SESSIONS)]
+    for agent in agents:
+        agent.llm = models["gpt-4"]
+    results = await asyncio.gather(*(session(agent) for agent in agents))
+    first = [result[0] for result in results]
+    turns = [turn for result in results for turn in result[1]]
+    return first, turns, models["gpt-3.5-turbo"].calls, models["gpt-4"].calls
+
+
+def p95(values):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))]
+
+
+def main():
+    print(f"{SESSIONS} sessions x {QUESTIONS} questions; fast tier {FAST_LATENCY}, latencies in seconds / 10")
+    for health, quality_latency in QUALITY_LATENCY.items():
+        print(f"quality tier {health} ({quality_latency}):")
+        for name, routes, budgets in [("one model", None, None), ("routed", ROUTES, None),
+                                      ("routed + budgets", ROUTES, BUDGETS)]:
+            first, turns, fast_calls, quality_calls = asyncio.run(run(quality_latency, routes, budgets))
+            print(f"  {name:<17} first question p50 {statistics.median(first) * 1000:5.0f}ms "
+                  f"p95 {p95(first) * 1000:5.0f}ms | answer->question p50 {statistics.median(turns) * 1000:5.0f}ms "
+                  f"p95 {p95(turns) * 1000:5.0f}ms | calls fast {fast_calls:3d} quality {quality_calls:3d}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Outbound call scheduling under a burst of sessions against a rate-limited provider.
+
+The stub chat model rejects calls beyond a fixed number in flight, like a provider
+returning 429s. 30 candidates start an interview while 30 others wait for their feedback,
+all at once, with and without the scheduler (capped at the provider's limit, interactive
+calls first).
+"""
+
+import asyncio
+import statistics
+import time
+from call_scheduler import CallScheduler
+from stub_backends import StubChatModel
+from benchmarks.common import make_agent, ANSWER
+
+PROVIDER_CONCURRENCY = 10
+LLM_LATENCY = 0.05
+STARTING = 30
+FINISHING = 30
+
+
+class RateLimitedChatModel(StubChatModel):
+    """Stub chat model that fails calls beyond the provider's in-flight limit"""
+
+    def __init__(self, state: dict, **kwargs):
+        super().__init__(**kwargs)
+        self.state = state
+
+    async def ainvoke(self, messages, *args, **kwargs):
+        if self.state["in_flight"] >= PROVIDER_CONCURRENCY:
+            self.state["rejected"] += 1
+            raise RuntimeError("429 Too Many Requests")
+        self.state["in_flight"] += 1
+        try:
+            return await super().ainvoke(messages, *args, **kwargs)
+        finally:
+            self.state["in_flight"] -= 1
+
+
+def build(state: dict, scheduler, session_id: str):
+    agent = make_agent(scheduler=scheduler, session_id=session_id, max_questions=1)
+    agent.llm = RateLimitedChatModel(state, latency=LLM_LATENCY)
+    return agent
+
+
+async def run(use_scheduler: bool):
+    state = {"in_flight": 0, "rejected": 0}
+    scheduler = CallScheduler({"chat": {"max_concurrency": PROVIDER_CONCURRENCY}}) if use_scheduler else None
+
+    # Sessions that are one answer away from feedback
+    finishing = []
+    for number in range(FINISHING):
+        agent = make_agent(max_questions=1)
+        await agent.astart_interview()
+        await agent.aprocess_answer(ANSWER)
+        agent.llm = RateLimitedChatModel(state, latency=LLM_LATENCY)
+        agent.scheduler, agent.session_id = scheduler, f"finishing-{number}"
+        finishing.append(agent)
+
+    async def timed(call):
+        start = time.perf_counter()
+        try:
+            await call
+            return time.perf_counter() - start
+        except Exception:
+            return None
+
+    start_calls = [timed(build(state, scheduler, f"starting-{n}").astart_interview()) for n in range(STARTING)]
+    feedback_calls = [timed(agent.agenerate_feedback()) for agent in finishing]
+    results = await asyncio.gather(*start_calls, *feedback_calls)
+    starts = [r for r in results[:STARTING] if r is not None]
+    feedback = [r for r in results[STARTING:] if r is not None]
+    return state["rejected"], starts, feedback
+
+
+def summarize(times):
+    if not times:
+        return "-"
+    times = sorted(times)
+    p95 = times[min(len(times) - 1, int(len(times) * 0.95))]
+    return f"p50 {statistics.median(times) * 1000:6.0f}ms  p95 {p95 * 1000:6.0f}ms"
+
+
+def main():
+    print(f"{STARTING} interviews starting and {FINISHING} feedback requests at once, "
+          f"provider limit {PROVIDER_CONCURRENCY} in flight, {LLM_LATENCY * 1000:.0f}ms per call")
+    for name, use_scheduler in [("unscheduled", False), ("scheduled", True)]:
+        rejected, starts, feedback = asyncio.run(run(use_scheduler))
+        print(f"{name}:")
+        print(f"  provider 429s: {rejected}")
+        print(f"  interviews started: {len(starts)}/{STARTING}  time to first question {summarize(starts)}")
+        print(f"  feedback delivered: {len(feedback)}/{FINISHING}  {summarize(feedback)}")
+
+
+if __name__ == "__main__":
+    main()
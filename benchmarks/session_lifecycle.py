@@ -0,0 +1,93 @@
+"""
+Resident memory of abandoned sessions, with and without the session lifecycle.
+
+Builds sessions at question 5 as the server would (clients shared), as if most
+candidates had closed their tab without the socket closing. Without the lifecycle every
+agent stays resident; with it, sessions beyond the memory ceiling are spilled to disk.
+Also times rehydrating a spilled session, which the candidate pays on their next answer.
+"""
+
+import asyncio
+import gc
+import statistics
+import tempfile
+import time
+import tracemalloc
+from interview_agent import InterviewAgent
+from session_lifecycle import SessionLifecycle
+from stub_backends import StubChatModel, StubSpeechClient, AsyncStubSpeechClient
+from benchmarks.common import JOB_DESCRIPTION, RESUME, ANSWER
+
+SESSIONS = 500
+QUESTIONS = 5
+CEILING_SESSIONS = 50
+
+
+def snapshot(session_id, agent):
+    return {'agent': agent.to_state(), 'stream': False}
+
+
+async def build(sessions: SessionLifecycle, clients):
+    for number in range(SESSIONS):
+        # Unique copies, as each session's text arrives over its own socket
+        agent = InterviewAgent("".join(list(JOB_DESCRIPTION)), "".join(list(RESUME)),
+                               max_questions=QUESTIONS + 1, **clients)
+        await agent.astart_interview()
+        for _ in range(QUESTIONS - 1):
+            await agent.aprocess_answer("".join(list(ANSWER)))
+        session_id = f"session-{number}"
+        sessions.add(session_id, agent)
+        sessions.record(session_id, snapshot(session_id, agent))
+        if sessions.pressure.is_set():
+            # What the reaper task does when woken by the ceiling
+            await sessions.reap()
+
+
+async def rehydrate_times(sessions: SessionLifecycle, clients):
+    times = []
+    for session_id in list(sessions.spilled)[:100]:
+        start = time.perf_counter()
+        state = await sessions.take_spilled(session_id)
+        InterviewAgent.from_state(state['agent'], **clients)
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def measure(max_bytes: int, spill_dir: str):
+    clients = {
+        "llm": StubChatModel(),
+        "openai_client": StubSpeechClient(),
+        "async_openai_client": AsyncStubSpeechClient()
+    }
+    sessions = SessionLifecycle(snapshot, max_bytes=max_bytes, spill_dir=spill_dir)
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    asyncio.run(build(sessions, clients))
+    clients["llm"].prompt_tokens.clear()
+    clients["llm"].cached_tokens.clear()
+    gc.collect()
+    retained = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    stats = sessions.stats()
+    times = asyncio.run(rehydrate_times(sessions, clients))
+    return retained, stats, times
+
+
+def main():
+    with tempfile.TemporaryDirectory() as spill_dir:
+        unbounded, unbounded_stats, _ = measure(2**62, spill_dir)
+        # Ceiling sized to hold CEILING_SESSIONS sessions by their estimated state size
+        per_session = unbounded_stats["resident_bytes"] / SESSIONS
+        bounded, stats, times = measure(int(CEILING_SESSIONS * per_session), spill_dir)
+
+    print(f"{SESSIONS} idle sessions at question {QUESTIONS}, ceiling of ~{CEILING_SESSIONS} sessions "
+          f"({per_session / 1024:.1f} KiB estimated each)")
+    print(f"  no ceiling:   {unbounded_stats['resident_sessions']:4d} resident, retained {unbounded / 2**20:6.1f} MiB")
+    print(f"  with ceiling: {stats['resident_sessions']:4d} resident, retained {bounded / 2**20:6.1f} MiB, "
+          f"{stats['spilled_sessions']} spilled ({stats['spilled_bytes'] / 2**20:.1f} MiB on disk)")
+    print(f"  rehydrating a spilled session: p50 {statistics.median(times) * 1000:.2f}ms  max {max(times) * 1000:.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Session throughput with state shared through the SQLite session store.
+
+Several worker processes take turns on the same sessions: in each round a session is
+handled by a different worker, which loads its state, rebuilds the agent, processes an
+answer (stub model, no latency) and saves the state again. This is the path a
+reconnect landing on another uvicorn worker takes.
+"""
+
+import asyncio
+import multiprocessing
+import os
+import tempfile
+import time
+from interview_agent import InterviewAgent
+from session_store import SQLiteSessionStore, encode_state
+from stub_backends import StubChatModel, StubSpeechClient, AsyncStubSpeechClient
+from benchmarks.common import make_agent, ANSWER
+
+SESSIONS = 200
+ROUNDS = 8
+WORKER_COUNTS = [1, 2, 4]
+
+
+def clients():
+    return {
+        "llm": StubChatModel(),
+        "openai_client": StubSpeechClient(),
+        "async_openai_client": AsyncStubSpeechClient()
+    }
+
+
+async def seed(path: str):
+    store = SQLiteSessionStore(path)
+    for number in range(SESSIONS):
+        agent = make_agent(max_questions=ROUNDS + 2)
+        await agent.astart_interview()
+        await store.save(f"session-{number}", {"agent": agent.to_state(), "stream": False})
+    store.close()
+    return len(encode_state({"agent": agent.to_state(), "stream": False}))
+
+
+async def work(path: str, index: int, workers: int, barrier):
+    store = SQLiteSessionStore(path)
+    barrier.wait()
+    for round_number in range(ROUNDS):
+        for number in range(SESSIONS):
+            if (number + round_number) % workers != index:
+                continue
+            session_id = f"session-{number}"
+            state = await store.load(session_id)
+            agent = InterviewAgent.from_state(state["agent"], **clients())
+            await agent.aprocess_answer(ANSWER)
+            await store.save(session_id, {"agent": agent.to_state(), "stream": False})
+        # Rounds are kept in step so no two workers touch a session at once
+        barrier.wait()
+    store.close()
+
+
+def worker_main(path: str, index: int, workers: int, barrier):
+    asyncio.run(work(path, index, workers, barrier))
+
+
+def run(workers: int):
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "sessions.db")
+        state_bytes = asyncio.run(seed(path))
+        context = multiprocessing.get_context("spawn")
+        barrier = context.Barrier(workers + 1)
+        processes = [context.Process(target=worker_main, args=(path, index, workers, barrier))
+                     for index in range(workers)]
+        for process in processes:
+            process.start()
+        barrier.wait()  # every worker has imported everything and opened the store
+        start = time.perf_counter()
+        for _ in range(ROUNDS):
+            barrier.wait()
+        elapsed = time.perf_counter() - start
+        for process in processes:
+            process.join()
+        return elapsed, state_bytes
+
+
+def main():
+    print(f"CPU count: {os.cpu_count()}, {SESSIONS} sessions x {ROUNDS} answers, each hopping between workers")
+    for workers in WORKER_COUNTS:
+        elapsed, state_bytes = run(workers)
+        steps = SESSIONS * ROUNDS
+        print(f"{workers} workers: {steps / elapsed:8.1f} session steps/s   (stored state ~{state_bytes} bytes)")
+
+
+if __name__ == "__main__":
+    main()
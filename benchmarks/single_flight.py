@@ -0,0 +1,72 @@
+"""
+Duplicate requests with and without single-flight coalescing.
+
+CANDIDATES candidates each send start_interview twice at once (a double click, or a
+reconnect racing the first attempt) and then re-send their first answer while it is
+still being processed. Counts the model and TTS calls made, with the server's session
+coalescing on and off. (TTS and extraction coalescing across sessions stay on: they
+sit inside InterviewAgent.)
+"""
+
+import asyncio
+import base64
+import time
+import app
+from app import ConnectionManager
+from single_flight import SingleFlight
+from tts_cache import TTSCache
+from extraction_cache import ExtractionCache
+from stub_backends import StubBackends
+from benchmarks.common import FakeWebSocket, JOB_DESCRIPTION, RESUME, ANSWER, make_pdf
+
+CANDIDATES = 20
+LLM_LATENCY = 0.2
+TTS_LATENCY = 0.1
+
+
+async def run(coalesce: bool, backends: StubBackends):
+    flights = SingleFlight("session")
+    start = {"job_description": JOB_DESCRIPTION, "resume": base64.b64encode(make_pdf([RESUME])).decode()}
+
+    async def request(client_id: str, event: str, handler, payload):
+        if coalesce:
+            return await flights.do((client_id, event), lambda: handler(client_id, payload), operation=event)
+        return await handler(client_id, payload)
+
+    async def candidate(number: int):
+        client_id = f"candidate-{number}"
+        await app.manager.connect(FakeWebSocket(), client_id)
+        await asyncio.gather(*(request(client_id, "start_interview", app.handle_start_interview, start)
+                               for _ in range(2)))
+        await asyncio.gather(*(request(client_id, "submit_answer", app.handle_submit_answer, {"answer": ANSWER})
+                               for _ in range(2)))
+        agent = app.live_sessions.get(client_id)
+        question_number = agent.current_question_number
+        app.end_session(client_id)
+        await app.session_store.delete(client_id)
+        return question_number
+
+    began = time.perf_counter()
+    question_numbers = await asyncio.gather(*(candidate(number) for number in range(CANDIDATES)))
+    elapsed = time.perf_counter() - began
+    stats = backends.stats()
+    return stats["llm_calls"], stats["tts_calls"], question_numbers, elapsed, flights.coalesced
+
+
+def main():
+    print(f"{CANDIDATES} candidates double-sending start_interview and their first answer, "
+          f"llm {LLM_LATENCY * 1000:.0f}ms, tts {TTS_LATENCY * 1000:.0f}ms")
+    for name, coalesce in [("no coalescing", False), ("session single-flight", True)]:
+        backends = StubBackends(llm_latency=LLM_LATENCY, tts_latency=TTS_LATENCY)
+        app.client_pool, app.scheduler, app.manager = backends, None, ConnectionManager()
+        # Fresh caches, so the second run doesn't benefit from the first
+        app.tts_cache, app.extraction_cache = TTSCache(), ExtractionCache()
+        llm_calls, tts_calls, question_numbers, elapsed, coalesced = asyncio.run(run(coalesce, backends))
+        skipped = sum(1 for number in question_numbers if number != 2)
+        print(f"{name}:")
+        print(f"  llm calls {llm_calls}, tts calls {tts_calls}, coalesced requests {coalesced}, {elapsed:.2f}s")
+        print(f"  sessions that ended up past question 2 (answer processed twice): {skipped}/{CANDIDATES}")
+
+
+if __name__ == "__main__":
+    main()
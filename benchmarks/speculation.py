@@ -0,0 +1,45 @@
+"""
+End-of-interview latency with and without speculative closing.
+
+Measures the time from the last answer to the closing message audio being ready. With
+speculation the closing (and its audio) is prepared while the candidate answers the last
+question; it is discarded and regenerated when the answer ends with a question.
+"""
+
+import asyncio
+from benchmarks.common import make_agent, Timer, ANSWER
+
+LLM_LATENCY = 0.3
+TTS_LATENCY = 0.2
+ANSWER_SECONDS = 1.0  # time the candidate spends on the last answer, scaled down
+QUESTIONS = 3
+
+
+async def end_of_interview(speculate: bool, overlap: bool, answer: str) -> float:
+    agent = make_agent(LLM_LATENCY, TTS_LATENCY, max_questions=QUESTIONS,
+                       speculate_closing=speculate, overlap_analysis=overlap)
+    await agent.astart_interview()
+    for _ in range(QUESTIONS - 1):
+        await agent.aprocess_answer(ANSWER)
+    await asyncio.sleep(ANSWER_SECONDS)
+    with Timer() as timer:
+        response = await agent.aprocess_answer(answer)
+    assert response["interview_complete"]
+    await agent.agenerate_feedback()
+    return timer.elapsed
+
+
+def main():
+    print(f"Last answer -> closing audio ready ({LLM_LATENCY * 1000:.0f}ms per LLM call, "
+          f"{TTS_LATENCY * 1000:.0f}ms TTS)")
+    print(f"{'analysis':<12} {'no speculation':>15} {'speculation':>12} {'discarded':>10}")
+    for overlap in (False, True):
+        baseline = asyncio.run(end_of_interview(False, overlap, ANSWER))
+        speculative = asyncio.run(end_of_interview(True, overlap, ANSWER))
+        discarded = asyncio.run(end_of_interview(True, overlap, "Could you tell me about the team?"))
+        print(f"{'overlapped' if overlap else 'inline':<12} {baseline * 1000:>13.0f}ms "
+              f"{speculative * 1000:>10.0f}ms {discarded * 1000:>8.0f}ms")
+
+
+if __name__ == "__main__":
+    main()
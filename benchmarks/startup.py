@@ -0,0 +1,43 @@
+"""
+Time-to-first-question for session startup.
+
+Compares the original serial pipeline (extraction -> introduction -> question -> TTS)
+with the dependency-aware async pipeline, where the introduction runs alongside the
+first question, and with the introduction skipped entirely.
+"""
+
+import asyncio
+from benchmarks.common import make_agent, Timer
+
+LLM_LATENCY = 0.2
+TTS_LATENCY = 0.1
+RUNS = 5
+
+
+def serial_startup() -> float:
+    agent = make_agent(LLM_LATENCY, TTS_LATENCY)
+    with Timer() as timer:
+        agent.start_interview()
+    return timer.elapsed
+
+
+def async_startup(**kwargs) -> float:
+    agent = make_agent(LLM_LATENCY, TTS_LATENCY, **kwargs)
+    with Timer() as timer:
+        asyncio.run(agent.astart_interview())
+    return timer.elapsed
+
+
+def main():
+    print(f"Stub latency: LLM {LLM_LATENCY * 1000:.0f}ms, TTS {TTS_LATENCY * 1000:.0f}ms, {RUNS} runs each")
+    results = {
+        "serial (before)": [serial_startup() for _ in range(RUNS)],
+        "parallel intro + question": [async_startup() for _ in range(RUNS)],
+        "introduction skipped": [async_startup(generate_introduction=False) for _ in range(RUNS)],
+    }
+    for name, timings in results.items():
+        print(f"{name:<28} time-to-first-question: {sum(timings) / len(timings) * 1000:7.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Time-to-first-audio for a question.
+
+The buffered path returns only once the whole question has been generated and the
+whole text synthesized; the streaming path yields the first sentence's audio as soon
+as that sentence has been generated and synthesized.
+"""
+
+import asyncio
+import time
+from benchmarks.common import make_agent, ANSWER
+
+TIME_TO_FIRST_TOKEN = 0.3
+TOKEN_LATENCY = 0.03
+TTS_LATENCY = 0.15
+TTS_CHAR_LATENCY = 0.002
+TURNS = 3
+
+
+def streaming_agent():
+    agent = make_agent(TIME_TO_FIRST_TOKEN, TTS_LATENCY, max_questions=TURNS + 1, overlap_analysis=True)
+    agent.llm.token_latency = TOKEN_LATENCY
+    agent.async_openai_client.char_latency = TTS_CHAR_LATENCY
+    return agent
+
+
+async def buffered() -> list:
+    agent = streaming_agent()
+    await agent.astart_interview()
+    timings = []
+    for _ in range(TURNS):
+        start = time.perf_counter()
+        await agent.aprocess_answer(ANSWER)
+        timings.append((time.perf_counter() - start, time.perf_counter() - start))
+    return timings
+
+
+async def streamed() -> list:
+    agent = streaming_agent()
+    await agent.astart_interview()
+    timings = []
+    for _ in range(TURNS):
+        start = time.perf_counter()
+        first_audio = None
+        async for event in agent.astream_process_answer(ANSWER):
+            if first_audio is None and event["event"] == "question_chunk":
+                first_audio = time.perf_counter() - start
+        timings.append((first_audio, time.perf_counter() - start))
+    return timings
+
+
+def main():
+    print(f"Stub latency: first token {TIME_TO_FIRST_TOKEN * 1000:.0f}ms, {TOKEN_LATENCY * 1000:.0f}ms/token, "
+          f"TTS {TTS_LATENCY * 1000:.0f}ms + {TTS_CHAR_LATENCY * 1000:.0f}ms/char")
+    for label, run in (("buffered (before)", buffered), ("streamed", streamed)):
+        timings = asyncio.run(run())
+        first = sum(t[0] for t in timings) / len(timings)
+        total = sum(t[1] for t in timings) / len(timings)
+        print(f"{label:<18} time-to-first-audio: {first * 1000:7.1f}ms   full question: {total * 1000:7.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+Valid-parse rate and effective calls per usable result for the JSON calls (extraction
+and feedback), against a stub model whose outputs are messy at realistic rates.
+
+Each stub output is, at the rates in MESS: clean JSON, wrapped in a code fence, wrapped
+in a sentence before and after, left with a trailing comma, a Python dict (single
+quotes), cut off at the token limit, or prose without any JSON. Repair calls get messy
+outputs at the same rates. Strategies, for CALLS results of each kind:
+  - json.loads: the previous behaviour; a failed parse gives placeholders
+  - json.loads + regenerate: make the whole call again on a failed parse (up to 3 calls)
+  - tolerant parser: parse_structured(), placeholders on failure
+  - tolerant parser + repair: InterviewAgent._astructured(), a short repair call on failure
+"""
+
+import asyncio
+import json
+import random
+from stub_backends import StubChatModel
+from structured_output import FEEDBACK_SCHEMA, PERSONAL_INFO_SCHEMA, StructuredOutputError, parse_structured
+from benchmarks.common import make_agent, ANSWER
+
+CALLS = 500
+MESS = [("clean", 0.5), ("code fence", 0.15), ("preamble", 0.1), ("trailing comma", 0.05),
+        ("python dict", 0.05), ("cut off", 0.1), ("prose", 0.05)]
+
+
+def mangle(text: str, mess: str, rng: random.Random) -> str:
+    if mess == "code fence":
+        return f"```json\n{text}\n```"
+    if mess == "preamble":
+        return f"Sure! Here is the result:\n{text}\nLet me know if you need anything else."
+    if mess == "trailing comma":
+        return text[:-1] + ",}"
+    if mess == "python dict":
+        return str(json.loads(text))
+    if mess == "cut off":
+        return text[:int(len(text) * rng.uniform(0.6, 0.95))]
+    if mess == "prose":
+        return "The candidate has a strong background in Python and should be considered further."
+    return text
+
+
+class MessyChatModel(StubChatModel):
+    def __init__(self, seed: int):
+        super().__init__()
+        self.rng = random.Random(seed)
+        self.clean_responder = self.responder
+        self.responder = self._messy_response
+        self.completion_tokens = 0
+
+    def _messy_response(self, prompt: str) -> str:
+        mess = self.rng.choices([name for name, _ in MESS], [rate for _, rate in MESS])[0]
+        text = mangle(self.clean_responder(prompt), mess, self.rng)
+        self.completion_tokens += len(text) // 4
+        return text
+
+
+async def json_loads(llm, messages, schema, attempts: int):
+    for _ in range(attempts):
+        response = await llm.ainvoke(messages)
+        try:
+            data = json.loads(response.content)
+            if all(field in data for field in schema["required"]):
+                return data
+        except (json.JSONDecodeError, TypeError):
+            pass
+    return None
+
+
+async def tolerant(llm, messages, schema):
+    response = await llm.ainvoke(messages)
+    try:
+        return parse_structured(response.content, schema)[0]
+    except StructuredOutputError:
+        return None
+
+
+async def run(strategy: str, kind: str):
+    agent = make_agent(structured_output="none")
+    await agent.astart_interview()
+    await agent.aprocess_answer(ANSWER)
+    await agent.await_pending_analyses()
+    llm = MessyChatModel(seed=7)
+    agent.llm = llm
+    messages, schema = {
+        "extraction": (agent._messages(agent._personal_info_prompt()), PERSONAL_INFO_SCHEMA),
+        "feedback": (agent._feedback_messages(), FEEDBACK_SCHEMA)
+    }[kind]
+    usable = 0
+    for _ in range(CALLS):
+        if strategy == "json.loads":
+            result = await json_loads(llm, messages, schema, attempts=1)
+        elif strategy == "json.loads + regenerate":
+            result = await json_loads(llm, messages, schema, attempts=3)
+        elif strategy == "tolerant parser":
+            result = await tolerant(llm, messages, schema)
+        else:
+            result = await agent._astructured(messages, kind, schema)
+        usable += result is not None
+    return usable, llm.calls, sum(llm.prompt_tokens) + llm.completion_tokens
+
+
+def main():
+    print(f"{CALLS} results per kind; stub outputs: " + ", ".join(f"{name} {rate:.0%}" for name, rate in MESS))
+    for kind in ("extraction", "feedback"):
+        print(f"{kind}:")
+        for strategy in ("json.loads", "json.loads + regenerate", "tolerant parser", "tolerant parser + repair"):
+            usable, calls, tokens = asyncio.run(run(strategy, kind))
+            print(f"  {strategy:<25} usable {usable / CALLS:6.1%} | calls per usable result {calls / max(usable, 1):.2f} "
+                  f"| tokens per usable result {tokens / max(usable, 1):6.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+"""
+Per-turn latency of process_answer.
+
+With overlap_analysis disabled the critical path is analysis -> next question -> TTS.
+With it enabled the analysis runs in the background, leaving next question -> TTS.
+"""
+
+import asyncio
+from benchmarks.common import make_agent, Timer, ANSWER
+
+LLM_LATENCY = 0.2
+TTS_LATENCY = 0.1
+TURNS = 5
+
+
+async def measure_turns(overlap_analysis: bool) -> list:
+    agent = make_agent(LLM_LATENCY, TTS_LATENCY, max_questions=TURNS + 1,
+                       overlap_analysis=overlap_analysis)
+    await agent.astart_interview()
+    timings = []
+    for _ in range(TURNS):
+        with Timer() as timer:
+            await agent.aprocess_answer(ANSWER)
+        timings.append(timer.elapsed)
+    await agent.await_pending_analyses()
+    return timings
+
+
+def main():
+    print(f"Stub latency: LLM {LLM_LATENCY * 1000:.0f}ms, TTS {TTS_LATENCY * 1000:.0f}ms, {TURNS} turns")
+    for overlap in (False, True):
+        timings = asyncio.run(measure_turns(overlap))
+        label = "overlapped analysis" if overlap else "serial analysis (before)"
+        print(f"{label:<26} per-turn latency: {sum(timings) / len(timings) * 1000:7.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
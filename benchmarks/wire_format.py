@@ -0,0 +1,53 @@
+"""
+Bytes on the wire and server CPU per question for the two audio encodings.
+
+Sends next_question events through ConnectionManager.send_audio_message to in-memory
+sockets, once with base64-in-JSON and once with a JSON metadata frame plus a binary
+audio frame, and waits for the connection's writer task to write them.
+"""
+
+import asyncio
+import contextlib
+import io
+import os
+import time
+import audio_protocol
+from app import ConnectionManager
+from benchmarks.common import FakeWebSocket
+
+AUDIO_SIZES = [40_000, 160_000, 480_000]  # Roughly 2.5s, 10s and 30s of tts-1 MP3
+QUESTIONS = 200
+
+
+async def measure(encoding: str, audio: bytes):
+    manager = ConnectionManager()
+    websocket = FakeWebSocket()
+    await manager.connect(websocket, "bench", encoding)
+    await manager.flush("bench")
+    websocket.bytes_sent = 0
+    start = time.process_time()
+    for number in range(QUESTIONS):
+        await manager.send_audio_message({
+            "event": "next_question",
+            "data": {'question_number': number % 10 + 1}
+        }, audio, "bench")
+    # Sends happen on the connection's writer task; count them once they are written
+    await manager.flush("bench")
+    cpu = time.process_time() - start
+    return websocket.bytes_sent / QUESTIONS, cpu / QUESTIONS
+
+
+def main():
+    print(f"{'audio size':>10} {'encoding':>8} {'bytes/question':>15} {'overhead':>9} {'CPU/question':>13}")
+    for size in AUDIO_SIZES:
+        audio = os.urandom(size)
+        for encoding in audio_protocol.AUDIO_ENCODINGS:
+            # Keep the manager's log lines out of the measurement output
+            with contextlib.redirect_stdout(io.StringIO()):
+                wire_bytes, cpu = asyncio.run(measure(encoding, audio))
+            overhead = (wire_bytes - size) / size * 100
+            print(f"{size:>10} {encoding:>8} {wire_bytes:>15.0f} {overhead:>8.1f}% {cpu * 1e6:>11.1f}us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,244 @@
+"""
+Process-wide scheduler for outbound model calls (chat completions and TTS).
+
+Every InterviewAgent call to a model takes a slot from its model's lane first. A lane
+limits the request rate with a token bucket and caps in-flight requests; calls that
+can't start right away wait in a bounded queue, served by priority (time-to-first-question
+before background analysis before feedback) and round-robin across sessions within a
+priority, so one busy session can't starve the others. When the queue is full the call
+is rejected with SchedulerBusy, which the server turns into a "busy" event for the client.
+"""
+
+import asyncio
+import time
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional
+
+# Lower runs first
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BACKGROUND = 1
+PRIORITY_FEEDBACK = 2
+
+
+class SchedulerBusy(Exception):
+    """Raised when a call is rejected because the scheduler queue is full"""
+
+    def __init__(self, model: str, retry_after: float):
+        super().__init__(f"Too many pending requests for {model}, retry in {retry_after:.1f}s")
+        self.model = model
+        self.retry_after = retry_after
+
+
+class TokenBucket:
+    def __init__(self, rate: float, capacity: float, clock: Callable[[], float] = time.monotonic):
+        """
+        Initialize the bucket (full)
+
+        Args:
+            rate (float): Tokens added per second
+            capacity (float): Maximum burst size
+            clock: Monotonic clock in seconds
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self.clock = clock
+        self.tokens = capacity
+        self.updated = clock()
+
+    def _refill(self):
+        now = self.clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def try_take(self, cost: float = 1.0) -> bool:
+        self._refill()
+        if self.tokens >= cost:
+            self.tokens -= cost
+            return True
+        return False
+
+    def time_until(self, cost: float = 1.0) -> float:
+        """Seconds until `cost` tokens are available"""
+        self._refill()
+        return max(0.0, (cost - self.tokens) / self.rate)
+
+
+class ModelLane:
+    """Rate limit, concurrency cap and per-priority, per-session wait queues of one model"""
+
+    def __init__(self, requests_per_second: float = 0.0, burst: float = 1.0,
+                 max_concurrency: int = 0, clock: Callable[[], float] = time.monotonic):
+        self.bucket = TokenBucket(requests_per_second, max(burst, 1.0), clock) if requests_per_second > 0 else None
+        self.max_concurrency = max_concurrency
+        self.active = 0
+        self.queued = 0
+        self.queues: Dict[int, "OrderedDict[str, Deque[asyncio.Future]]"] = {}
+        self.timer: Optional[asyncio.TimerHandle] = None
+        self.started = 0
+        self.total_wait = 0.0
+
+    def has_capacity(self) -> bool:
+        return not self.max_concurrency or self.active < self.max_concurrency
+
+    def pop_next(self) -> Optional[asyncio.Future]:
+        """Next waiter: highest priority first, sessions served round-robin"""
+        for priority in sorted(self.queues):
+            sessions = self.queues[priority]
+            while sessions:
+                session_id, waiters = next(iter(sessions.items()))
+                waiter = waiters.popleft()
+                if waiters:
+                    sessions.move_to_end(session_id)
+                else:
+                    del sessions[session_id]
+                self.queued -= 1
+                if not waiter.done():
+                    return waiter
+        return None
+
+    def discard(self, priority: int, session_id: str, waiter: asyncio.Future):
+        """Drop a waiter that gave up before getting a slot"""
+        waiters = self.queues.get(priority, {}).get(session_id)
+        if waiters and waiter in waiters:
+            waiters.remove(waiter)
+            self.queued -= 1
+            if not waiters:
+                del self.queues[priority][session_id]
+
+
+class CallScheduler:
+    def __init__(self, limits: Optional[Dict[str, Dict[str, float]]] = None, max_queue: int = 500,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Initialize the scheduler
+
+        Args:
+            limits (dict): Per model name, any of requests_per_second, burst and
+                max_concurrency (models without limits run unthrottled)
+            max_queue (int): Maximum calls waiting across all models before rejecting
+            clock: Monotonic clock in seconds
+        """
+        self.limits = limits or {}
+        self.max_queue = max_queue
+        self.clock = clock
+        self.lanes: Dict[str, ModelLane] = {}
+        self.rejected = 0
+        self.created = clock()
+
+    def _lane(self, model: str) -> ModelLane:
+        if model not in self.lanes:
+            self.lanes[model] = ModelLane(clock=self.clock, **self.limits.get(model, {}))
+        return self.lanes[model]
+
+    def queue_depth(self) -> int:
+        return sum(lane.queued for lane in self.lanes.values())
+
+    def _estimated_wait(self, lane: ModelLane) -> float:
+        """Rough time for the current queue to drain, used for retry hints"""
+        if lane.bucket:
+            return (lane.queued + 1) / lane.bucket.rate
+        average = lane.total_wait / lane.started if lane.started else 0.0
+        return max(average, 0.1)
+
+    def _try_start(self, lane: ModelLane) -> bool:
+        if not lane.has_capacity():
+            return False
+        if lane.bucket and not lane.bucket.try_take():
+            return False
+        lane.active += 1
+        return True
+
+    def _dispatch(self, lane: ModelLane):
+        """Hand free slots to waiters, and wake up again when the bucket refills"""
+        lane.timer = None
+        while lane.queued:
+            if lane.bucket and lane.has_capacity() and lane.bucket.time_until() > 0:
+                lane.timer = asyncio.get_running_loop().call_later(lane.bucket.time_until(), self._dispatch, lane)
+                return
+            if not self._try_start(lane):
+                return
+            waiter = lane.pop_next()
+            if waiter is None:
+                lane.active -= 1
+                return
+            waiter.set_result(None)
+
+    async def acquire(self, model: str, session_id: str = "", priority: int = PRIORITY_INTERACTIVE,
+                      on_wait: Optional[Callable[[Dict[str, Any]], Awaitable[None]]] = None):
+        """
+        Wait for a slot to call `model`; pair every successful call with release()
+
+        Args:
+            model (str): Model the call goes to
+            session_id (str): Session making the call, for fairness
+            priority (int): PRIORITY_INTERACTIVE, PRIORITY_BACKGROUND or PRIORITY_FEEDBACK
+            on_wait: Optional coroutine function told when the call has to queue, with
+                model, position and estimated_wait
+
+        Raises:
+            SchedulerBusy: If the queue is full
+        """
+        lane = self._lane(model)
+        if not lane.queued and self._try_start(lane):
+            lane.started += 1
+            return
+
+        if self.queue_depth() >= self.max_queue:
+            self.rejected += 1
+            raise SchedulerBusy(model, self._estimated_wait(lane))
+
+        waiter = asyncio.get_running_loop().create_future()
+        lane.queues.setdefault(priority, OrderedDict()).setdefault(session_id, deque()).append(waiter)
+        lane.queued += 1
+        if lane.timer is None:
+            self._dispatch(lane)
+
+        enqueued = self.clock()
+        try:
+            if on_wait and not waiter.done():
+                await on_wait({"model": model, "position": lane.queued, "estimated_wait": self._estimated_wait(lane)})
+            await waiter
+        except BaseException:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was handed over just as the caller gave up
+                self.release(model)
+            else:
+                waiter.cancel()
+                lane.discard(priority, session_id, waiter)
+            raise
+        lane.started += 1
+        lane.total_wait += self.clock() - enqueued
+
+    def release(self, model: str):
+        lane = self._lane(model)
+        lane.active -= 1
+        if lane.timer is None:
+            self._dispatch(lane)
+
+    @asynccontextmanager
+    async def slot(self, model: str, session_id: str = "", priority: int = PRIORITY_INTERACTIVE,
+                   on_wait: Optional[Callable[[Dict[str, Any]], Awaitable[None]]] = None):
+        """Hold a slot for `model` for the duration of the block (see acquire())"""
+        await self.acquire(model, session_id, priority, on_wait)
+        try:
+            yield
+        finally:
+            self.release(model)
+
+    def stats(self) -> Dict[str, Any]:
+        uptime = max(self.clock() - self.created, 1e-9)
+        return {
+            "queue_depth": self.queue_depth(),
+            "rejected": self.rejected,
+            "models": {
+                model: {
+                    "active": lane.active,
+                    "queued": lane.queued,
+                    "started": lane.started,
+                    "average_wait_seconds": lane.total_wait / lane.started if lane.started else 0.0,
+                    "throughput_per_second": lane.started / uptime
+                }
+                for model, lane in self.lanes.items()
+            }
+        }
@@ -0,0 +1,134 @@
+"""
+Process-wide OpenAI clients shared by every interview session.
+
+Each InterviewAgent used to build its own ChatOpenAI, OpenAI and AsyncOpenAI clients,
+each with its own HTTP connection pool, so connections (and TLS sessions) were never
+reused across sessions. A ClientPool owns one sync and one async HTTP client with a
+bounded pool of keep-alive connections, using HTTP/2 when the optional h2 package is
+installed, and every session borrows the same chat model and speech clients from it.
+"""
+
+import importlib.util
+import os
+from typing import Any, Dict, Optional
+import httpx
+from openai import OpenAI, AsyncOpenAI
+from langchain_openai import ChatOpenAI
+from observability import get_logger
+
+logger = get_logger(__name__)
+
+CHAT_MODEL = "gpt-4"
+CHAT_TEMPERATURE = 0.5
+
+
+def http2_available() -> bool:
+    """Whether httpx can negotiate HTTP/2 (it needs the optional h2 package)"""
+    return importlib.util.find_spec("h2") is not None
+
+
+class ClientPool:
+    def __init__(self, api_key: Optional[str] = None, base_url: Optional[str] = None,
+                 max_connections: int = 100, max_keepalive_connections: int = 20,
+                 keepalive_expiry: float = 30.0, http2: Optional[bool] = None):
+        """
+        Initialize the pool (clients are created on first use)
+
+        Args:
+            api_key (str): OpenAI API key (default: OPENAI_API_KEY)
+            base_url (str): Optional API base URL, e.g. a proxy or a local mock server
+            max_connections (int): Maximum open connections per HTTP client
+            max_keepalive_connections (int): Idle connections kept open for reuse
+            keepalive_expiry (float): Seconds an idle connection is kept open
+            http2 (bool): Use HTTP/2; by default, whenever the h2 package is installed
+        """
+        self.api_key = api_key or os.getenv("OPENAI_API_KEY")
+        self.base_url = base_url
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry
+        )
+        if http2 and not http2_available():
+            logger.warning("HTTP/2 requested but the h2 package is not installed; using HTTP/1.1")
+        self.http2 = http2_available() if http2 is None else bool(http2 and http2_available())
+        self._clients: Dict[str, Any] = {}
+
+    def _http_client(self, client_class):
+        # The OpenAI SDK's own default timeout, so only the pooling changes
+        return client_class(limits=self.limits, http2=self.http2,
+                            timeout=httpx.Timeout(600.0, connect=5.0))
+
+    @property
+    def openai_client(self) -> OpenAI:
+        """Shared synchronous OpenAI client"""
+        if "openai" not in self._clients:
+            self._clients["openai"] = OpenAI(api_key=self.api_key, base_url=self.base_url,
+                                             http_client=self._http_client(httpx.Client))
+        return self._clients["openai"]
+
+    @property
+    def async_openai_client(self) -> AsyncOpenAI:
+        """Shared asynchronous OpenAI client"""
+        if "async_openai" not in self._clients:
+            self._clients["async_openai"] = AsyncOpenAI(api_key=self.api_key, base_url=self.base_url,
+                                                        http_client=self._http_client(httpx.AsyncClient))
+        return self._clients["async_openai"]
+
+    def chat_model(self, model_name: str) -> ChatOpenAI:
+        """Shared chat model for `model_name`, sending its requests through the pooled OpenAI clients"""
+        key = f"llm:{model_name}"
+        if key not in self._clients:
+            self._clients[key] = ChatOpenAI(
+                temperature=CHAT_TEMPERATURE,
+                model_name=model_name,
+                openai_api_key=self.api_key,
+                client=self.openai_client.chat.completions,
+                async_client=self.async_openai_client.chat.completions
+            )
+        return self._clients[key]
+
+    @property
+    def llm(self) -> ChatOpenAI:
+        """Shared default chat model (CHAT_MODEL)"""
+        return self.chat_model(CHAT_MODEL)
+
+    def agent_clients(self) -> Dict[str, Any]:
+        """
+        Clients for an InterviewAgent
+
+        Returns:
+            dict: llm, openai_client and async_openai_client constructor arguments
+        """
+        return {
+            "llm": self.llm,
+            "openai_client": self.openai_client,
+            "async_openai_client": self.async_openai_client
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "max_connections": self.limits.max_connections,
+            "max_keepalive_connections": self.limits.max_keepalive_connections,
+            "http2": self.http2,
+            "clients": sorted(self._clients)
+        }
+
+    async def aclose(self):
+        """Close the pooled connections"""
+        if "openai" in self._clients:
+            self._clients["openai"].close()
+        if "async_openai" in self._clients:
+            await self._clients["async_openai"].close()
+        self._clients.clear()
+
+
+_default_pool: Optional[ClientPool] = None
+
+
+def default_client_pool() -> ClientPool:
+    """The process-wide pool used by agents that are not given clients explicitly"""
+    global _default_pool
+    if _default_pool is None:
+        _default_pool = ClientPool()
+    return _default_pool
@@ -0,0 +1,158 @@
+"""
+Compact, bounded conversation context for interview prompts.
+
+Prompts used to interpolate the repr of every LangChain message (system prompts
+included), so each turn re-sent the whole transcript. Here only the question, answer
+and analysis text of each turn is kept. The most recent turns are rendered in full;
+older turns are rolled up into one-line summaries built from their analysis, and the
+oldest summaries are dropped once the token budget is reached.
+"""
+
+import re
+import time
+from typing import Callable, List, Optional
+
+
+SCORE_PATTERN = re.compile(r"Score:\s*([1-5])")
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate (about 4 characters per token for English text)"""
+    return (len(text) + 3) // 4
+
+
+class Turn:
+    """
+    One question of the interview with the candidate's answer and its analysis
+    
+    This is the only per-turn record a session keeps, so it uses __slots__ and holds
+    plain strings; prompts and LangChain messages are built from it when needed.
+    """
+
+    __slots__ = ("number", "question", "answer", "analysis", "asked_at", "answered_at",
+                 "question_tokens", "answer_tokens")
+
+    def __init__(self, number: int, question: str, asked_at: Optional[float] = None):
+        self.number = number
+        self.question = question
+        self.answer = ""
+        self.analysis = ""
+        self.asked_at = asked_at if asked_at is not None else time.time()
+        self.answered_at = 0.0
+        self.question_tokens = estimate_tokens(question)
+        self.answer_tokens = 0
+
+    @property
+    def score(self) -> Optional[int]:
+        """The 1-5 score from the analysis, if it has one"""
+        match = SCORE_PATTERN.search(self.analysis)
+        return int(match.group(1)) if match else None
+
+    def render(self) -> str:
+        lines = [f"Q{self.number}: {self.question}"]
+        if self.answer:
+            lines.append(f"A{self.number}: {self.answer}")
+        if self.analysis:
+            lines.append(self.analysis)
+        return "\n".join(lines)
+
+    def summarize(self) -> str:
+        """One-line summary: the question plus the analysis, which already condenses the answer"""
+        analysis = SCORE_PATTERN.sub("", self.analysis.replace("Analysis:", "")).strip()
+        return f"Q{self.number}: {self.question} -> {analysis or 'answered'}"
+
+
+class ConversationContext:
+    def __init__(self, max_tokens: int = 1500, recent_turns: int = 3,
+                 count_tokens: Callable[[str], int] = estimate_tokens):
+        """
+        Initialize the context
+        
+        Args:
+            max_tokens (int): Token budget for the rendered transcript
+            recent_turns (int): Number of most recent turns kept verbatim
+            count_tokens: Function used to measure text against the budget
+        """
+        self.max_tokens = max_tokens
+        self.recent_turns = recent_turns
+        self.count_tokens = count_tokens
+        self.turns: List[Turn] = []
+
+    def add_question(self, question: str) -> Turn:
+        turn = Turn(len(self.turns) + 1, question)
+        self.turns.append(turn)
+        return turn
+
+    def add_answer(self, answer: str, analysis: str = "") -> Turn:
+        """Attach the answer (and analysis, if already known) to the current turn"""
+        turn = self.turns[-1]
+        turn.answer = answer
+        turn.analysis = analysis
+        turn.answered_at = time.time()
+        turn.answer_tokens = estimate_tokens(answer)
+        return turn
+
+    def assessment(self, max_tokens: Optional[int] = None) -> str:
+        """
+        Running assessment of the interview so far: each answered question with its
+        score and analysis, and the average score
+        
+        Args:
+            max_tokens (int): Budget override; the oldest questions are dropped first
+            
+        Returns:
+            str: Average score line followed by one line per answered question
+        """
+        budget = max_tokens or self.max_tokens
+        answered = [turn for turn in self.turns if turn.answer]
+        scores = [turn.score for turn in answered if turn.score is not None]
+        average = f"{sum(scores) / len(scores):.1f}/5 over {len(scores)} scored answers" if scores else "no scores yet"
+        header = f"Average score: {average}"
+        
+        lines = []
+        used = self.count_tokens(header)
+        for turn in reversed(answered):
+            score = f"{turn.score}/5" if turn.score is not None else "unscored"
+            line = f"[{score}] {turn.summarize()}"
+            cost = self.count_tokens(line)
+            if used + cost > budget:
+                break
+            lines.insert(0, line)
+            used += cost
+        return "\n".join([header] + lines)
+
+    def render(self, max_tokens: Optional[int] = None) -> str:
+        """
+        Render the transcript within the token budget
+        
+        Args:
+            max_tokens (int): Budget override, e.g. a larger one for the final feedback
+            
+        Returns:
+            str: Summary lines for older turns followed by the recent turns in full
+        """
+        budget = max_tokens or self.max_tokens
+        recent = self.turns[-self.recent_turns:] if self.recent_turns else []
+        older = self.turns[:len(self.turns) - len(recent)]
+
+        sections = [turn.render() for turn in recent]
+        used = sum(self.count_tokens(section) for section in sections)
+
+        # Recent turns that don't fit are summarized too, newest kept longest
+        while used > budget and len(sections) > 1:
+            older.append(recent.pop(0))
+            used -= self.count_tokens(sections.pop(0))
+
+        summaries = []
+        for turn in reversed(older):
+            line = turn.summarize()
+            cost = self.count_tokens(line)
+            if used + cost > budget:
+                break
+            summaries.insert(0, line)
+            used += cost
+
+        omitted = len(older) - len(summaries)
+        header = [f"({omitted} earlier questions omitted)"] if omitted else []
+        summary_block = ["Earlier questions (summarized):"] + summaries if summaries else []
+        return "\n".join(header + summary_block + sections)
@@ -0,0 +1,243 @@
+"""
+Per-turn deadlines, call timeouts, hedged requests and bounded retries.
+
+Each WebSocket event runs under a deadline (TURN_DEADLINE_SECONDS). It is kept in a
+context variable, so every stage of the turn sees the time that is left without passing
+it around: model and TTS calls get the smaller of their own timeout and the remaining
+budget, and a call that can't start in time fails with DeadlineExceeded instead of
+hanging the candidate's turn.
+
+A CallPolicy wraps one kind of outbound call. It keeps the recent latency of each call
+key, and when a call is still running after that latency's percentile (p95 by default)
+it sends a duplicate and takes whichever answers first, cancelling the other. Failed
+or timed-out calls are retried a bounded number of times, only while the remaining
+budget allows. Hedges, retries and timeouts are counted on /metrics.
+"""
+
+import asyncio
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Optional
+from call_scheduler import SchedulerBusy
+from model_router import LatencyWindow
+from observability import CALL_HEDGES, CALL_RETRIES, CALL_TIMEOUTS
+
+# Absolute deadline (time.monotonic) of the current turn, None without one
+_deadline: ContextVar[Optional[float]] = ContextVar("deadline", default=None)
+
+
+class DeadlineExceeded(Exception):
+    """Raised when a call can't finish within its timeout or the current turn's deadline"""
+
+    def __init__(self, operation: str):
+        super().__init__(f"Deadline exceeded waiting for {operation}")
+        self.operation = operation
+
+
+@contextmanager
+def deadline(seconds: Optional[float]):
+    """
+    Run the block (and the tasks it starts) with a deadline `seconds` from now
+
+    A nested deadline can only tighten the enclosing one. None or 0 keeps the
+    enclosing deadline as it is.
+    """
+    current = _deadline.get()
+    if seconds:
+        expires = time.monotonic() + seconds
+        current = expires if current is None else min(current, expires)
+    token = _deadline.set(current)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+@contextmanager
+def detached():
+    """Run the block without the turn's deadline, for work that outlives the turn (analysis, feedback)"""
+    token = _deadline.set(None)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def remaining() -> Optional[float]:
+    """Seconds left until the current deadline, or None without one"""
+    expires = _deadline.get()
+    return None if expires is None else expires - time.monotonic()
+
+
+def _budget(timeout: Optional[float], operation: str) -> Optional[float]:
+    """The time a call may take: its own timeout capped by the remaining turn budget"""
+    left = remaining()
+    if left is not None and left <= 0:
+        raise DeadlineExceeded(operation)
+    if left is None:
+        return timeout
+    return left if timeout is None else min(timeout, left)
+
+
+async def bounded_stream(stream: AsyncIterator[Any], operation: str,
+                         first_timeout: Optional[float] = None) -> AsyncIterator[Any]:
+    """
+    Iterate a stream, failing with DeadlineExceeded when the next item doesn't arrive in time
+
+    Args:
+        stream: The async iterator, e.g. a chat model's astream()
+        operation (str): Name of the call, for the error
+        first_timeout (float): Timeout for the first item (later items only have the deadline)
+    """
+    iterator = stream.__aiter__()
+    timeout = first_timeout
+    try:
+        while True:
+            budget = _budget(timeout, operation)
+            try:
+                item = await asyncio.wait_for(iterator.__anext__(), budget)
+            except StopAsyncIteration:
+                return
+            except asyncio.TimeoutError:
+                CALL_TIMEOUTS.inc(operation=operation)
+                raise DeadlineExceeded(operation) from None
+            timeout = None
+            yield item
+    finally:
+        aclose = getattr(iterator, "aclose", None)
+        if aclose is not None:
+            await aclose()
+
+
+class CallPolicy:
+    def __init__(self, name: str, timeout: Optional[float] = None, max_retries: int = 0,
+                 retry_backoff: float = 0.2, hedge_percentile: float = 0.95, hedge_min_samples: int = 20,
+                 window_seconds: float = 60.0, max_samples: int = 200,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Initialize the policy
+
+        Args:
+            name (str): Operation name used in errors and metrics ("llm", "tts")
+            timeout (float): Seconds one attempt may take (None: only the turn deadline)
+            max_retries (int): Retries after a failed or timed-out attempt
+            retry_backoff (float): Seconds before the first retry, doubled for each further one
+            hedge_percentile (float): Send a duplicate once an attempt is slower than this
+                percentile of recent latencies (0 disables hedging)
+            hedge_min_samples (int): Latency samples needed before hedging
+            window_seconds (float): How long latency samples count
+            max_samples (int): Samples kept per call key
+            clock: Monotonic clock in seconds
+        """
+        self.name = name
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.hedge_percentile = hedge_percentile
+        self.hedge_min_samples = hedge_min_samples
+        self.window_seconds = window_seconds
+        self.max_samples = max_samples
+        self.clock = clock
+        self.latency: Dict[str, LatencyWindow] = {}
+        self.calls = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+        self.retries = 0
+        self.timeouts = 0
+
+    def _window(self, key: str) -> LatencyWindow:
+        if key not in self.latency:
+            self.latency[key] = LatencyWindow(self.max_samples, self.window_seconds)
+        return self.latency[key]
+
+    def hedge_delay(self, key: str) -> Optional[float]:
+        """Seconds after which a call for `key` gets a duplicate, or None to not hedge"""
+        if not self.hedge_percentile:
+            return None
+        return self._window(key).percentile(self.clock(), self.hedge_percentile, self.hedge_min_samples)
+
+    async def _attempt(self, key: str, call: Callable[[], Awaitable[Any]]) -> Any:
+        start = self.clock()
+        result = await call()
+        now = self.clock()
+        self._window(key).add(now, now - start)
+        return result
+
+    async def _hedged(self, key: str, call: Callable[[], Awaitable[Any]]) -> Any:
+        """One attempt, plus a duplicate if it is slower than the hedge delay; the first success wins"""
+        delay = self.hedge_delay(key)
+        tasks = [asyncio.ensure_future(self._attempt(key, call))]
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=delay)
+            if not done:
+                self.hedges += 1
+                CALL_HEDGES.inc(operation=self.name)
+                tasks.append(asyncio.ensure_future(self._attempt(key, call)))
+                done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+            while True:
+                for task in done:
+                    if task.exception() is None:
+                        if task is not tasks[0]:
+                            self.hedge_wins += 1
+                        return task.result()
+                pending = [task for task in tasks if not task.done()]
+                if not pending:
+                    raise next(iter(done)).exception()
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def call(self, key: str, call: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run a call under the policy
+
+        Args:
+            key (str): Groups calls with similar latency (e.g. the prompt kind), for the hedge delay
+            call: Coroutine function making one attempt; it may be called more than once
+
+        Returns:
+            The result of the first successful attempt
+
+        Raises:
+            DeadlineExceeded: The turn's deadline passed before an attempt succeeded
+            SchedulerBusy: Passed through without retrying
+            Exception: The last attempt's error once the retries are used up
+        """
+        self.calls += 1
+        for retry in range(self.max_retries + 1):
+            budget = _budget(self.timeout, self.name)
+            try:
+                return await asyncio.wait_for(self._hedged(key, call), budget)
+            except asyncio.TimeoutError:
+                self.timeouts += 1
+                CALL_TIMEOUTS.inc(operation=self.name)
+                error = DeadlineExceeded(self.name)
+            except (SchedulerBusy, DeadlineExceeded):
+                raise
+            except Exception as e:
+                error = e
+
+            backoff = self.retry_backoff * 2 ** retry
+            left = remaining()
+            if retry == self.max_retries or (left is not None and left <= backoff):
+                raise error
+            self.retries += 1
+            CALL_RETRIES.inc(operation=self.name)
+            await asyncio.sleep(backoff)
+
+    def stats(self) -> Dict[str, Any]:
+        now = self.clock()
+        return {
+            "calls": self.calls,
+            "hedges": self.hedges,
+            "hedge_wins": self.hedge_wins,
+            "retries": self.retries,
+            "timeouts": self.timeouts,
+            "hedge_delay_seconds": {
+                key: round(delay, 3)
+                for key, window in self.latency.items()
+                if (delay := window.percentile(now, self.hedge_percentile or 0.95, self.hedge_min_samples)) is not None
+            }
+        }
@@ -0,0 +1,86 @@
+"""
+Cache for personal information extracted from resumes.
+
+Reconnects and retries usually upload the same PDF again, so the extraction result is
+cached under a hash of the normalized resume text, with a TTL and a bounded number of
+entries (least recently used entries are evicted first).
+"""
+
+import copy
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+
+def resume_hash(resume: str) -> str:
+    """Hash the resume text with whitespace normalized, so re-extracted PDFs match"""
+    normalized = " ".join(resume.split())
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+class ExtractionCache:
+    def __init__(self, max_entries: int = 1000, ttl_seconds: float = 24 * 60 * 60,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Initialize the cache
+        
+        Args:
+            max_entries (int): Maximum number of cached resumes
+            ttl_seconds (float): How long an extraction stays valid
+            clock: Time source, replaceable in tests
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.clock = clock
+        # hash -> (expires_at, personal_info, seconds the extraction took)
+        self.entries: "OrderedDict[str, Tuple[float, Dict[str, Any], float]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.expirations = 0
+        self.evictions = 0
+        self.saved_seconds = 0.0
+
+    def get(self, resume: str) -> Optional[Dict[str, Any]]:
+        """Return a copy of the cached personal information for this resume, or None"""
+        key = resume_hash(resume)
+        entry = self.entries.get(key)
+        if entry is not None and entry[0] <= self.clock():
+            del self.entries[key]
+            self.expirations += 1
+            entry = None
+        if entry is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        self.saved_seconds += entry[2]
+        return copy.deepcopy(entry[1])
+
+    def put(self, resume: str, personal_info: Dict[str, Any], elapsed: float = 0.0):
+        """
+        Store an extraction result
+        
+        Args:
+            resume (str): The resume text the information was extracted from
+            personal_info (dict): The parsed extraction result
+            elapsed (float): Seconds the extraction call took, credited on each hit
+        """
+        key = resume_hash(resume)
+        self.entries.pop(key, None)
+        self.entries[key] = (self.clock() + self.ttl_seconds, copy.deepcopy(personal_info), elapsed)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "expirations": self.expirations,
+            "evictions": self.evictions,
+            "entries": len(self.entries),
+            "saved_seconds": round(self.saved_seconds, 3),
+        }
@@ -0,0 +1,120 @@
+"""
+In-memory fakes and fixtures shared by the tests and the benchmarks: a job description,
+a resume and an answer, a WebSocket that records what would go on the wire, and a
+minimal PDF writer.
+"""
+
+import asyncio
+import json
+
+JOB_DESCRIPTION = """
+Senior Python Developer
+
+We are seeking a skilled Senior Python Developer with at least 5 years of experience to join our growing team.
+The ideal candidate will have deep knowledge of Python, FastAPI or Django, and experience with machine learning libraries.
+
+Requirements:
+- 5+ years of Python development experience
+- Proficient in one or more Python frameworks (FastAPI, Django)
+- Experience with machine learning libraries (scikit-learn, TensorFlow, PyTorch)
+- Knowledge of database technologies (SQL, NoSQL)
+- Good understanding of RESTful APIs
+"""
+
+RESUME = """
+Jane Smith
+Senior Software Engineer
+
+Experienced Python developer with 6 years of experience building web applications and machine learning solutions.
+
+ABC Tech (2020-Present) - Senior Python Developer
+- Developed and maintained multiple FastAPI applications for financial data analysis
+- Implemented machine learning models for predictive analytics using scikit-learn
+- Optimized database queries resulting in 40% performance improvement
+
+XYZ Solutions (2018-2020) - Python Developer
+- Built RESTful APIs using Django REST framework
+- Developed data pipelines for processing large datasets
+
+Skills: Python, JavaScript, SQL, FastAPI, Django, scikit-learn, PostgreSQL, MongoDB, Docker
+"""
+
+ANSWER = (
+    "At ABC Tech I built a FastAPI service that scored transactions in real time. "
+    "We used a rule-based filter in front of a scikit-learn model and cached features in Redis."
+)
+
+
+class FakeWebSocket:
+    """
+    In-memory WebSocket that records what would go on the wire.
+    JSON is serialized exactly as starlette's WebSocket.send_json does.
+    """
+
+    def __init__(self, query_params: dict = None, accept_delay: float = 0.0, send_delay: float = 0.0):
+        self.query_params = query_params or {}
+        self.frames = []
+        self.bytes_sent = 0
+        self.closed = False
+        # Simulated network time, for slow handshakes and slow readers
+        self.accept_delay = accept_delay
+        self.send_delay = send_delay
+
+    async def accept(self):
+        if self.accept_delay:
+            await asyncio.sleep(self.accept_delay)
+
+    async def close(self, code: int = 1000):
+        self.closed = True
+
+    async def send_json(self, data):
+        await self.send_text(json.dumps(data, separators=(",", ":"), ensure_ascii=False))
+
+    async def send_text(self, text: str):
+        if self.send_delay:
+            await asyncio.sleep(self.send_delay)
+        self.frames.append(text)
+        self.bytes_sent += len(text.encode("utf-8"))
+
+    async def send_bytes(self, data: bytes):
+        if self.send_delay:
+            await asyncio.sleep(self.send_delay)
+        self.frames.append(data)
+        self.bytes_sent += len(data)
+
+
+def make_pdf(pages: list) -> bytes:
+    """
+    Build a minimal text PDF with one page per string (lines split on newlines),
+    readable by PyPDF2, without any PDF-writing dependency.
+    """
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        None,  # Pages, filled in once the page object numbers are known
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    page_numbers = []
+    for text in pages:
+        lines = []
+        for line in text.split("\n"):
+            escaped = line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+            lines.append(f"({escaped}) Tj T*")
+        stream = ("BT /F1 10 Tf 12 TL 50 780 Td " + " ".join(lines) + " ET").encode("latin-1", "replace")
+        objects.append(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+        objects.append(None)
+        page_numbers.append(len(objects))
+        objects[-1] = (b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+                       b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % (len(objects) - 1))
+    kids = b" ".join(b"%d 0 R" % number for number in page_numbers)
+    objects[1] = b"<< /Type /Pages /Kids [" + kids + b"] /Count %d >>" % len(page_numbers)
+
+    output = b"%PDF-1.4\n"
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(output))
+        output += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref = len(output)
+    output += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    output += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    output += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    return output
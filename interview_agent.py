@@ -1,24 +1,66 @@
 import os
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, AsyncIterator
 from dotenv import load_dotenv
 from langchain_openai import ChatOpenAI
 from langchain.prompts import ChatPromptTemplate, MessagesPlaceholder
 from langchain_core.messages import HumanMessage, AIMessage, SystemMessage
 from langchain_core.output_parsers import StrOutputParser
-from langchain.memory import ConversationBufferMemory
 from langchain_core.runnables import RunnablePassthrough
 import langchain
 from operator import itemgetter
 from langchain_core.exceptions import OutputParserException
 import json
 import base64
-from openai import OpenAI
+import asyncio
+import contextlib
+import time
+from openai import OpenAI, AsyncOpenAI
+from streaming import stream_sentence_audio
+from tts_cache import TTSCache, cache_key
+from extraction_cache import ExtractionCache, resume_hash
+from single_flight import SingleFlight
+from model_router import ModelRouter
+from job_postings import JobPosting
+from deadlines import CallPolicy, bounded_stream, detached
+from structured_output import (PERSONAL_INFO_SCHEMA, FEEDBACK_SCHEMA, QUESTION_BANK_SCHEMA, StructuredOutputError,
+                               parse_structured, repair_messages, response_format, response_text)
+from conversation_context import ConversationContext, Turn, estimate_tokens
+from observability import (get_logger, STAGE_SECONDS, LLM_PROMPT_TOKENS, LLM_COMPLETION_TOKENS,
+                           TTS_AUDIO_BYTES, STRUCTURED_OUTPUTS, BANK_QUESTIONS)
+from client_pool import ClientPool, default_client_pool
+from call_scheduler import (CallScheduler, SchedulerBusy, PRIORITY_INTERACTIVE, PRIORITY_BACKGROUND,
+                            PRIORITY_FEEDBACK)
 
 # Load environment variables
 load_dotenv()
 
+logger = get_logger(__name__)
+
+TTS_MODEL = "tts-1"
+TTS_VOICE = "alloy"
+
+# Bumped whenever the to_state() layout changes (2: job_digest)
+STATE_VERSION = 2
+# Older layouts from_state() still restores: version 1 states have no job digest
+COMPATIBLE_STATE_VERSIONS = (1, STATE_VERSION)
+
+# Identical TTS and extraction requests in flight at the same time, from any session in
+# this process, share one call (keyed by content hash)
+tts_flights = SingleFlight("tts")
+extraction_flights = SingleFlight("extraction")
+
 class InterviewAgent:
-    def __init__(self, job_description: str, resume: str, max_questions: int = 10):
+    def __init__(self, job_description: str, resume: str, max_questions: int = 10,
+                 llm: Optional[Any] = None, openai_client: Optional[Any] = None,
+                 async_openai_client: Optional[Any] = None, generate_introduction: bool = True,
+                 overlap_analysis: bool = False, tts_cache: Optional[TTSCache] = None,
+                 extraction_cache: Optional[ExtractionCache] = None, context_max_tokens: int = 1500,
+                 feedback_context_tokens: int = 4000, client_pool: Optional[ClientPool] = None,
+                 scheduler: Optional[CallScheduler] = None, session_id: str = "",
+                 on_wait: Optional[Any] = None, speculate_closing: bool = False,
+                 router: Optional[ModelRouter] = None, llm_policy: Optional[CallPolicy] = None,
+                 tts_policy: Optional[CallPolicy] = None, structured_output: str = "function",
+                 job_posting: Optional[JobPosting] = None, bank_questions: int = 2):
         """
         Initialize the interview agent
         
@@ -26,30 +68,73 @@ class InterviewAgent:
             job_description (str): The job description text
             resume (str): The resume text
             max_questions (int): Maximum number of questions to ask (default: 10)
+            llm: Optional chat model to use instead of GPT-4 (must support invoke/ainvoke)
+            openai_client: Optional synchronous client used for text-to-speech
+            async_openai_client: Optional asynchronous client used for text-to-speech
+            generate_introduction (bool): Whether astart_interview generates the (unsent) introduction
+            overlap_analysis (bool): Whether aprocess_answer analyzes the answer in the background
+                while the next question is generated
+            tts_cache (TTSCache): Optional cache shared across sessions for synthesized audio
+            extraction_cache (ExtractionCache): Optional cache of personal information by resume
+            context_max_tokens (int): Token budget for the transcript in per-turn prompts
+            feedback_context_tokens (int): Token budget for the transcript in the feedback prompt
+            client_pool (ClientPool): Pool to borrow any clients not given explicitly from
+                (default: the process-wide pool)
+            scheduler (CallScheduler): Optional scheduler that every async model call goes through
+            session_id (str): Identifies the session to the scheduler, for fairness
+            on_wait: Optional coroutine function told when a call has to queue in the scheduler
+            speculate_closing (bool): Whether the async API prepares the closing message and its
+                audio while the candidate answers the last question
+            router (ModelRouter): Optional router picking the chat model per prompt kind
+                (default: every prompt goes to llm)
+            llm_policy (CallPolicy): Timeout, hedging and retries for async chat calls
+                (default: none, only the turn deadline applies)
+            tts_policy (CallPolicy): Timeout, hedging and retries for async TTS calls
+            structured_output (str): Response format of the JSON calls (extraction, feedback):
+                "function", "json_schema", "json_object" or "none" (see structured_output.py)
+            job_posting (JobPosting): Shared digest and seed question bank for the job description
+                (see job_postings.py); the digest is used if it is ready when the session starts
+            bank_questions (int): Questions per interview taken from the job posting's bank
+                (the first one and then every other one)
         """
         self.job_description = job_description
         self.resume = resume
         self.max_questions = max_questions
+        self.generate_introduction = generate_introduction
+        self.overlap_analysis = overlap_analysis
+        self.tts_cache = tts_cache
+        self.extraction_cache = extraction_cache
+        self._pending_analyses = set()
         self.current_question_number = 0
-        self.conversation_history = []
-        self.answers = []
-        
-        # Initialize the LLM
-        self.llm = ChatOpenAI(
-            temperature=0.5,
-            model_name="gpt-4",
-            openai_api_key=os.getenv("OPENAI_API_KEY")
-        )
-        
-        # Initialize OpenAI client for audio
-        self.openai_client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+        self.context = ConversationContext(max_tokens=context_max_tokens)
+        self.personal_info = None
+        self.introduction = ""
+        self.job_posting = job_posting
+        self.bank_questions = bank_questions
+        # Fixed for the whole session, so the prefix stays byte-for-byte the same
+        self.job_digest = job_posting.digest if job_posting else None
+        self.session_prefix = self._build_session_prefix()
+        self.feedback_context_tokens = feedback_context_tokens
+        self.scheduler = scheduler
+        self.session_id = session_id
+        self.on_wait = on_wait
+        self._feedback_task = None
+        self.speculate_closing = speculate_closing
+        self._closing_task = None
+        self.speculation = {"used": 0, "discarded": 0}
+        self.router = router
+        self.llm_policy = llm_policy or CallPolicy("llm", hedge_percentile=0)
+        self.tts_policy = tts_policy or CallPolicy("tts", hedge_percentile=0)
+        self.structured_output = structured_output
+        response_format(PERSONAL_INFO_SCHEMA, structured_output)  # fail fast on an unknown mode
         
-        # Initialize the memory
-        self.memory = ConversationBufferMemory(
-            return_messages=True,
-            output_key="output",
-            input_key="input"
-        )
+        # Borrow the LLM and the OpenAI audio clients (sync for scripts, async for the
+        # web server) from the shared pool, so sessions reuse its connections
+        if llm is None or openai_client is None or async_openai_client is None:
+            client_pool = client_pool or default_client_pool()
+        self.llm = llm or client_pool.llm
+        self.openai_client = openai_client or client_pool.openai_client
+        self.async_openai_client = async_openai_client or client_pool.async_openai_client
     
     def _generate_audio(self, text: str) -> str:
         """
@@ -61,72 +146,288 @@ class InterviewAgent:
         Returns:
             str: Base64 encoded audio data
         """
+        if self.tts_cache:
+            cached = self.tts_cache.get(TTS_MODEL, TTS_VOICE, text)
+            if cached is not None:
+                return cached.base64()
+        
         try:
-            response = self.openai_client.audio.speech.create(
-                model="tts-1",
-                voice="alloy",
-                input=text
-            )
+            with STAGE_SECONDS.time(stage="tts"):
+                response = self.openai_client.audio.speech.create(
+                    model=TTS_MODEL,
+                    voice=TTS_VOICE,
+                    input=text
+                )
+            TTS_AUDIO_BYTES.inc(len(response.content))
             
             # Convert audio to base64
             audio_data = response.content
+            if self.tts_cache:
+                return self.tts_cache.put(TTS_MODEL, TTS_VOICE, text, audio_data).base64()
             return base64.b64encode(audio_data).decode('utf-8')
         except Exception as e:
-            print(f"Error generating audio: {str(e)}")
+            logger.error("Error generating audio: %s", e)
             return ""
 
-    def start_interview(self) -> str:
-        """Start the interview and get the first question"""
-        # First, extract personal information from resume
-        personal_info_prompt = f"""
-        Extract the following personal information from the resume:
+    async def _agenerate_audio(self, text: str, priority: int = PRIORITY_INTERACTIVE) -> bytes:
+        """
+        Async version of _generate_audio that does not block the event loop.
+        Returns the raw MP3 bytes; encoding for the wire is left to the caller.
+        
+        Args:
+            text (str): Text to convert to audio
+            priority (int): Scheduler priority of the TTS call (a call already in flight
+                for the same text keeps the priority it was started with)
+            
+        Returns:
+            bytes: Audio data (empty on failure)
+        """
+        if self.tts_cache:
+            cached = self.tts_cache.get(TTS_MODEL, TTS_VOICE, text)
+            if cached is not None:
+                return cached
+        
+        return await tts_flights.do(cache_key(TTS_MODEL, TTS_VOICE, text), lambda: self._asynthesize(text, priority))
+    
+    async def _asynthesize(self, text: str, priority: int = PRIORITY_INTERACTIVE) -> bytes:
+        """
+        Call the TTS API for _agenerate_audio under the TTS policy
+        
+        Returns empty audio once the retries or the turn deadline are used up, so the
+        caller can still send the text.
+        """
+        async def attempt():
+            async with self._slot(TTS_MODEL, priority):
+                with STAGE_SECONDS.time(stage="tts"):
+                    return await self.async_openai_client.audio.speech.create(
+                        model=TTS_MODEL,
+                        voice=TTS_VOICE,
+                        input=text
+                    )
+        
+        try:
+            response = await self.tts_policy.call("tts", attempt)
+            TTS_AUDIO_BYTES.inc(len(response.content))
+            if self.tts_cache:
+                return self.tts_cache.put(TTS_MODEL, TTS_VOICE, text, response.content)
+            return response.content
+        except SchedulerBusy:
+            raise
+        except Exception as e:
+            logger.error("Error generating audio: %s", e)
+            return b""
+
+    def _slot(self, model: str, priority: int = PRIORITY_INTERACTIVE):
+        """Scheduler slot for one outbound call (a no-op without a scheduler)"""
+        if self.scheduler is None:
+            return contextlib.nullcontext()
+        return self.scheduler.slot(model, self.session_id, priority, self.on_wait)
+
+    def _count_prompt(self, messages: List[Any], kind: str):
+        LLM_PROMPT_TOKENS.inc(sum(estimate_tokens(str(message.content)) for message in messages), kind=kind)
+
+    def _route(self, kind: str):
+        """The (tier, chat model) for a prompt kind; tier is None without a router"""
+        if self.router is None:
+            return None, self.llm
+        return self.router.route(kind)
+
+    def _observe(self, tier: Optional[str], kind: str, seconds: float):
+        STAGE_SECONDS.observe(seconds, stage="llm", kind=kind)
+        if tier is not None:
+            self.router.observe(tier, kind, seconds)
+
+    def _invoke(self, messages: List[Any], kind: str, **options) -> Any:
+        """Call the chat model for the prompt kind, timed and counted under the kind"""
+        tier, llm = self._route(kind)
+        self._count_prompt(messages, kind)
+        start = time.perf_counter()
+        try:
+            response = llm.invoke(messages, **options)
+        finally:
+            self._observe(tier, kind, time.perf_counter() - start)
+        LLM_COMPLETION_TOKENS.inc(estimate_tokens(response_text(response)), kind=kind)
+        return response
+
+    async def _ainvoke(self, messages: List[Any], kind: str, priority: int = PRIORITY_INTERACTIVE,
+                       **options) -> Any:
+        """
+        Call the chat model for the prompt kind through the scheduler and the LLM policy
+        (timeout, hedging, retries), timed and counted under the kind
+        
+        Extra keyword arguments (e.g. a response format) go to the chat model.
+        """
+        tier, llm = self._route(kind)
+        self._count_prompt(messages, kind)
+        
+        async def attempt():
+            async with self._slot(getattr(llm, "model_name", "chat"), priority):
+                start = time.perf_counter()
+                try:
+                    return await llm.ainvoke(messages, **options)
+                finally:
+                    self._observe(tier, kind, time.perf_counter() - start)
+        
+        response = await self.llm_policy.call(f"{tier}/{kind}" if tier else kind, attempt)
+        LLM_COMPLETION_TOKENS.inc(estimate_tokens(response_text(response)), kind=kind)
+        return response
+
+    def _parse_structured(self, response: Any, schema: Dict[str, Any], kind: str,
+                          repaired: bool = False) -> tuple:
+        """(validated object, None) from a JSON call's response, or (None, why it is unusable)"""
+        try:
+            data, clean = parse_structured(response_text(response), schema)
+        except StructuredOutputError as e:
+            logger.warning("Unusable %s output%s: %s", kind, " after repair" if repaired else "", e)
+            if repaired:
+                STRUCTURED_OUTPUTS.inc(kind=kind, outcome="failed")
+            return None, str(e)
+        outcome = "repaired" if repaired else "clean" if clean else "recovered"
+        STRUCTURED_OUTPUTS.inc(kind=kind, outcome=outcome)
+        return data, None
+
+    def _structured(self, messages: List[Any], kind: str, schema: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Make a call that returns `schema`-shaped JSON
+        
+        The output is parsed tolerantly; if that fails, a short repair call (kind "repair")
+        fixes the format instead of the whole call being made again.
+        
+        Returns:
+            dict: The validated object, or None if the repair failed too
+        """
+        options = response_format(schema, self.structured_output)
+        response = self._invoke(messages, kind, **options)
+        data, error = self._parse_structured(response, schema, kind)
+        if data is None:
+            repaired = self._invoke(repair_messages(response_text(response), schema, error), "repair", **options)
+            data, _ = self._parse_structured(repaired, schema, kind, repaired=True)
+        return data
+
+    async def _astructured(self, messages: List[Any], kind: str, schema: Dict[str, Any],
+                           priority: int = PRIORITY_INTERACTIVE) -> Optional[Dict[str, Any]]:
+        """Async version of _structured"""
+        options = response_format(schema, self.structured_output)
+        response = await self._ainvoke(messages, kind, priority, **options)
+        data, error = self._parse_structured(response, schema, kind)
+        if data is None:
+            repaired = await self._ainvoke(repair_messages(response_text(response), schema, error), "repair",
+                                           priority, **options)
+            data, _ = self._parse_structured(repaired, schema, kind, repaired=True)
+        return data
+
+    def _build_session_prefix(self, personal_info: Optional[Dict[str, Any]] = None) -> str:
+        """
+        Build the canonical session prefix: system role, job description, resume and,
+        once extracted, the candidate profile.
+        
+        It is built once per session and sent byte-for-byte as the first message of
+        every call, with the per-turn instructions after it, so the provider can serve
+        the long stable part from its prompt cache. The version without the profile
+        (used for the extraction call) is an exact prefix of the full one.
+        """
+        prefix = (
+            "You are an expert AI interviewer specializing in technical interviews. "
+            "You are conducting a job interview based on the job description and the candidate's resume below.\n"
+            "\n"
+            + (f"JOB REQUIREMENTS (digest of the job description):\n{self.job_digest.strip()}\n" if self.job_digest
+               else f"JOB DESCRIPTION:\n{self.job_description.strip()}\n")
+            + "\n"
+            "CANDIDATE'S RESUME:\n"
+            f"{self.resume.strip()}\n"
+        )
+        if personal_info:
+            prefix += (
+                "\n"
+                "CANDIDATE'S INFORMATION:\n"
+                f"Name: {personal_info['name']}\n"
+                f"Experience: {personal_info['experience']}\n"
+                f"Current Role: {personal_info['current_role']}\n"
+                f"Key Skills: {', '.join(personal_info['skills'])}\n"
+                f"Notable Achievements: {', '.join(personal_info['achievements'])}\n"
+            )
+        return prefix
+
+    def _set_personal_info(self, personal_info: Dict[str, Any]) -> Dict[str, Any]:
+        """Store the extracted profile and extend the session prefix with it"""
+        self.personal_info = personal_info
+        self.session_prefix = self._build_session_prefix(personal_info)
+        return personal_info
+
+    def _messages(self, instructions: str) -> List[Any]:
+        """The session prefix followed by the instructions for this call"""
+        return [SystemMessage(content=self.session_prefix), HumanMessage(content=instructions)]
+
+    def _personal_info_prompt(self) -> str:
+        """Build the prompt that extracts personal information from the resume"""
+        return """
+        Extract the following personal information from the resume above:
         1. Full name
         2. Years of experience
         3. Primary technical skills
         4. Current/last role
         5. Notable achievements (1-2)
 
-        RESUME:
-        {self.resume}
-
         Format the response as a JSON object:
-        {{
+        {
             "name": "Full Name",
             "experience": "X years",
             "skills": ["skill1", "skill2", "skill3"],
             "current_role": "Role Title",
             "achievements": ["achievement1", "achievement2"]
-        }}
+        }
 
         If any information is not available, use "Not specified" for that field.
         """
+
+    def _personal_info_or_default(self, personal_info: Optional[Dict[str, Any]],
+                                  elapsed: float = 0.0) -> Dict[str, Any]:
+        """Cache a successful extraction, or fall back to placeholders"""
+        if personal_info is not None:
+            # Only successful extractions are worth reusing
+            if self.extraction_cache:
+                self.extraction_cache.put(self.resume, personal_info, elapsed)
+            return personal_info
+        return {
+            "name": "Not specified",
+            "experience": "Not specified",
+            "skills": ["Not specified"],
+            "current_role": "Not specified",
+            "achievements": ["Not specified"]
+        }
+
+    def _extract_personal_info(self) -> Dict[str, Any]:
+        """Extract personal information from the resume, reusing a cached extraction if any"""
+        if self.extraction_cache:
+            cached = self.extraction_cache.get(self.resume)
+            if cached is not None:
+                return self._set_personal_info(cached)
         
-        personal_info_response = self.llm.invoke([SystemMessage(content=personal_info_prompt)])
-        try:
-            personal_info = json.loads(personal_info_response.content)
-        except json.JSONDecodeError:
-            personal_info = {
-                "name": "Not specified",
-                "experience": "Not specified",
-                "skills": ["Not specified"],
-                "current_role": "Not specified",
-                "achievements": ["Not specified"]
-            }
-        
-        # System message that explains the task
-        system_prompt = f"""
-        You are an expert AI interviewer specializing in technical interviews. Your task is to conduct a job interview based on the provided job description and the candidate's resume.
-        
-        JOB DESCRIPTION:
-        {self.job_description}
-        
-        CANDIDATE'S INFORMATION:
-        Name: {personal_info['name']}
-        Experience: {personal_info['experience']}
-        Current Role: {personal_info['current_role']}
-        Key Skills: {', '.join(personal_info['skills'])}
-        Notable Achievements: {', '.join(personal_info['achievements'])}
+        start = time.perf_counter()
+        personal_info = self._structured(self._messages(self._personal_info_prompt()), "extraction",
+                                         PERSONAL_INFO_SCHEMA)
+        return self._set_personal_info(self._personal_info_or_default(personal_info, time.perf_counter() - start))
+
+    async def _aextract_personal_info(self) -> Dict[str, Any]:
+        """Async version of _extract_personal_info"""
+        if self.extraction_cache:
+            cached = self.extraction_cache.get(self.resume)
+            if cached is not None:
+                return self._set_personal_info(cached)
         
+        personal_info = await extraction_flights.do(resume_hash(self.resume), self._aextract_uncached)
+        return self._set_personal_info(personal_info)
+    
+    async def _aextract_uncached(self) -> Dict[str, Any]:
+        """Make the extraction call for _aextract_personal_info"""
+        start = time.perf_counter()
+        personal_info = await self._astructured(self._messages(self._personal_info_prompt()), "extraction",
+                                                PERSONAL_INFO_SCHEMA)
+        return self._personal_info_or_default(personal_info, time.perf_counter() - start)
+
+    def _introduction_prompt(self, personal_info: Dict[str, Any]) -> str:
+        """Build the instructions that produce the interviewer's introduction"""
+        return f"""
         First, analyze if the candidate's resume matches the job requirements. If there's a significant mismatch, respond with ONLY this message:
         "Hello {personal_info['name']}, I've reviewed your resume and the job requirements. Unfortunately, there seems to be a significant mismatch between your experience and the role's requirements. The position requires [specific requirements from JD] which are not reflected in your background. Would you like to proceed with the interview anyway?"
 
@@ -135,27 +436,11 @@ class InterviewAgent:
 
         DO NOT include any questions in this response. The first question will be asked in the next interaction.
         """
-        
-        response = self.llm.invoke([SystemMessage(content=system_prompt)])
-        introduction = response.content
-        
-        # Store the introduction in conversation history
-        self.conversation_history.append(SystemMessage(content=system_prompt))
-        self.conversation_history.append(AIMessage(content=introduction))
-        
-        # Generate the first question
-        question_prompt = f"""
-        Based on the job description and candidate's information, ask ONE specific technical question.
-        
-        JOB DESCRIPTION:
-        {self.job_description}
-        
-        CANDIDATE'S INFORMATION:
-        Name: {personal_info['name']}
-        Experience: {personal_info['experience']}
-        Current Role: {personal_info['current_role']}
-        Key Skills: {', '.join(personal_info['skills'])}
-        Notable Achievements: {', '.join(personal_info['achievements'])}
+
+    def _first_question_prompt(self) -> str:
+        """Build the instructions that produce the first interview question"""
+        return """
+        Based on the job description and candidate's information above, ask ONE specific technical question.
 
         The question should:
         1. Be specific to their experience and current role
@@ -170,108 +455,54 @@ class InterviewAgent:
 
         Respond with ONLY the question, no additional text or context.
         """
-        
-        question_response = self.llm.invoke([SystemMessage(content=question_prompt)])
-        first_question = question_response.content
-        
-        # Store the first question in conversation history
-        self.conversation_history.append(SystemMessage(content=question_prompt))
-        self.conversation_history.append(AIMessage(content=first_question))
-        
-        self.current_question_number = 1
-        
-        # Generate audio for the question
-        audio_data = self._generate_audio(first_question)
-        
-        # Return the question with audio as a single key-value pair
-        return {
-            first_question: audio_data,
-            "question_number": self.current_question_number
-        }
-    
-    def process_answer(self, answer: str) -> Dict[str, Any]:
-        """
-        Process the user's answer and generate the next question
-        
-        Args:
-            answer (str): User's answer to the previous question
-            
-        Returns:
-            Dict with next question or completion status
-        """
-        # First, analyze the answer
-        analysis_prompt = f"""
+
+    def _analysis_prompt(self, answer: str) -> str:
+        """Build the instructions that analyze the candidate's latest answer"""
+        return f"""
         Analyze the candidate's answer to the previous question. Focus on:
         1. Technical depth of their response
         2. Specific examples provided
         3. Areas that need clarification
         4. Topics to explore further
 
-        Previous Question: {self.conversation_history[-1].content}
+        Previous Question: {self.context.turns[-1].question}
         Candidate's Answer: {answer}
 
         Provide a brief analysis in this format:
-        "Analysis: [2-3 sentences about the answer quality and areas to explore]"
+        "Analysis: [2-3 sentences about the answer quality and areas to explore]
+        Score: [1-5, how well the answer shows the skills the role requires]"
         """
-        
-        analysis_response = self.llm.invoke([SystemMessage(content=analysis_prompt)])
-        analysis = analysis_response.content
-        
-        # Add the answer and analysis to conversation history
-        self.conversation_history.append(HumanMessage(content=answer))
-        self.conversation_history.append(SystemMessage(content=analysis))
-        self.answers.append(answer)
-        
-        # Check if we've reached the maximum number of questions
-        if self.current_question_number >= self.max_questions:
-            # Generate a closing message
-            closing_prompt = f"""
-            The interview is now complete. Generate a professional closing message that:
-            1. Thanks the candidate for their time
-            2. Acknowledges their participation
-            3. Mentions that you'll provide detailed feedback
-            4. Keeps it brief and professional
-
-            JOB DESCRIPTION:
-            {self.job_description}
-            
-            CANDIDATE'S RESUME:
-            {self.resume}
 
-            CONVERSATION HISTORY:
-            {self.conversation_history}
+    def _transcript(self, max_tokens: Optional[int] = None) -> str:
+        """Compact question/answer/analysis transcript, bounded by the context token budget"""
+        return self.context.render(max_tokens)
 
-            Respond with ONLY the closing message, no additional text.
-            """
-            
-            closing_response = self.llm.invoke([SystemMessage(content=closing_prompt)])
-            closing_message = closing_response.content
-            
-            # Generate audio for the closing message
-            closing_audio = self._generate_audio(closing_message)
-            
-            return {
-                "interview_complete": True,
-                closing_message: closing_audio,
-                "question_number": self.current_question_number
-            }
-        
-        # Generate the next question based on the conversation
-        question_prompt = f"""
+    def _closing_prompt(self) -> str:
+        """Build the instructions that produce the closing message"""
+        return f"""
+        The interview is now complete. Generate a professional closing message that:
+        1. Thanks the candidate for their time
+        2. Acknowledges their participation
+        3. Mentions that you'll provide detailed feedback
+        4. Keeps it brief and professional
+
+        CONVERSATION HISTORY:
+        {self._transcript()}
+
+        Respond with ONLY the closing message, no additional text.
+        """
+
+    def _next_question_prompt(self) -> str:
+        """Build the instructions that produce the next interview question"""
+        return f"""
         Based on the conversation so far, ask ONE specific technical question. The question should:
         1. Be directly related to the job requirements and candidate's experience
         2. Require specific technical knowledge and examples
         3. Build upon previous answers or explore new relevant areas
         4. Be challenging but fair
 
-        JOB DESCRIPTION:
-        {self.job_description}
-        
-        CANDIDATE'S RESUME:
-        {self.resume}
-
         CONVERSATION HISTORY:
-        {self.conversation_history}
+        {self._transcript()}
 
         Question Guidelines:
         - For technical roles: Focus on specific technologies, architectures, and problem-solving
@@ -288,46 +519,18 @@ class InterviewAgent:
         
         Respond with ONLY the question, no additional text or context.
         """
+
+    def _feedback_messages(self) -> List[Any]:
+        """Build the message list used to generate the final feedback"""
+        instructions = f"""
+        The interview is complete. Provide comprehensive feedback on the candidate's interview performance.
         
-        # Generate the next question
-        question_response = self.llm.invoke([SystemMessage(content=question_prompt)])
-        next_question = question_response.content
-        
-        # Add the question to conversation history
-        self.conversation_history.append(AIMessage(content=next_question))
-        
-        # Increment question counter
-        self.current_question_number += 1
-        
-        # Generate audio for the question
-        audio_data = self._generate_audio(next_question)
-        
-        return {
-            "interview_complete": False,
-            next_question: audio_data,
-            "question_number": self.current_question_number
-        }
-    
-    def generate_feedback(self) -> Dict[str, Any]:
-        """
-        Generate comprehensive feedback based on the interview
-        
-        Returns:
-            Dict with feedback components including rating, detailed feedback, and key takeaways
-        """
-        system_prompt = f"""
-        As an expert AI interviewer, provide comprehensive feedback on the candidate's interview performance.
-        
-        JOB DESCRIPTION:
-        {self.job_description}
-        
-        CANDIDATE'S RESUME:
-        {self.resume}
+        Each answer was scored and analyzed as the interview went on:
         
-        CONVERSATION HISTORY:
-        {self.conversation_history}
+        PER-QUESTION ASSESSMENT:
+        {self.context.assessment(self.feedback_context_tokens)}
         
-        Based on the interview conversation, generate feedback in the following format:
+        Combine these assessments into feedback in the following format:
         
         1. First, assign a rating from 1-5 where:
            - 5: Exceptional candidate, exceeds all requirements
@@ -367,43 +570,598 @@ class InterviewAgent:
         IMPORTANT: Your response must be valid JSON. Do not include any text before or after the JSON object.
         """
         
-        # Create a messages list with conversation history
-        messages = [SystemMessage(content=system_prompt)] + self.conversation_history
+        # Only the per-answer assessments are sent, not the transcript they were built from
+        return self._messages(instructions)
+
+    def _feedback_or_default(self, feedback: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        The validated feedback (rating clamped to 1-5, at most 10 takeaways), or a
+        fallback asking for a manual review if it couldn't be parsed or repaired
+        """
+        if feedback is not None and feedback["keyTakeaways"]:
+            return feedback
+        return {
+            "rating": 3,
+            "feedback": "Error generating structured feedback. Please review the interview manually.",
+            "keyTakeaways": [
+                "Error in feedback generation",
+                "Manual review recommended",
+                "Please contact support if this persists"
+            ] * 3 + ["Error in feedback generation"]
+        }
+
+    @property
+    def conversation_history(self) -> List[Any]:
+        """
+        The interview as LangChain messages, built from the turn records on each access
+        
+        Only the introduction and the turn text are kept per session; the prompts that
+        produced them are rebuilt from the shared job description and resume when needed.
         
-        # Generate the feedback
-        response = self.llm.invoke(messages)
+        Returns:
+            list: AIMessage for the introduction and each question, HumanMessage for each
+            answer and SystemMessage for each analysis
+        """
+        messages = [AIMessage(content=self.introduction)] if self.introduction else []
+        for turn in self.context.turns:
+            messages.append(AIMessage(content=turn.question))
+            if turn.answer:
+                messages.append(HumanMessage(content=turn.answer))
+                messages.append(SystemMessage(content=turn.analysis))
+        return messages
+
+    def _record_introduction(self, introduction: str):
+        """Store the introduction"""
+        self.introduction = introduction
+
+    def _record_first_question(self, first_question: str):
+        """Store the first question"""
+        self.context.add_question(first_question)
+        self.current_question_number = 1
+
+    def _record_answer(self, answer: str, analysis: str) -> Turn:
+        """Add the answer and analysis to the current turn"""
+        return self.context.add_answer(answer, analysis)
+
+    def _record_next_question(self, next_question: str):
+        """Add the question as a new turn and increment the question counter"""
+        self.context.add_question(next_question)
+        self.current_question_number += 1
+
+    def _bank_question(self) -> Optional[str]:
+        """
+        A seed question from the job posting's bank for the next turn, or None to generate one
         
+        The bank serves the first question and then every other one (the ones in between are
+        generated follow-ups), up to bank_questions per interview, picking the unused seed
+        that best matches the candidate's skills.
+        """
+        posting = self.job_posting
+        number = self.current_question_number + 1
+        if posting is None or not posting.questions or number % 2 == 0:
+            return None
+        asked = {turn.question for turn in self.context.turns}
+        if sum(1 for question in asked if posting.is_seed(question)) >= self.bank_questions:
+            return None
+        question = posting.pick_question((self.personal_info or {}).get("skills", []), asked)
+        if question is not None:
+            BANK_QUESTIONS.inc(turn="first" if number == 1 else "next")
+        return question
+
+    async def _abank_chunk(self, question: str, question_number: int) -> Dict[str, Any]:
+        """A bank question as one question_chunk event (its audio is usually cached already)"""
+        return {
+            "event": "question_chunk",
+            "question_number": question_number,
+            "index": 0,
+            "text": question,
+            "audio": await self._agenerate_audio(question)
+        }
+
+    async def _aintroduction(self, system_prompt: str) -> Optional[str]:
+        """The introduction, or None if it failed (it is never sent, so that doesn't stop the interview)"""
         try:
-            # Parse the response as JSON
-            feedback_data = json.loads(response.content)
+            introduction_response = await self._ainvoke(self._messages(system_prompt), "introduction",
+                                                        PRIORITY_BACKGROUND)
+        except Exception as e:
+            logger.error("Error generating the introduction: %s", e)
+            return None
+        return introduction_response.content
+
+    async def _introduce_in_background(self, system_prompt: str):
+        """Generate and record the introduction off the first question's path"""
+        with detached():
+            introduction = await self._aintroduction(system_prompt)
+        if introduction is not None:
+            self._record_introduction(introduction)
+
+    async def _analyze_in_background(self, analysis_prompt: str, turn: Turn):
+        """Run the answer analysis and fill it in on its (already recorded) turn"""
+        try:
+            with detached():
+                analysis_response = await self._ainvoke(self._messages(analysis_prompt), "analysis",
+                                                        PRIORITY_BACKGROUND)
+            turn.analysis = analysis_response.content
+        except Exception as e:
+            logger.error("Error analyzing answer: %s", e)
+
+    async def _aanalyze_answer(self, answer: str):
+        """Analyze the answer and record it, either inline or in the background"""
+        if self.overlap_analysis:
+            # Analyze the answer in the background; the analysis is filled in on the
+            # answer's turn once it finishes, so the next question
+            # only waits on its own LLM call and TTS
+            analysis_prompt = self._analysis_prompt(answer)
+            turn = self._record_answer(answer, "")
+            task = asyncio.create_task(self._analyze_in_background(analysis_prompt, turn))
+            self._pending_analyses.add(task)
+            task.add_done_callback(self._pending_analyses.discard)
+        else:
+            # First, analyze the answer
+            analysis_response = await self._ainvoke(self._messages(self._analysis_prompt(answer)), "analysis")
+            self._record_answer(answer, analysis_response.content)
+
+    async def _astream_speech(self, messages: List[Any], parts: List[str],
+                              question_number: int, kind: str) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream a model response as sentence-sized audio chunks
+        
+        Args:
+            messages: Messages to send to the chat model
+            parts: List that collects the streamed text, so the caller can record it
+            question_number (int): Number of the question being streamed
+            kind (str): Prompt kind, for the metrics
             
-            # Validate the required fields
-            required_fields = ["rating", "feedback", "keyTakeaways"]
-            if not all(field in feedback_data for field in required_fields):
-                raise ValueError("Missing required fields in feedback")
-                
-            # Validate rating is between 1 and 5
-            if not isinstance(feedback_data["rating"], int) or not 1 <= feedback_data["rating"] <= 5:
-                feedback_data["rating"] = 3  # Default to middle rating if invalid
-                
-            # Validate keyTakeaways is a list with 10 items
-            if not isinstance(feedback_data["keyTakeaways"], list) or len(feedback_data["keyTakeaways"]) != 10:
-                feedback_data["keyTakeaways"] = [
-                    "Error in feedback generation",
-                    "Manual review recommended",
-                    "Please contact support if this persists"
-                ] * 3 + ["Error in feedback generation"]
+        Yields:
+            question_chunk events in sentence order
+        """
+        async def text_stream():
+            tier, llm = self._route(kind)
+            async with self._slot(getattr(llm, "model_name", "chat")):
+                self._count_prompt(messages, kind)
+                start = time.perf_counter()
+                # No hedging or retries once tokens may have been spoken; the first token gets the
+                # LLM timeout and every token the turn deadline
+                async for chunk in bounded_stream(llm.astream(messages), "llm", self.llm_policy.timeout):
+                    if not parts:
+                        STAGE_SECONDS.observe(time.perf_counter() - start, stage="llm_first_token", kind=kind)
+                    parts.append(chunk.content)
+                    yield chunk.content
+                self._observe(tier, kind, time.perf_counter() - start)
+                LLM_COMPLETION_TOKENS.inc(estimate_tokens("".join(parts)), kind=kind)
+        
+        async for index, sentence, audio in stream_sentence_audio(text_stream(), self._agenerate_audio):
+            yield {
+                "event": "question_chunk",
+                "question_number": question_number,
+                "index": index,
+                "text": sentence,
+                "audio": audio
+            }
+
+    def _start_closing_speculation(self):
+        """Once the last question is asked, prepare the closing message and its audio"""
+        if self.speculate_closing and self._closing_task is None and self.current_question_number >= self.max_questions:
+            self._closing_task = asyncio.create_task(self._speculate_closing())
+
+    async def _speculate_closing(self) -> Optional[tuple]:
+        """Closing message and audio from the transcript without the last answer"""
+        try:
+            # Runs while the candidate answers, past the turn that started it
+            with detached():
+                closing_response = await self._ainvoke(self._messages(self._closing_prompt()), "closing",
+                                                       PRIORITY_BACKGROUND)
+                return closing_response.content, await self._agenerate_audio(closing_response.content,
+                                                                             PRIORITY_BACKGROUND)
+        except Exception as e:
+            logger.error("Error preparing the closing message: %s", e)
+            return None
+
+    async def _take_speculative_closing(self, answer: str) -> Optional[tuple]:
+        """
+        Validate the speculative closing against the last answer
+        
+        The closing only thanks the candidate, so it holds unless the last answer ends
+        with a question for the interviewer (which the closing should address) or the
+        speculation failed.
+        
+        Args:
+            answer (str): The candidate's last answer
+            
+        Returns:
+            tuple: (closing message, audio) to use, or None to generate it now
+        """
+        if self._closing_task is None:
+            return None
+        task, self._closing_task = self._closing_task, None
+        if answer.rstrip().endswith("?"):
+            task.cancel()
+            self.speculation["discarded"] += 1
+            return None
+        
+        speculative = await task
+        if not speculative or not speculative[0] or not speculative[1]:
+            self.speculation["discarded"] += 1
+            return None
+        self.speculation["used"] += 1
+        return speculative
+
+    async def await_pending_analyses(self):
+        """Wait for background analyses so the history is complete"""
+        if self._pending_analyses:
+            await asyncio.gather(*self._pending_analyses)
+
+    async def aprepare_job_posting(self, digest_messages: List[Any], bank_messages: List[Any]) -> tuple:
+        """
+        Make a job posting's shared calls at background priority, outside any turn's deadline
+        
+        Args:
+            digest_messages: Prompt for the requirements digest (kind "jd_digest")
+            bank_messages: Prompt for the question bank (kind "question_bank")
+            
+        Returns:
+            tuple: (the digest or None, the seed questions whose audio is now in the TTS cache)
+        """
+        with detached():
+            digest = await self._ainvoke(digest_messages, "jd_digest", PRIORITY_BACKGROUND)
+            bank = await self._astructured(bank_messages, "question_bank", QUESTION_BANK_SCHEMA, PRIORITY_BACKGROUND)
+            seeds = [seed for seed in (bank or {}).get("questions", []) if seed["question"].strip()]
+            audio = await asyncio.gather(*(self._agenerate_audio(seed["question"], PRIORITY_BACKGROUND)
+                                           for seed in seeds))
+        return digest.content.strip() or None, [seed for seed, speech in zip(seeds, audio) if speech]
+
+    def start_interview(self) -> str:
+        """Start the interview and get the first question"""
+        # First, extract personal information from resume
+        personal_info = self._extract_personal_info()
+        
+        # System message that explains the task
+        system_prompt = self._introduction_prompt(personal_info)
+        response = self._invoke(self._messages(system_prompt), "introduction")
+        self._record_introduction(response.content)
+        
+        # Generate the first question
+        question_prompt = self._first_question_prompt()
+        question_response = self._invoke(self._messages(question_prompt), "first_question")
+        first_question = question_response.content
+        self._record_first_question(first_question)
+        
+        # Generate audio for the question
+        audio_data = self._generate_audio(first_question)
+        
+        # Return the question with audio as a single key-value pair
+        return {
+            first_question: audio_data,
+            "question_number": self.current_question_number
+        }
+
+    async def astart_interview(self) -> Dict[str, Any]:
+        """
+        Async version of start_interview for use inside the event loop.
+        
+        Only the personal information extraction has to finish first; the introduction
+        and the first question (plus its audio) both depend on it alone, so they run
+        concurrently. The introduction is never sent to the client, so it can also be
+        skipped entirely with generate_introduction=False. A first question from the job
+        posting's bank is sent without waiting for the introduction.
+        """
+        # First, extract personal information from resume
+        personal_info = await self._aextract_personal_info()
+        
+        system_prompt = self._introduction_prompt(personal_info)
+        question_prompt = self._first_question_prompt()
+        
+        async def first_question_with_audio():
+            question_response = await self._ainvoke(self._messages(question_prompt), "first_question")
+            audio = await self._agenerate_audio(question_response.content)
+            return question_response.content, audio
+        
+        bank_question = self._bank_question()
+        if bank_question is not None:
+            # No model call for the question, so don't wait on the (unsent) introduction either:
+            # it is recorded in the background, like the answer analyses
+            if self.generate_introduction:
+                task = asyncio.create_task(self._introduce_in_background(system_prompt))
+                self._pending_analyses.add(task)
+                task.add_done_callback(self._pending_analyses.discard)
+            first_question, audio_data = bank_question, await self._agenerate_audio(bank_question)
+        elif self.generate_introduction:
+            introduction, (first_question, audio_data) = await asyncio.gather(
+                self._aintroduction(system_prompt),
+                first_question_with_audio()
+            )
+            if introduction is not None:
+                self._record_introduction(introduction)
+        else:
+            first_question, audio_data = await first_question_with_audio()
+        
+        self._record_first_question(first_question)
+        self._start_closing_speculation()
+        
+        return {
+            first_question: audio_data,
+            "question_number": self.current_question_number
+        }
+    
+    async def astream_start_interview(self) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Streaming version of astart_interview
+        
+        Yields:
+            question_chunk events as soon as each sentence of the first question has
+            been synthesized, followed by a single question_end event
+        """
+        # First, extract personal information from resume
+        personal_info = await self._aextract_personal_info()
+        
+        system_prompt = self._introduction_prompt(personal_info)
+        question_prompt = self._first_question_prompt()
+        
+        # The introduction only has to be recorded before question_end, and a failed one is skipped
+        introduction_task = None
+        if self.generate_introduction:
+            introduction_task = asyncio.create_task(self._aintroduction(system_prompt))
+        
+        parts = []
+        question = self._bank_question()
+        try:
+            if question is not None:
+                parts.append(question)
+                yield await self._abank_chunk(question, 1)
+            else:
+                async for event in self._astream_speech(self._messages(question_prompt), parts, 1, "first_question"):
+                    yield event
+            # The client has heard the question, so it is recorded whatever the introduction does
+            self._record_first_question("".join(parts))
+            if introduction_task:
+                introduction = await introduction_task
+                if introduction is not None:
+                    self._record_introduction(introduction)
+        finally:
+            if introduction_task and not introduction_task.done():
+                introduction_task.cancel()
+        
+        self._start_closing_speculation()
+        
+        yield {
+            "event": "question_end",
+            "text": "".join(parts),
+            "interview_complete": False,
+            "question_number": self.current_question_number
+        }
+    
+    def process_answer(self, answer: str) -> Dict[str, Any]:
+        """
+        Process the user's answer and generate the next question
+        
+        Args:
+            answer (str): User's answer to the previous question
+            
+        Returns:
+            Dict with next question or completion status
+        """
+        # First, analyze the answer
+        analysis_response = self._invoke(self._messages(self._analysis_prompt(answer)), "analysis")
+        self._record_answer(answer, analysis_response.content)
+        
+        # Check if we've reached the maximum number of questions
+        if self.current_question_number >= self.max_questions:
+            # Generate a closing message
+            closing_response = self._invoke(self._messages(self._closing_prompt()), "closing")
+            closing_message = closing_response.content
+            
+            # Generate audio for the closing message
+            closing_audio = self._generate_audio(closing_message)
+            
+            return {
+                "interview_complete": True,
+                closing_message: closing_audio,
+                "question_number": self.current_question_number
+            }
+        
+        # Generate the next question based on the conversation
+        question_response = self._invoke(self._messages(self._next_question_prompt()), "next_question")
+        next_question = question_response.content
+        self._record_next_question(next_question)
+        
+        # Generate audio for the question
+        audio_data = self._generate_audio(next_question)
+        
+        return {
+            "interview_complete": False,
+            next_question: audio_data,
+            "question_number": self.current_question_number
+        }
+
+    async def aprocess_answer(self, answer: str) -> Dict[str, Any]:
+        """
+        Async version of process_answer for use inside the event loop
+        
+        Args:
+            answer (str): User's answer to the previous question
+            
+        Returns:
+            Dict with next question or completion status
+        """
+        await self._aanalyze_answer(answer)
+        
+        # Check if we've reached the maximum number of questions
+        if self.current_question_number >= self.max_questions:
+            self.start_feedback()
+            
+            speculative = await self._take_speculative_closing(answer)
+            if speculative:
+                closing_message, closing_audio = speculative
+            else:
+                # Generate a closing message
+                closing_response = await self._ainvoke(self._messages(self._closing_prompt()), "closing")
+                closing_message = closing_response.content
                 
-            return feedback_data
+                # Generate audio for the closing message
+                closing_audio = await self._agenerate_audio(closing_message)
             
-        except json.JSONDecodeError:
-            # Fallback in case the response isn't valid JSON
             return {
-                "rating": 3,
-                "feedback": "Error generating structured feedback. Please review the interview manually.",
-                "keyTakeaways": [
-                    "Error in feedback generation",
-                    "Manual review recommended",
-                    "Please contact support if this persists"
-                ] * 3 + ["Error in feedback generation"]
+                "interview_complete": True,
+                closing_message: closing_audio,
+                "question_number": self.current_question_number
+            }
+        
+        # Take the next question from the job posting's bank, or generate it based on the conversation
+        next_question = self._bank_question()
+        if next_question is None:
+            question_response = await self._ainvoke(self._messages(self._next_question_prompt()), "next_question")
+            next_question = question_response.content
+        self._record_next_question(next_question)
+        self._start_closing_speculation()
+        
+        # Generate audio for the question
+        audio_data = await self._agenerate_audio(next_question)
+        
+        return {
+            "interview_complete": False,
+            next_question: audio_data,
+            "question_number": self.current_question_number
+        }
+    
+    async def astream_process_answer(self, answer: str) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Streaming version of aprocess_answer
+        
+        Args:
+            answer (str): User's answer to the previous question
+            
+        Yields:
+            question_chunk events for the next question (or the closing message),
+            followed by a single question_end event
+        """
+        await self._aanalyze_answer(answer)
+        
+        interview_complete = self.current_question_number >= self.max_questions
+        speculative = None
+        if interview_complete:
+            self.start_feedback()
+            speculative = await self._take_speculative_closing(answer)
+        prompt = self._closing_prompt() if interview_complete else self._next_question_prompt()
+        
+        question_number = self.current_question_number + (0 if interview_complete else 1)
+        parts = []
+        question = None if interview_complete else self._bank_question()
+        if question is not None:
+            parts.append(question)
+            yield await self._abank_chunk(question, question_number)
+        elif speculative:
+            # Already synthesized in one piece
+            parts.append(speculative[0])
+            yield {
+                "event": "question_chunk",
+                "question_number": question_number,
+                "index": 0,
+                "text": speculative[0],
+                "audio": speculative[1]
             }
+        else:
+            async for event in self._astream_speech(self._messages(prompt), parts, question_number,
+                                                       "closing" if interview_complete else "next_question"):
+                yield event
+        
+        text = "".join(parts)
+        if not interview_complete:
+            self._record_next_question(text)
+            self._start_closing_speculation()
+        
+        yield {
+            "event": "question_end",
+            "text": text,
+            "interview_complete": interview_complete,
+            "question_number": self.current_question_number
+        }
+    
+    def generate_feedback(self) -> Dict[str, Any]:
+        """
+        Generate comprehensive feedback based on the interview
+        
+        Returns:
+            Dict with feedback components including rating, detailed feedback, and key takeaways
+        """
+        return self._feedback_or_default(self._structured(self._feedback_messages(), "feedback", FEEDBACK_SCHEMA))
+
+    def start_feedback(self):
+        """
+        Start generating the final feedback in the background (once per interview)
+        
+        The async answer methods call this as soon as the last answer is in, so the
+        feedback is produced while the closing message is generated and played.
+        """
+        if self._feedback_task is None:
+            self._feedback_task = asyncio.create_task(self._agenerate_feedback())
+
+    async def agenerate_feedback(self) -> Dict[str, Any]:
+        """
+        Async version of generate_feedback for use inside the event loop
+        
+        Returns the feedback started by start_feedback() if there is one.
+        
+        Returns:
+            Dict with feedback components including rating, detailed feedback, and key takeaways
+        """
+        self.start_feedback()
+        return await self._feedback_task
+
+    async def _agenerate_feedback(self) -> Dict[str, Any]:
+        await self.await_pending_analyses()
+        with detached():
+            feedback = await self._astructured(self._feedback_messages(), "feedback", FEEDBACK_SCHEMA,
+                                               PRIORITY_FEEDBACK)
+        return self._feedback_or_default(feedback)
+
+    def to_state(self) -> Dict[str, Any]:
+        """
+        Serialize the interview state (not the clients or caches) to a compact,
+        JSON-compatible dict, so another worker can resume the session
+        
+        Call after await_pending_analyses() if overlap_analysis is enabled, otherwise
+        analyses still running in the background are saved as empty.
+        """
+        return {
+            "version": STATE_VERSION,
+            "job_description": self.job_description,
+            "resume": self.resume,
+            "max_questions": self.max_questions,
+            "current_question_number": self.current_question_number,
+            "personal_info": self.personal_info,
+            "job_digest": self.job_digest,
+            "introduction": self.introduction,
+            "turns": [[turn.question, turn.answer, turn.analysis] for turn in self.context.turns]
+        }
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any], **kwargs) -> "InterviewAgent":
+        """
+        Rebuild an agent from to_state() output
+        
+        Args:
+            state (dict): The serialized state
+            **kwargs: Constructor arguments for the non-serialized parts (clients, caches, options)
+            
+        Returns:
+            InterviewAgent: An agent ready to process the next answer
+        """
+        if state.get("version") not in COMPATIBLE_STATE_VERSIONS:
+            raise ValueError(f"Unsupported interview state version: {state.get('version')}")
+        
+        agent = cls(state["job_description"], state["resume"], max_questions=state["max_questions"], **kwargs)
+        # Keep the session prefix the session started with
+        agent.job_digest = state.get("job_digest")
+        agent.session_prefix = agent._build_session_prefix()
+        if state["personal_info"] is not None:
+            agent._set_personal_info(state["personal_info"])
+        if state["introduction"]:
+            agent.introduction = state["introduction"]
+        
+        # Only the turn text is persisted; the per-call instructions are rebuilt on demand
+        for question, answer, analysis in state["turns"]:
+            agent.context.add_question(question)
+            if answer:
+                agent.context.add_answer(answer, analysis)
+        agent.current_question_number = state["current_question_number"]
+        return agent
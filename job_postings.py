@@ -0,0 +1,216 @@
+"""
+Work shared by every candidate interviewed for the same job posting.
+
+Hundreds of candidates are interviewed against the same job description, yet every
+session sent the full description in every prompt and generated every question from
+scratch. The registry keeps, per job description hash, what can be prepared once:
+
+- a compact requirements digest, which replaces the raw description in the session
+  prefix of sessions that start once it is ready (fewer prompt tokens on every call)
+- a bank of seed questions, each tagged with the skills it covers, with their audio
+  synthesized into the shared TTS cache
+
+Both are built in the background when a job description is first seen, so the first
+candidates are not delayed (a failed build is retried after a growing backoff, not by
+every new candidate). InterviewAgent takes its first question, and every other
+question up to its bank quota, from the bank: the unused seed that best matches the
+candidate's extracted skills. That question needs no model call and its audio is
+already cached. The follow-up questions in between are still generated from the
+conversation.
+
+Seed questions are personalized only by which one is picked, not reworded for the
+candidate: rewording would need a model call and fresh TTS on the first question's
+path, which is the latency the bank removes. The profile reaches the candidate
+through the generated follow-ups, which see it in the session prefix.
+"""
+
+import asyncio
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Set
+from langchain_core.messages import HumanMessage, SystemMessage
+from observability import get_logger
+
+logger = get_logger(__name__)
+
+
+def job_hash(job_description: str) -> str:
+    """Hash the job description with whitespace normalized"""
+    normalized = " ".join(job_description.split())
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+def _digest_messages(job_description: str) -> List[Any]:
+    return [
+        SystemMessage(content="You are an expert technical recruiter."),
+        HumanMessage(content=(
+            "JOB DESCRIPTION:\n"
+            f"{job_description.strip()}\n"
+            "\n"
+            "Summarize the job description above as a compact requirements digest for an interviewer: "
+            "role and seniority, must-have skills and experience, nice-to-have skills and the main "
+            "responsibilities. Use short lines, at most 120 words, and leave out company boilerplate."
+        ))
+    ]
+
+
+def _bank_messages(job_description: str, size: int) -> List[Any]:
+    return [
+        SystemMessage(content="You are an expert AI interviewer specializing in technical interviews."),
+        HumanMessage(content=(
+            "JOB DESCRIPTION:\n"
+            f"{job_description.strip()}\n"
+            "\n"
+            f"Write a question bank of {size} seed interview questions for this job. Each question should "
+            "be ONE specific technical question that any qualified candidate can answer from their own "
+            "experience, ask for concrete examples, and cover different requirements of the job. "
+            "List the skills from the job description that each question covers. "
+            'Format the response as a JSON object: {"questions": [{"question": "...", "skills": ["..."]}]}'
+        ))
+    ]
+
+
+class JobPosting:
+    """What is shared for one job description: its digest and its seed questions"""
+
+    __slots__ = ("key", "digest", "questions", "ready", "started", "candidates", "created_at",
+                 "failures", "retry_at")
+
+    def __init__(self, key: str):
+        self.key = key
+        self.digest: Optional[str] = None
+        # [{"question": ..., "skills": [...]}], only seeds whose audio was synthesized
+        self.questions: List[Dict[str, Any]] = []
+        self.ready = asyncio.Event()
+        self.started = False
+        self.candidates = 0
+        self.created_at = time.time()
+        # Failed builds in a row, and when (registry clock) the next one may start
+        self.failures = 0
+        self.retry_at = 0.0
+
+    def pick_question(self, skills: List[str], asked: Set[str]) -> Optional[str]:
+        """
+        The unused seed question covering the most of the candidate's skills (used as is,
+        so its cached audio matches)
+
+        Args:
+            skills (list): The candidate's skills (from the extracted profile)
+            asked (set): Questions already asked in this interview
+
+        Returns:
+            str: The question, or None if the bank is empty or used up
+        """
+        # An empty string is a substring of every skill, so it would match any seed
+        wanted = {skill.strip().lower() for skill in skills if skill.strip()}
+        best, best_overlap = None, -1
+        for seed in self.questions:
+            if seed["question"] in asked:
+                continue
+            overlap = sum(1 for skill in (skill.strip().lower() for skill in seed["skills"])
+                          if skill and any(skill in want or want in skill for want in wanted))
+            if overlap > best_overlap:
+                best, best_overlap = seed["question"], overlap
+        return best
+
+    def is_seed(self, question: str) -> bool:
+        return any(seed["question"] == question for seed in self.questions)
+
+
+class JobPostingRegistry:
+    def __init__(self, builder: Callable[[str], Any], bank_size: int = 8, max_postings: int = 200,
+                 build_after: int = 1, retry_seconds: float = 60.0, max_retry_seconds: float = 3600.0,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Initialize the registry
+
+        Args:
+            builder: Returns the InterviewAgent used to make a posting's calls, given the job
+                description (its chat routing, scheduler, call policies and TTS cache are used)
+            bank_size (int): Seed questions generated per posting
+            max_postings (int): Postings kept (least recently used ones are dropped)
+            build_after (int): Candidates a job description needs before its posting is built
+                (0 never builds, leaving every session on the raw description and generated questions)
+            retry_seconds (float): Wait after a failed build before a new candidate starts another
+                (doubled after each failure in a row)
+            max_retry_seconds (float): Longest wait between builds of a posting that keeps failing
+            clock: Monotonic clock in seconds
+        """
+        self.builder = builder
+        self.bank_size = bank_size
+        self.max_postings = max_postings
+        self.build_after = build_after
+        self.retry_seconds = retry_seconds
+        self.max_retry_seconds = max_retry_seconds
+        self.clock = clock
+        self.postings: "OrderedDict[str, JobPosting]" = OrderedDict()
+        self._tasks: Set[asyncio.Task] = set()
+        self.builds = 0
+        self.failures = 0
+
+    def get(self, job_description: str, new_candidate: bool = True) -> JobPosting:
+        """
+        The posting for a job description, starting its build in the background if needed
+
+        Never waits: until the build finishes the posting has no digest and no questions.
+
+        Args:
+            job_description (str): The job description text
+            new_candidate (bool): Whether this is a new interview (False for restored sessions)
+        """
+        key = job_hash(job_description)
+        posting = self.postings.get(key)
+        if posting is None:
+            posting = self.postings[key] = JobPosting(key)
+            while len(self.postings) > self.max_postings:
+                self.postings.popitem(last=False)
+        self.postings.move_to_end(key)
+        if new_candidate:
+            posting.candidates += 1
+        if self.build_after and not posting.started and posting.candidates >= self.build_after \
+                and self.clock() >= posting.retry_at:
+            posting.started = True
+            posting.ready.clear()
+            task = asyncio.create_task(self._build(posting, job_description))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+        return posting
+
+    async def _build(self, posting: JobPosting, job_description: str):
+        """Make the digest and the question bank, and synthesize the questions into the TTS cache"""
+        agent = self.builder(job_description)
+        try:
+            posting.digest, posting.questions = await agent.aprepare_job_posting(
+                _digest_messages(job_description), _bank_messages(job_description, self.bank_size))
+            self.builds += 1
+            posting.failures = 0
+            logger.info("Built job posting %s: %d seed questions", posting.key[:12], len(posting.questions))
+        except Exception as e:
+            # Keep the failure, so the candidates for this job description don't each start
+            # another build that fails the same way; one after the backoff tries again
+            self.failures += 1
+            posting.failures += 1
+            delay = min(self.retry_seconds * 2 ** (posting.failures - 1), self.max_retry_seconds)
+            posting.retry_at = self.clock() + delay
+            posting.started = False
+            logger.error("Error building job posting %s: %s (retrying after %.0f seconds)",
+                         posting.key[:12], e, delay)
+        finally:
+            posting.ready.set()
+
+    async def close(self):
+        """Cancel builds still running"""
+        for task in list(self._tasks):
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "postings": len(self.postings),
+            "ready": sum(1 for posting in self.postings.values() if posting.ready.is_set()),
+            "builds": self.builds,
+            "failures": self.failures,
+            "candidates": sum(posting.candidates for posting in self.postings.values()),
+            "seed_questions": sum(len(posting.questions) for posting in self.postings.values())
+        }
@@ -0,0 +1,129 @@
+"""
+Per-prompt-kind routing of chat calls to model tiers.
+
+Every prompt used to go to the same GPT-4 model, although extraction, analysis and
+closing are short, latency-sensitive tasks that a faster model handles fine. The router
+maps each prompt kind to a tier (tiers are ordered from the most capable to the
+fastest) and keeps the recent latency of every tier and kind. When a kind's latency on
+its tier would exceed the kind's budget, the call goes to the next faster tier instead.
+Latency samples age out, so a tier that recovers is used again.
+
+Routing decisions are counted in llm_routed_total{kind, tier, reason} on /metrics.
+"""
+
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+from observability import LLM_ROUTED
+
+
+def parse_mapping(spec: str) -> Dict[str, str]:
+    """Parse "key=value,key=value" (as used by the LLM_TIERS, LLM_ROUTES and LLM_LATENCY_BUDGETS settings)"""
+    mapping = {}
+    for item in spec.split(","):
+        if "=" in item:
+            key, value = item.split("=", 1)
+            mapping[key.strip()] = value.strip()
+    return mapping
+
+
+class LatencyWindow:
+    """Recent call latencies, bounded by count and age"""
+
+    def __init__(self, max_samples: int = 50, max_age: float = 60.0):
+        self.max_age = max_age
+        self.samples: Deque[Tuple[float, float]] = deque(maxlen=max_samples)
+
+    def add(self, now: float, seconds: float):
+        self.samples.append((now, seconds))
+
+    def percentile(self, now: float, fraction: float = 0.9, min_samples: int = 3) -> Optional[float]:
+        """The latency percentile over the recent samples, or None with too few of them"""
+        while self.samples and now - self.samples[0][0] > self.max_age:
+            self.samples.popleft()
+        if len(self.samples) < min_samples:
+            return None
+        ordered = sorted(seconds for _, seconds in self.samples)
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+class ModelRouter:
+    def __init__(self, tiers: Dict[str, str], chat_model: Callable[[str], Any],
+                 routes: Optional[Dict[str, str]] = None,
+                 budgets: Optional[Dict[str, float]] = None, window_seconds: float = 60.0,
+                 max_samples: int = 50, clock: Callable[[], float] = time.monotonic):
+        """
+        Initialize the router
+
+        Args:
+            tiers (dict): Tier name -> model name, from the most capable to the fastest
+            chat_model: Returns the (shared) chat model for a model name, e.g. ClientPool.chat_model
+            routes (dict): Prompt kind -> tier name (unrouted kinds use the first tier)
+            budgets (dict): Prompt kind -> latency budget in seconds (p90 of recent calls)
+            window_seconds (float): How long latency samples count
+            max_samples (int): Samples kept per tier and kind
+            clock: Monotonic clock in seconds
+        """
+        if not tiers:
+            raise ValueError("At least one model tier is required")
+        self.tiers = tiers
+        self.chat_model = chat_model
+        self.order: List[str] = list(tiers)
+        unknown = set((routes or {}).values()) - set(tiers)
+        if unknown:
+            raise ValueError(f"Routes refer to unknown model tiers: {', '.join(sorted(unknown))}")
+        self.routes = routes or {}
+        self.budgets = budgets or {}
+        self.window_seconds = window_seconds
+        self.max_samples = max_samples
+        self.clock = clock
+        self.latency: Dict[Tuple[str, str], LatencyWindow] = {}
+        self.decisions: Dict[Tuple[str, str, str], int] = {}
+
+    def _window(self, tier: str, kind: str) -> LatencyWindow:
+        key = (tier, kind)
+        if key not in self.latency:
+            self.latency[key] = LatencyWindow(self.max_samples, self.window_seconds)
+        return self.latency[key]
+
+    def route(self, kind: str) -> Tuple[str, Any]:
+        """
+        Pick the tier for a call
+
+        Returns:
+            tuple: (tier name, chat model)
+        """
+        tier = self.routes.get(kind, self.order[0])
+        reason = "configured"
+        budget = self.budgets.get(kind)
+        if budget is not None:
+            now = self.clock()
+            position = self.order.index(tier)
+            while position < len(self.order) - 1:
+                recent = self._window(tier, kind).percentile(now)
+                if recent is None or recent <= budget:
+                    break
+                position += 1
+                tier = self.order[position]
+                reason = "over_budget"
+        key = (kind, tier, reason)
+        self.decisions[key] = self.decisions.get(key, 0) + 1
+        LLM_ROUTED.inc(kind=kind, tier=tier, reason=reason)
+        return tier, self.chat_model(self.tiers[tier])
+
+    def observe(self, tier: str, kind: str, seconds: float):
+        """Record how long a call routed to `tier` took"""
+        self._window(tier, kind).add(self.clock(), seconds)
+
+    def stats(self) -> Dict[str, Any]:
+        now = self.clock()
+        return {
+            "tiers": dict(self.tiers),
+            "routes": dict(self.routes),
+            "p90_seconds": {
+                f"{tier}/{kind}": round(p90, 3)
+                for (tier, kind), window in self.latency.items()
+                if (p90 := window.percentile(now)) is not None
+            },
+            "decisions": {f"{kind}/{tier}/{reason}": count for (kind, tier, reason), count in self.decisions.items()}
+        }
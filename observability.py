@@ -0,0 +1,180 @@
+"""
+Hot-path metrics and logging.
+
+Metrics are kept in process as counters and histograms and rendered in the Prometheus
+text format by the /metrics endpoint. Timing a stage only records a number, so it is
+cheap enough for every LLM call, TTS request, base64 encoding and WebSocket send.
+
+Logging goes through the logging module (level from LOG_LEVEL). Per-message logs use a
+sampled logger that passes on only LOG_SAMPLE_RATE of the records below WARNING, and
+callers log event names and sizes only, never payloads (audio, resume text, answers).
+"""
+
+import bisect
+import logging
+import os
+import random
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Sequence, Tuple
+
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _format_labels(labelnames: Sequence[str], values: Tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{name}="{value}"' for name, value in zip(labelnames, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Counter:
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = tuple(str(labels.get(name, "")) for name in self.labelnames)
+        self.values[key] = self.values.get(key, 0.0) + amount
+
+    def value(self, **labels) -> float:
+        return self.values.get(tuple(str(labels.get(name, "")) for name in self.labelnames), 0.0)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        for key, value in sorted(self.values.items()):
+            lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {value:g}")
+        return lines
+
+
+class Histogram:
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        # Per label set: [count per bucket (+Inf last), sum]
+        self.series: Dict[Tuple[str, ...], list] = {}
+
+    def observe(self, value: float, **labels):
+        key = tuple(str(labels.get(name, "")) for name in self.labelnames)
+        series = self.series.get(key)
+        if series is None:
+            series = self.series[key] = [[0] * (len(self.buckets) + 1), 0.0]
+        series[0][bisect.bisect_left(self.buckets, value)] += 1
+        series[1] += value
+
+    @contextmanager
+    def time(self, **labels) -> Iterator[None]:
+        """Observe the wall time of the block, in seconds"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def count(self, **labels) -> int:
+        series = self.series.get(tuple(str(labels.get(name, "")) for name in self.labelnames))
+        return sum(series[0]) if series else 0
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        for key, (counts, total) in sorted(self.series.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else f"{bound:g}"
+                labels = _format_labels(self.labelnames, key, 'le="' + le + '"')
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {total:g}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self.metrics = []
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        metric = Counter(name, documentation, labelnames)
+        self.metrics.append(metric)
+        return metric
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        metric = Histogram(name, documentation, labelnames, buckets)
+        self.metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format"""
+        lines = []
+        for metric in self.metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+STAGE_SECONDS = REGISTRY.histogram(
+    "interview_stage_seconds", "Latency of each hot-path stage (kind is the prompt kind for llm calls)",
+    ("stage", "kind")
+)
+LLM_PROMPT_TOKENS = REGISTRY.counter("llm_prompt_tokens_total", "Estimated prompt tokens sent, by prompt kind", ("kind",))
+LLM_COMPLETION_TOKENS = REGISTRY.counter(
+    "llm_completion_tokens_total", "Estimated completion tokens received, by prompt kind", ("kind",)
+)
+TTS_AUDIO_BYTES = REGISTRY.counter("tts_audio_bytes_total", "Audio bytes returned by the TTS API")
+RESUME_BYTES = REGISTRY.counter("resume_bytes_total", "Resume PDF bytes parsed")
+WS_MESSAGES_SENT = REGISTRY.counter("websocket_messages_sent_total", "WebSocket frames sent, by event", ("event",))
+WS_BYTES_SENT = REGISTRY.counter("websocket_bytes_sent_total", "WebSocket bytes sent, by frame type", ("frame",))
+LLM_ROUTED = REGISTRY.counter(
+    "llm_routed_total", "Chat calls by prompt kind, the model tier they went to and why", ("kind", "tier", "reason")
+)
+SINGLE_FLIGHT_COALESCED = REGISTRY.counter(
+    "single_flight_coalesced_total", "Duplicate requests that joined an identical call already in flight", ("operation",)
+)
+CALL_HEDGES = REGISTRY.counter("call_hedges_total", "Duplicate requests sent for slow model or TTS calls", ("operation",))
+CALL_RETRIES = REGISTRY.counter("call_retries_total", "Retries of failed or timed-out model or TTS calls", ("operation",))
+STRUCTURED_OUTPUTS = REGISTRY.counter(
+    "structured_outputs_total",
+    "JSON results by prompt kind and how they were obtained (clean, recovered, repaired, failed)", ("kind", "outcome")
+)
+BANK_QUESTIONS = REGISTRY.counter(
+    "question_bank_served_total", "Questions taken from a job posting's seed bank instead of generated", ("turn",)
+)
+CALL_TIMEOUTS = REGISTRY.counter(
+    "call_timeouts_total", "Model or TTS calls cut off by their timeout or the turn deadline", ("operation",)
+)
+
+
+class SampledLogger(logging.LoggerAdapter):
+    """Logger that passes on only a fraction of the records below WARNING"""
+
+    def __init__(self, logger: logging.Logger, rate: float):
+        super().__init__(logger, {})
+        self.rate = rate
+
+    def log(self, level, msg, *args, **kwargs):
+        if not self.isEnabledFor(level):
+            return
+        if level < logging.WARNING and random.random() >= self.rate:
+            return
+        super().log(level, msg, *args, **kwargs)
+
+
+def get_logger(name: str) -> logging.Logger:
+    """Logger configured from LOG_LEVEL (default INFO)"""
+    logging.basicConfig(
+        level=os.getenv("LOG_LEVEL", "INFO").upper(),
+        format="%(asctime)s %(levelname)s %(name)s: %(message)s"
+    )
+    return logging.getLogger(name)
+
+
+def get_sampled_logger(name: str) -> SampledLogger:
+    """Logger for per-message (hot-path) records, sampled at LOG_SAMPLE_RATE (default 0.01)"""
+    return SampledLogger(get_logger(name), float(os.getenv("LOG_SAMPLE_RATE", 0.01)))
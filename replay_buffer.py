@@ -0,0 +1,66 @@
+"""
+Sequence-numbered outbound events of one session, kept for replay after a reconnect.
+
+Every event the server sends for a session gets the next sequence number ("seq"). The
+most recent events are kept, with question audio as raw bytes so it can be re-encoded
+for whichever audio encoding the new connection negotiates. A client that reconnects
+with the last seq it saw gets everything after it again, instead of restarting the
+interview and regenerating questions and audio.
+"""
+
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+# seq, message (without embedded audio), audio bytes or None, field the audio belongs in
+ReplayEntry = Tuple[int, Dict[str, Any], Optional[bytes], Optional[str]]
+
+
+class ReplayBuffer:
+    def __init__(self, max_events: int = 32, max_bytes: int = 8 * 1024 * 1024):
+        """
+        Initialize the buffer
+
+        Args:
+            max_events (int): Events kept (the newest one is always kept)
+            max_bytes (int): Audio bytes kept across the events
+        """
+        self.max_events = max_events
+        self.max_bytes = max_bytes
+        self.events: Deque[ReplayEntry] = deque()
+        self.last_seq = 0
+        self.bytes = 0
+
+    def append(self, message: Dict[str, Any], audio: Optional[bytes] = None,
+               audio_field: Optional[str] = None) -> int:
+        """
+        Number the message (sets message["seq"]) and keep it for replay
+
+        Returns:
+            int: The message's sequence number
+        """
+        self.last_seq += 1
+        message["seq"] = self.last_seq
+        # A shallow copy of the data, so embedding the audio for sending doesn't touch it
+        self.events.append((self.last_seq, {**message, "data": dict(message.get("data", {}))}, audio, audio_field))
+        self.bytes += len(audio or b"")
+        while len(self.events) > 1 and (len(self.events) > self.max_events or self.bytes > self.max_bytes):
+            _, _, dropped, _ = self.events.popleft()
+            self.bytes -= len(dropped or b"")
+        return self.last_seq
+
+    def since(self, seq: int) -> Optional[List[ReplayEntry]]:
+        """
+        The events after `seq`
+
+        Returns:
+            list: The events, oldest first, or None if some of them are no longer kept, or
+            `seq` is past this buffer's last seq (it was numbered by another worker or a
+            buffer that expired)
+        """
+        if seq == self.last_seq:
+            return []
+        if seq > self.last_seq:
+            return None
+        if not self.events or self.events[0][0] > seq + 1:
+            return None
+        return [entry for entry in self.events if entry[0] > seq]
@@ -0,0 +1,192 @@
+"""
+Resume ingestion off the event loop.
+
+PDF parsing is CPU bound and a large or malicious file can take arbitrarily long, so
+it runs in a process pool, one worker per document: the worker counts the pages,
+checks the page limit and extracts the text from a single parse. (Splitting a resume
+into page ranges across workers made every worker re-parse the whole PDF, which
+benchmarks/resume_ingest showed to be several times slower.) Byte, page and time
+limits are enforced. When a parse overruns the time limit, new resumes go to a fresh
+pool; the old one finishes the other candidates' parses and is then torn down,
+killing the stuck worker.
+"""
+
+import asyncio
+import base64
+import multiprocessing
+import re
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from io import BytesIO
+from typing import Any, Dict, List, Optional, Set, Tuple
+from PyPDF2 import PdfReader
+
+
+class ResumeIngestionError(ValueError):
+    """Raised when a resume cannot be decoded, is over a limit, or takes too long"""
+
+
+def decode_resume_base64(resume_base64: str, max_bytes: int) -> bytes:
+    """
+    Decode a base64 (optionally data URL) resume, rejecting oversized payloads first
+    
+    Args:
+        resume_base64 (str): The base64 string sent by the client
+        max_bytes (int): Maximum decoded size
+        
+    Returns:
+        bytes: The PDF file contents
+    """
+    if not resume_base64:
+        raise ResumeIngestionError("Empty resume data received")
+    
+    # Remove data URL prefix if present
+    if resume_base64.startswith('data:'):
+        resume_base64 = resume_base64.split(',', 1)[1]
+    
+    # Check the size before decoding anything (base64 is 4 chars per 3 bytes)
+    if len(resume_base64) * 3 // 4 > max_bytes:
+        raise ResumeIngestionError(f"Resume is larger than {max_bytes} bytes")
+    
+    # Check if the string is properly padded
+    padding = len(resume_base64) % 4
+    if padding:
+        resume_base64 += '=' * (4 - padding)
+    
+    try:
+        return base64.b64decode(resume_base64)
+    except ValueError as e:
+        raise ResumeIngestionError(f"Invalid base64 data: {str(e)}")
+
+
+def normalize_text(pages: List[str]) -> str:
+    """Join page texts, trimming trailing spaces and collapsing runs of blank lines"""
+    text = "\n".join(pages)
+    text = re.sub(r'[ \t]+\n', '\n', text)
+    text = re.sub(r'\n{3,}', '\n\n', text)
+    return text.strip()
+
+
+def _extract_document(pdf_bytes: bytes, max_pages: int) -> Tuple[int, Optional[List[str]], Dict[str, float]]:
+    """
+    Worker: count the pages and, within the limit, extract the text of every page
+
+    Returns:
+        tuple: (page count, page texts or None if over max_pages, timings in seconds)
+    """
+    start = time.perf_counter()
+    reader = PdfReader(BytesIO(pdf_bytes))
+    page_count = len(reader.pages)
+    count_seconds = time.perf_counter() - start
+    if page_count > max_pages:
+        return page_count, None, {"count_seconds": count_seconds}
+    start = time.perf_counter()
+    pages = [(page.extract_text() or "") for page in reader.pages]
+    return page_count, pages, {"count_seconds": count_seconds, "extract_seconds": time.perf_counter() - start}
+
+
+class ResumeIngestor:
+    def __init__(self, max_workers: int = 2, max_bytes: int = 10 * 1024 * 1024,
+                 max_pages: int = 20, timeout_seconds: float = 15.0):
+        """
+        Initialize the ingestor
+        
+        Args:
+            max_workers (int): Worker processes, so resumes parsed at the same time
+            max_bytes (int): Maximum PDF size
+            max_pages (int): Maximum number of pages
+            timeout_seconds (float): Time limit for counting and extracting all pages
+        """
+        self.max_workers = max_workers
+        self.max_bytes = max_bytes
+        self.max_pages = max_pages
+        self.timeout_seconds = timeout_seconds
+        self.executor: Optional[ProcessPoolExecutor] = None
+        # Parses submitted to each pool that haven't finished yet
+        self.in_flight: Dict[ProcessPoolExecutor, Set[Future]] = {}
+        # Pools replaced after a timeout, waiting for their other parses
+        self._retiring: Set[asyncio.Task] = set()
+
+    def _pool(self) -> ProcessPoolExecutor:
+        if self.executor is None:
+            # Spawned workers don't inherit the server's threads and sockets
+            self.executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return self.executor
+
+    def _retire_pool(self, executor: ProcessPoolExecutor, stuck: Future):
+        """Send new resumes to a fresh pool, and stop this one once its other parses are done"""
+        if self.executor is not executor:
+            return  # Already retired by another parse that timed out
+        self.executor = None
+        others = [future for future in self.in_flight.pop(executor, ()) if future is not stuck]
+        task = asyncio.create_task(self._stop_when_idle(executor, others))
+        self._retiring.add(task)
+        task.add_done_callback(self._retiring.discard)
+
+    async def _stop_when_idle(self, executor: ProcessPoolExecutor, others: List[Future]):
+        try:
+            # Every other parse is bounded by its own time limit
+            if others:
+                await asyncio.wait([asyncio.wrap_future(future) for future in others], timeout=self.timeout_seconds)
+        finally:
+            # ProcessPoolExecutor has no public way to stop a running task
+            for process in list(getattr(executor, "_processes", {}).values()):
+                process.terminate()
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def shutdown(self):
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.in_flight.pop(self.executor, None)
+            self.executor = None
+
+    async def ingest_base64(self, resume_base64: str) -> Dict[str, Any]:
+        """Decode a base64 resume and ingest it"""
+        start = time.perf_counter()
+        pdf_bytes = decode_resume_base64(resume_base64, self.max_bytes)
+        decode_seconds = time.perf_counter() - start
+        
+        result = await self.ingest(pdf_bytes)
+        result["timings"]["decode_seconds"] = decode_seconds
+        result["timings"]["total_seconds"] += decode_seconds
+        return result
+
+    async def ingest(self, pdf_bytes: bytes) -> Dict[str, Any]:
+        """
+        Extract normalized text from a PDF without blocking the event loop
+        
+        Returns:
+            Dict with the text, page and byte counts, and timings in seconds
+        """
+        if len(pdf_bytes) > self.max_bytes:
+            raise ResumeIngestionError(f"Resume is larger than {self.max_bytes} bytes")
+        
+        start = time.perf_counter()
+        executor = self._pool()
+        try:
+            future = executor.submit(_extract_document, pdf_bytes, self.max_pages)
+            in_flight = self.in_flight.setdefault(executor, set())
+            in_flight.add(future)
+            future.add_done_callback(in_flight.discard)
+            page_count, pages, timings = await asyncio.wait_for(asyncio.wrap_future(future), self.timeout_seconds)
+            if pages is None:
+                raise ResumeIngestionError(f"Resume has {page_count} pages; the limit is {self.max_pages}")
+        except asyncio.TimeoutError:
+            self._retire_pool(executor, future)
+            raise ResumeIngestionError(f"Resume parsing took longer than {self.timeout_seconds} seconds")
+        except ResumeIngestionError:
+            raise
+        except Exception as e:
+            raise ResumeIngestionError(f"Could not read PDF: {str(e)}")
+        
+        timings["parse_seconds"] = time.perf_counter() - start
+        timings["total_seconds"] = timings["parse_seconds"]
+        return {
+            "text": normalize_text(pages),
+            "pages": len(pages),
+            "bytes": len(pdf_bytes),
+            "timings": timings
+        }
@@ -0,0 +1,232 @@
+"""
+Lifecycle of the live InterviewAgent objects in one worker.
+
+Live agents used to stay in memory until their WebSocket loop exited or the interview
+completed, so half-open connections and abandoned tabs kept them alive forever. Here
+every live session records when it was last active and roughly how big it is (the size
+of its serialized state). A reaper task expires sessions idle for longer than the idle
+TTL, and while the resident sessions are over the memory ceiling it spills the least
+recently active ones to disk as compressed state (session_store.encode_state). A
+spilled session is rehydrated when the candidate answers again.
+
+Sessions handling a request are never spilled or expired.
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import shutil
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import Any, Callable, Dict, List, Optional
+from session_store import encode_state, decode_state
+
+
+def estimate_state_bytes(state: Dict[str, Any]) -> int:
+    """Size of a session's serialized state, used as a proxy for its resident footprint"""
+    return len(json.dumps(state, separators=(",", ":")))
+
+
+class LiveSession:
+    __slots__ = ("agent", "last_active", "state_bytes", "revision")
+
+    def __init__(self, agent: Any, last_active: float, state_bytes: int = 0, revision: Optional[str] = None):
+        self.agent = agent
+        self.last_active = last_active
+        self.state_bytes = state_bytes
+        # Revision of the state last saved or restored for the agent
+        self.revision = revision
+
+
+class SessionLifecycle:
+    def __init__(self, snapshot: Callable[[str, Any], Dict[str, Any]], idle_seconds: float = 30 * 60,
+                 max_bytes: int = 256 * 1024 * 1024, spill_dir: str = "session_spill",
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Initialize the registry
+
+        Args:
+            snapshot: Function (session_id, agent) -> the state dict to spill, the same
+                shape as what the server saves in the session store
+            idle_seconds (float): Sessions inactive for this long are expired
+            max_bytes (int): Ceiling on the estimated bytes of resident sessions
+            spill_dir (str): Directory for spilled sessions (a per-process subdirectory is used)
+            clock: Monotonic clock in seconds
+        """
+        self.snapshot = snapshot
+        self.idle_seconds = idle_seconds
+        self.max_bytes = max_bytes
+        self.spill_dir = os.path.join(spill_dir, str(os.getpid()))
+        self.clock = clock
+        # Least recently active first
+        self.sessions: "OrderedDict[str, LiveSession]" = OrderedDict()
+        # Spilled session id -> (last active, bytes on disk)
+        self.spilled: Dict[str, tuple] = {}
+        self.resident_bytes = 0
+        # Requests in progress per session id, so an agent added or replaced by the
+        # request (a new interview, a restored session) is busy too
+        self.busy: Dict[str, int] = {}
+        self.pressure = asyncio.Event()
+        self.counts = {"expired": 0, "spilled": 0, "rehydrated": 0}
+
+    def __contains__(self, session_id: str) -> bool:
+        return session_id in self.sessions
+
+    def __len__(self) -> int:
+        return len(self.sessions)
+
+    def get(self, session_id: str) -> Optional[Any]:
+        """The live agent for this session, if it is resident"""
+        session = self.sessions.get(session_id)
+        return session.agent if session else None
+
+    def add(self, session_id: str, agent: Any, revision: Optional[str] = None):
+        """Register a new or rehydrated agent (restored from the state `revision`) as resident and active"""
+        self.remove(session_id)
+        self.sessions[session_id] = LiveSession(agent, self.clock(), revision=revision)
+
+    def revision(self, session_id: str) -> Optional[str]:
+        """Revision of the state the resident agent was last saved as or restored from"""
+        session = self.sessions.get(session_id)
+        return session.revision if session else None
+
+    def touch(self, session_id: str):
+        session = self.sessions.get(session_id)
+        if session is not None:
+            session.last_active = self.clock()
+            self.sessions.move_to_end(session_id)
+
+    @asynccontextmanager
+    async def active(self, session_id: str):
+        """Mark the session busy (not spillable or expirable) while a request is handled"""
+        self.busy[session_id] = self.busy.get(session_id, 0) + 1
+        try:
+            yield
+        finally:
+            self.busy[session_id] -= 1
+            if not self.busy[session_id]:
+                del self.busy[session_id]
+            # The handler may also have created or replaced the session
+            self.touch(session_id)
+
+    def record(self, session_id: str, state: Dict[str, Any]):
+        """Update the session's size and revision from the state just saved for it"""
+        session = self.sessions.get(session_id)
+        if session is None:
+            return
+        session.revision = state.get("revision")
+        size = estimate_state_bytes(state)
+        self.resident_bytes += size - session.state_bytes
+        session.state_bytes = size
+        if self.resident_bytes > self.max_bytes:
+            self.pressure.set()
+
+    def remove(self, session_id: str):
+        """Drop the resident agent and any spilled copy"""
+        session = self.sessions.pop(session_id, None)
+        if session is not None:
+            self.resident_bytes -= session.state_bytes
+        if self.spilled.pop(session_id, None) is not None:
+            self._delete_file(session_id)
+
+    def _path(self, session_id: str) -> str:
+        return os.path.join(self.spill_dir, hashlib.sha256(session_id.encode("utf-8")).hexdigest() + ".session")
+
+    def _delete_file(self, session_id: str):
+        try:
+            os.remove(self._path(session_id))
+        except FileNotFoundError:
+            pass
+
+    def _write(self, session_id: str, data: bytes):
+        os.makedirs(self.spill_dir, exist_ok=True)
+        path = self._path(session_id)
+        with open(path + ".tmp", "wb") as spill_file:
+            spill_file.write(data)
+        os.replace(path + ".tmp", path)
+
+    def _read(self, session_id: str) -> bytes:
+        path = self._path(session_id)
+        with open(path, "rb") as spill_file:
+            data = spill_file.read()
+        os.remove(path)
+        return data
+
+    async def spill(self, session_id: str) -> bool:
+        """Write an idle session to disk and drop its agent"""
+        session = self.sessions.get(session_id)
+        if session is None or session_id in self.busy:
+            return False
+        data = encode_state(self.snapshot(session_id, session.agent))
+        await asyncio.to_thread(self._write, session_id, data)
+        # The session may have become active while the file was written
+        if self.sessions.get(session_id) is not session or session_id in self.busy:
+            self._delete_file(session_id)
+            return False
+        del self.sessions[session_id]
+        self.resident_bytes -= session.state_bytes
+        self.spilled[session_id] = (session.last_active, len(data))
+        self.counts["spilled"] += 1
+        return True
+
+    async def take_spilled(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Load and forget a spilled session
+
+        Returns:
+            dict: The state passed to snapshot() when it was spilled, or None
+        """
+        if self.spilled.pop(session_id, None) is None:
+            return None
+        try:
+            data = await asyncio.to_thread(self._read, session_id)
+        except FileNotFoundError:
+            return None
+        self.counts["rehydrated"] += 1
+        return decode_state(data)
+
+    async def reap(self) -> List[str]:
+        """
+        Expire idle sessions, then spill the least recently active ones while over the ceiling
+
+        Returns:
+            list: Ids of the sessions that expired
+        """
+        self.pressure.clear()
+        deadline = self.clock() - self.idle_seconds
+        expired = [session_id for session_id, session in self.sessions.items()
+                   if session.last_active < deadline and session_id not in self.busy]
+        expired += [session_id for session_id, (last_active, _) in self.spilled.items() if last_active < deadline]
+        for session_id in expired:
+            self.remove(session_id)
+        self.counts["expired"] += len(expired)
+
+        for session_id in list(self.sessions):
+            if self.resident_bytes <= self.max_bytes:
+                break
+            await self.spill(session_id)
+        return expired
+
+    async def wait_for_reap(self, interval: float):
+        """Sleep until the next reap is due: `interval` seconds, or sooner if over the ceiling"""
+        try:
+            await asyncio.wait_for(self.pressure.wait(), interval)
+        except asyncio.TimeoutError:
+            pass
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "resident_sessions": len(self.sessions),
+            "resident_bytes": self.resident_bytes,
+            "max_bytes": self.max_bytes,
+            "spilled_sessions": len(self.spilled),
+            "spilled_bytes": sum(size for _, size in self.spilled.values()),
+            **self.counts
+        }
+
+    def close(self):
+        """Delete this process's spill files"""
+        shutil.rmtree(self.spill_dir, ignore_errors=True)
+        self.spilled.clear()
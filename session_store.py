@@ -0,0 +1,137 @@
+"""
+Pluggable storage for interview session state.
+
+Live InterviewAgent objects only exist inside one worker process. Their serialized
+state (InterviewAgent.to_state) is saved here after every step, so a reconnect that
+lands on another uvicorn worker can rebuild the agent and carry on. States are stored
+as zlib-compressed JSON.
+"""
+
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Any, Dict, Optional
+
+
+def encode_state(state: Dict[str, Any]) -> bytes:
+    return zlib.compress(json.dumps(state, separators=(",", ":")).encode("utf-8"))
+
+
+def decode_state(data: bytes) -> Dict[str, Any]:
+    return json.loads(zlib.decompress(data).decode("utf-8"))
+
+
+class SessionStore:
+    """Interface for session state backends"""
+
+    # Whether other worker processes can save states here too
+    shared = False
+
+    async def load(self, session_id: str) -> Optional[Dict[str, Any]]:
+        raise NotImplementedError
+
+    async def save(self, session_id: str, state: Dict[str, Any]):
+        raise NotImplementedError
+
+    async def delete(self, session_id: str):
+        raise NotImplementedError
+
+    async def purge_expired(self):
+        """Drop states older than the TTL"""
+        raise NotImplementedError
+
+
+class InMemorySessionStore(SessionStore):
+    """Single-process store; states are still encoded so sizes match the other backends"""
+
+    def __init__(self, ttl_seconds: float = 2 * 60 * 60):
+        self.ttl_seconds = ttl_seconds
+        self.sessions: Dict[str, tuple] = {}
+
+    async def load(self, session_id: str) -> Optional[Dict[str, Any]]:
+        entry = self.sessions.get(session_id)
+        if entry is None:
+            return None
+        updated_at, data = entry
+        if time.time() - updated_at > self.ttl_seconds:
+            del self.sessions[session_id]
+            return None
+        return decode_state(data)
+
+    async def save(self, session_id: str, state: Dict[str, Any]):
+        self.sessions[session_id] = (time.time(), encode_state(state))
+
+    async def delete(self, session_id: str):
+        self.sessions.pop(session_id, None)
+
+    async def purge_expired(self):
+        # Expired states are otherwise only dropped when loaded
+        deadline = time.time() - self.ttl_seconds
+        for session_id in [session_id for session_id, (updated_at, _) in self.sessions.items() if updated_at <= deadline]:
+            del self.sessions[session_id]
+
+
+class SQLiteSessionStore(SessionStore):
+    """Store shared by all workers on a host through a local SQLite file (WAL mode)"""
+
+    shared = True
+
+    def __init__(self, path: str, ttl_seconds: float = 2 * 60 * 60):
+        """
+        Initialize the store
+        
+        Args:
+            path (str): SQLite database file, shared by every worker process
+            ttl_seconds (float): Sessions not saved for this long are treated as gone
+        """
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.execute("PRAGMA busy_timeout=5000")
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS sessions (id TEXT PRIMARY KEY, state BLOB NOT NULL, updated_at REAL NOT NULL)"
+        )
+
+    def _execute(self, sql: str, parameters: tuple = ()):
+        with self.lock:
+            return self.connection.execute(sql, parameters).fetchone()
+
+    async def load(self, session_id: str) -> Optional[Dict[str, Any]]:
+        row = await asyncio.to_thread(
+            self._execute, "SELECT state FROM sessions WHERE id = ? AND updated_at > ?",
+            (session_id, time.time() - self.ttl_seconds)
+        )
+        return decode_state(row[0]) if row else None
+
+    async def save(self, session_id: str, state: Dict[str, Any]):
+        await asyncio.to_thread(
+            self._execute, "INSERT OR REPLACE INTO sessions (id, state, updated_at) VALUES (?, ?, ?)",
+            (session_id, encode_state(state), time.time())
+        )
+
+    async def delete(self, session_id: str):
+        await asyncio.to_thread(self._execute, "DELETE FROM sessions WHERE id = ?", (session_id,))
+
+    async def purge_expired(self):
+        await asyncio.to_thread(
+            self._execute, "DELETE FROM sessions WHERE updated_at <= ?", (time.time() - self.ttl_seconds,)
+        )
+
+    def close(self):
+        with self.lock:
+            self.connection.close()
+
+
+def create_session_store(backend: str, path: str = "sessions.db", ttl_seconds: float = 2 * 60 * 60) -> SessionStore:
+    """Build the store named by SESSION_STORE ("memory" or "sqlite")"""
+    if backend == "sqlite":
+        return SQLiteSessionStore(path, ttl_seconds)
+    if backend == "memory":
+        return InMemorySessionStore(ttl_seconds)
+    raise ValueError(f"Unknown session store backend: {backend}")
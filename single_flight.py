@@ -0,0 +1,93 @@
+"""
+Single-flight coalescing of duplicate in-flight requests.
+
+Double clicks, a reconnect racing the first attempt or a re-sent answer used to launch
+a second full set of model and TTS calls for work that was already running. A
+SingleFlight runs one call per key at a time: callers arriving while it is in flight
+await the same result (or exception) instead of starting their own. Nothing is cached
+once the call finishes; that is what the TTS and extraction caches are for.
+
+The call runs in its own task, so a caller that goes away (e.g. its socket dropped)
+doesn't cancel it for the others.
+
+A key can carry a content fingerprint (e.g. a hash of the request payload): a request
+for a key in flight with a different fingerprint is not a duplicate, and raises
+SingleFlightConflict instead of being silently merged into the other one.
+"""
+
+import asyncio
+import hashlib
+import json
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+from observability import SINGLE_FLIGHT_COALESCED
+
+
+class SingleFlightConflict(RuntimeError):
+    """Raised when a different request for the same key is already in flight"""
+
+
+def payload_hash(payload: Any) -> str:
+    """Content hash of a JSON payload, independent of its key order"""
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, separators=(",", ":")).encode("utf-8")).hexdigest()
+
+
+class SingleFlight:
+    def __init__(self, name: str):
+        """
+        Initialize the group
+
+        Args:
+            name (str): Default operation label for the coalesced-requests metric
+        """
+        self.name = name
+        self.inflight: Dict[Hashable, asyncio.Task] = {}
+        self.fingerprints: Dict[Hashable, Optional[str]] = {}
+        self.calls = 0
+        self.coalesced = 0
+
+    async def do(self, key: Hashable, call: Callable[[], Awaitable[Any]], operation: Optional[str] = None,
+                 fingerprint: Optional[str] = None) -> Any:
+        """
+        Run `call()`, or join the call already in flight for `key`
+
+        Args:
+            key: Identifies duplicate requests (e.g. session and operation, or a content hash)
+            call: Coroutine function doing the work
+            operation (str): Metric label (default: the group's name)
+            fingerprint (str): Content of the request (e.g. payload_hash); only a call with the
+                same fingerprint is joined
+
+        Returns:
+            The result of the one call made for the concurrent requests
+
+        Raises:
+            SingleFlightConflict: A call with a different fingerprint is in flight for `key`
+        """
+        task = self.inflight.get(key)
+        if task is not None and self.fingerprints.get(key) != fingerprint:
+            raise SingleFlightConflict(f"A different {operation or self.name} request is already in progress")
+        if task is None:
+            task = asyncio.ensure_future(call())
+            self.inflight[key] = task
+            self.fingerprints[key] = fingerprint
+            self.calls += 1
+            task.add_done_callback(lambda done: self._forget(key, done))
+        else:
+            self.coalesced += 1
+            SINGLE_FLIGHT_COALESCED.inc(operation=operation or self.name)
+        return await asyncio.shield(task)
+
+    def _forget(self, key: Hashable, task: asyncio.Task):
+        if self.inflight.get(key) is task:
+            del self.inflight[key]
+            del self.fingerprints[key]
+        # Every waiter may have gone away; don't warn about an unretrieved exception
+        if not task.cancelled():
+            task.exception()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "in_flight": len(self.inflight),
+            "calls": self.calls,
+            "coalesced": self.coalesced
+        }
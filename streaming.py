@@ -0,0 +1,101 @@
+"""
+Streaming pipeline for spoken questions.
+Tokens from the chat model are cut at sentence boundaries and each sentence is sent
+to text-to-speech as soon as it is complete, so the first audio is ready after roughly
+one sentence instead of after the whole question has been generated and synthesized.
+"""
+
+import asyncio
+import re
+from typing import AsyncIterator, Awaitable, Callable, List, Tuple
+
+# A sentence ends at ., ! or ? followed by whitespace
+SENTENCE_BOUNDARY = re.compile(r'(?<=[.!?])\s+')
+
+
+class SentenceChunker:
+    def __init__(self, min_chars: int = 20):
+        """
+        Initialize the chunker
+        
+        Args:
+            min_chars (int): Sentences shorter than this are merged with the next one,
+                so abbreviations and fragments don't turn into tiny TTS requests
+        """
+        self.min_chars = min_chars
+        self.buffer = ""
+
+    def feed(self, text: str) -> List[str]:
+        """Add streamed text and return any sentences that are now complete"""
+        self.buffer += text
+        sentences = []
+        start = 0
+        for match in SENTENCE_BOUNDARY.finditer(self.buffer):
+            candidate = self.buffer[start:match.start()].strip()
+            if len(candidate) >= self.min_chars:
+                sentences.append(candidate)
+                start = match.end()
+        self.buffer = self.buffer[start:]
+        return sentences
+
+    def flush(self) -> List[str]:
+        """Return whatever text is left once the stream has ended"""
+        remainder = self.buffer.strip()
+        self.buffer = ""
+        return [remainder] if remainder else []
+
+
+async def stream_sentence_audio(
+    text_stream: AsyncIterator[str],
+    synthesize: Callable[[str], Awaitable[bytes]],
+    chunker: SentenceChunker = None
+) -> AsyncIterator[Tuple[int, str, bytes]]:
+    """
+    Synthesize streamed text sentence by sentence
+    
+    Each sentence is handed to TTS as soon as it is complete, while the model keeps
+    generating; results are yielded strictly in sentence order.
+    
+    Args:
+        text_stream: Async iterator of text fragments from the chat model
+        synthesize: Coroutine function turning a sentence into audio
+        chunker: Optional SentenceChunker to control sentence sizes
+        
+    Yields:
+        Tuples of (index, sentence, audio)
+    """
+    chunker = chunker or SentenceChunker()
+    queue: asyncio.Queue = asyncio.Queue()
+    pending = []
+
+    def schedule(sentence: str):
+        task = asyncio.create_task(synthesize(sentence))
+        pending.append(task)
+        queue.put_nowait((sentence, task))
+
+    async def produce():
+        try:
+            async for text in text_stream:
+                for sentence in chunker.feed(text):
+                    schedule(sentence)
+            for sentence in chunker.flush():
+                schedule(sentence)
+        finally:
+            queue.put_nowait(None)
+
+    producer = asyncio.create_task(produce())
+    try:
+        index = 0
+        while True:
+            item = await queue.get()
+            if item is None:
+                break
+            sentence, task = item
+            yield index, sentence, await task
+            index += 1
+        # Surface any error raised while streaming from the model
+        await producer
+    finally:
+        producer.cancel()
+        for task in pending:
+            task.cancel()
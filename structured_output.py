@@ -0,0 +1,359 @@
+"""
+Structured (JSON) model outputs: typed schemas, response formats, a tolerant parser and repair.
+
+The extraction and feedback calls ask for a JSON object. Models wrap it in code fences,
+add a sentence before or after it, leave a trailing comma or get cut off at the token
+limit, and a plain json.loads on any of those threw away the whole GPT-4 call and put
+placeholders in its place.
+
+- The schemas below are sent with the call as its response format (STRUCTURED_OUTPUT):
+  a forced function call (the default; gpt-4 and gpt-3.5-turbo support it), a strict
+  JSON schema (models with structured outputs), JSON mode, or none (the prompt only).
+- parse_json() recovers the first JSON object in the text. It scans the text once per
+  candidate object, fixes common slips outside strings (Python literals, trailing
+  commas, smart quotes) and closes an object that was cut off.
+- validate() checks the object against its schema and coerces what it can ("4" -> 4, a
+  comma-separated string -> a list).
+- Only when both fail is a repair prompt sent: the broken output and the schema, without
+  the session prefix, to the fast tier. That is a few hundred tokens instead of
+  regenerating the result.
+"""
+
+import json
+import re
+from typing import Any, Dict, List, Optional, Tuple
+from langchain_core.messages import HumanMessage, SystemMessage
+
+RESPONSE_FORMATS = ("function", "json_schema", "json_object", "none")
+
+PERSONAL_INFO_SCHEMA: Dict[str, Any] = {
+    "title": "personal_info",
+    "description": "Personal information extracted from the candidate's resume",
+    "type": "object",
+    "properties": {
+        "name": {"type": "string"},
+        "experience": {"type": "string"},
+        "skills": {"type": "array", "items": {"type": "string"}},
+        "current_role": {"type": "string"},
+        "achievements": {"type": "array", "items": {"type": "string"}}
+    },
+    "required": ["name", "experience", "skills", "current_role", "achievements"],
+    "additionalProperties": False
+}
+
+FEEDBACK_SCHEMA: Dict[str, Any] = {
+    "title": "interview_feedback",
+    "description": "Final feedback on the candidate's interview performance",
+    "type": "object",
+    "properties": {
+        "rating": {"type": "integer", "minimum": 1, "maximum": 5},
+        "feedback": {"type": "string"},
+        "keyTakeaways": {"type": "array", "items": {"type": "string"}, "minItems": 10, "maxItems": 10}
+    },
+    "required": ["rating", "feedback", "keyTakeaways"],
+    "additionalProperties": False
+}
+
+QUESTION_BANK_SCHEMA: Dict[str, Any] = {
+    "title": "question_bank",
+    "description": "Seed interview questions for a job posting, each with the skills it covers",
+    "type": "object",
+    "properties": {
+        "questions": {"type": "array", "items": {
+            "type": "object",
+            "properties": {
+                "question": {"type": "string"},
+                "skills": {"type": "array", "items": {"type": "string"}}
+            },
+            "required": ["question", "skills"],
+            "additionalProperties": False
+        }}
+    },
+    "required": ["questions"],
+    "additionalProperties": False
+}
+
+# Validation-only keywords that strict JSON schema response formats reject
+_UNSUPPORTED_IN_STRICT = ("minimum", "maximum", "minItems", "maxItems")
+
+_LITERALS = {"True": "true", "False": "false", "None": "null"}
+_OPEN_QUOTES = {'"': '"', "“": "”"}
+
+
+class StructuredOutputError(ValueError):
+    """Raised when a model output can't be turned into the requested object"""
+
+
+def _schema_body(schema: Dict[str, Any]) -> Dict[str, Any]:
+    return {key: value for key, value in schema.items() if key not in ("title", "description")}
+
+
+def _strict(schema: Dict[str, Any]) -> Dict[str, Any]:
+    schema = {key: value for key, value in schema.items() if key not in _UNSUPPORTED_IN_STRICT}
+    if "properties" in schema:
+        schema["properties"] = {name: _strict(prop) for name, prop in schema["properties"].items()}
+    if "items" in schema:
+        schema["items"] = _strict(schema["items"])
+    return schema
+
+
+def response_format(schema: Dict[str, Any], mode: str) -> Dict[str, Any]:
+    """
+    Keyword arguments for a chat call that make it return `schema`-shaped JSON
+
+    Args:
+        schema (dict): One of the schemas above
+        mode (str): "function", "json_schema", "json_object" or "none"
+
+    Returns:
+        dict: Arguments for ChatOpenAI.invoke/ainvoke (empty for "none")
+    """
+    if mode == "function":
+        return {
+            "functions": [{"name": schema["title"], "description": schema["description"],
+                           "parameters": _schema_body(schema)}],
+            "function_call": {"name": schema["title"]}
+        }
+    if mode == "json_schema":
+        return {"response_format": {"type": "json_schema", "json_schema": {
+            "name": schema["title"], "schema": _strict(_schema_body(schema)), "strict": True
+        }}}
+    if mode == "json_object":
+        return {"response_format": {"type": "json_object"}}
+    if mode == "none":
+        return {}
+    raise ValueError(f"Unknown structured output mode: {mode} (expected one of {', '.join(RESPONSE_FORMATS)})")
+
+
+def response_text(message: Any) -> str:
+    """The JSON text of a chat response: the function call's arguments, or else its content"""
+    extra = getattr(message, "additional_kwargs", None) or {}
+    if extra.get("function_call"):
+        return extra["function_call"].get("arguments", "")
+    if extra.get("tool_calls"):
+        return extra["tool_calls"][0]["function"].get("arguments", "")
+    return message.content
+
+
+def _normalize(fragment: str) -> str:
+    """
+    Rewrite a JSON-like fragment outside its strings (Python literals, trailing commas,
+    smart quotes) and close the strings, arrays and objects a cut-off fragment left open
+    """
+    out: List[str] = []
+    closers: List[str] = []
+    closing_quote = None
+    escaped = False
+    index = 0
+    while index < len(fragment):
+        char = fragment[index]
+        if closing_quote is not None:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == closing_quote or char == '"':
+                closing_quote = None
+                char = '"'
+            out.append(char)
+        elif char in _OPEN_QUOTES:
+            closing_quote = _OPEN_QUOTES[char]
+            out.append('"')
+        elif char in "{[":
+            closers.append("}" if char == "{" else "]")
+            out.append(char)
+        elif char in "}]":
+            _drop_trailing_comma(out)
+            if closers:
+                closers.pop()
+            out.append(char)
+        elif char.isalpha():
+            word = re.match(r"\w+", fragment[index:]).group(0)
+            out.append(_LITERALS.get(word, word))
+            index += len(word)
+            continue
+        else:
+            out.append(char)
+        index += 1
+
+    if closing_quote is not None:
+        if escaped:
+            out.pop()
+        out.append('"')
+    while closers:
+        _drop_trailing_comma(out)
+        out.append(closers.pop())
+    return "".join(out)
+
+
+def _drop_trailing_comma(out: List[str]):
+    position = len(out) - 1
+    while position >= 0 and out[position].isspace():
+        position -= 1
+    if position >= 0 and out[position] == ",":
+        del out[position]
+
+
+def _object_end(text: str, start: int) -> Optional[int]:
+    """Index just past the object opened at text[start], or None if it is never closed"""
+    depth = 0
+    closing_quote = None
+    escaped = False
+    for index in range(start, len(text)):
+        char = text[index]
+        if closing_quote is not None:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == closing_quote or char == '"':
+                closing_quote = None
+        elif char in _OPEN_QUOTES:
+            closing_quote = _OPEN_QUOTES[char]
+        elif char in "{[":
+            depth += 1
+        elif char in "}]":
+            depth -= 1
+            if depth == 0:
+                return index + 1
+    return None
+
+
+def _loads_object(fragment: str) -> Optional[Dict[str, Any]]:
+    for candidate in (fragment, _normalize(fragment)):
+        try:
+            value = json.loads(candidate)
+        except (ValueError, RecursionError):
+            continue
+        if isinstance(value, dict):
+            return value
+    return None
+
+
+def parse_json(text: str) -> Tuple[Dict[str, Any], bool]:
+    """
+    Recover the first JSON object in a model output
+
+    Args:
+        text (str): The raw output
+
+    Returns:
+        tuple: (the object, whether the text was clean JSON)
+
+    Raises:
+        StructuredOutputError: No object could be recovered
+    """
+    if not isinstance(text, str):
+        raise StructuredOutputError(f"Expected text, got {type(text).__name__}")
+    try:
+        value = json.loads(text)
+        if isinstance(value, dict):
+            return value, True
+    except (ValueError, RecursionError):
+        pass
+
+    start = text.find("{")
+    while start != -1:
+        end = _object_end(text, start)
+        if end is None:
+            # Cut off: close it, or else drop the last (partial) member and close that
+            fragment = text[start:]
+            value = _loads_object(fragment)
+            cuts = [match.start() for match in re.finditer(",", fragment)][-5:]
+            for cut in reversed(cuts):
+                if value is not None:
+                    break
+                value = _loads_object(fragment[:cut])
+            if value is not None:
+                return value, False
+        else:
+            value = _loads_object(text[start:end])
+            if value is not None:
+                return value, False
+        start = text.find("{", start + 1)
+    raise StructuredOutputError("No JSON object found in the model output")
+
+
+def _coerce(value: Any, schema: Dict[str, Any], field: str) -> Any:
+    kind = schema.get("type")
+    if kind == "string":
+        if isinstance(value, str):
+            return value
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            return str(value)
+        if isinstance(value, list) and all(isinstance(item, str) for item in value):
+            return ", ".join(value)
+    elif kind == "integer":
+        number = None
+        if isinstance(value, bool):
+            pass
+        elif isinstance(value, (int, float)):
+            number = round(value)
+        elif isinstance(value, str):
+            match = re.match(r"\s*(\d+)", value)
+            number = int(match.group(1)) if match else None
+        if number is not None:
+            return max(schema.get("minimum", number), min(schema.get("maximum", number), number))
+    elif kind == "array":
+        if isinstance(value, str):
+            value = [item.strip(" -*•") for item in re.split(r"[,\n]", value)]
+        if isinstance(value, list):
+            items = []
+            for item in value:
+                if item in (None, ""):
+                    continue
+                try:
+                    items.append(_coerce(item, schema.get("items", {}), field))
+                except StructuredOutputError:
+                    continue  # keep the usable items
+            return items[:schema["maxItems"]] if "maxItems" in schema else items
+    elif kind == "object":
+        if isinstance(value, dict):
+            return validate(value, schema)
+    raise StructuredOutputError(f"{field} should be {kind}, got {type(value).__name__}")
+
+
+def validate(data: Dict[str, Any], schema: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Check an object against one of the schemas above, coercing what can be coerced
+
+    Unknown keys are dropped. Arrays longer than maxItems are cut; shorter ones are
+    kept (a few real takeaways beat placeholders).
+
+    Raises:
+        StructuredOutputError: A required field is missing or has an unusable type
+    """
+    missing = [field for field in schema["required"] if field not in data or data[field] is None]
+    if missing:
+        raise StructuredOutputError(f"Missing fields: {', '.join(missing)}")
+    return {field: _coerce(data[field], prop, field)
+            for field, prop in schema["properties"].items() if field in data}
+
+
+def parse_structured(text: str, schema: Dict[str, Any]) -> Tuple[Dict[str, Any], bool]:
+    """parse_json() and validate() in one step; returns (the object, whether the text was clean JSON)"""
+    data, clean = parse_json(text)
+    return validate(data, schema), clean
+
+
+def repair_messages(text: str, schema: Dict[str, Any], error: str) -> List[Any]:
+    """
+    Prompt asking a (cheap) model to turn an unusable output into valid JSON
+
+    Args:
+        text (str): The output that failed to parse
+        schema (dict): The schema it should follow
+        error (str): Why it failed
+    """
+    instructions = (
+        "Rewrite the output below as a single JSON object that follows this JSON schema. "
+        "Keep its content; only fix the format. Reply with the JSON object only.\n"
+        "\n"
+        f"SCHEMA:\n{json.dumps(_schema_body(schema))}\n"
+        "\n"
+        f"PROBLEM: {error}\n"
+        "\n"
+        f"OUTPUT:\n{text}"
+    )
+    return [SystemMessage(content="You convert text to valid JSON."), HumanMessage(content=instructions)]
+
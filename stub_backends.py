@@ -0,0 +1,361 @@
+"""
+Local stand-ins for the chat model and the text-to-speech client.
+They mimic the parts of ChatOpenAI and the OpenAI audio API that InterviewAgent
+uses, with artificial latency, so the agent can be exercised without network access.
+
+Latencies are either fixed seconds or a function returning seconds (see
+latency_distribution), and failures and stalls (a request that hangs for a long
+time, as an overloaded upstream sometimes does) can be injected at a given rate. StubBackends
+bundles the stubs behind the same interface as client_pool.ClientPool, so the server
+can run against them (MODEL_BACKEND=stub) for load tests.
+"""
+
+import asyncio
+import json
+import math
+import os
+import random
+import re
+import time
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Union
+from langchain_core.messages import AIMessage, AIMessageChunk
+from conversation_context import estimate_tokens
+
+Latency = Union[float, Callable[[], float]]
+
+PERSONAL_INFO = {
+    "name": "Jane Smith",
+    "experience": "6 years",
+    "skills": ["Python", "FastAPI", "scikit-learn"],
+    "current_role": "Senior Python Developer",
+    "achievements": ["Improved query performance by 40%"]
+}
+FEEDBACK = {
+    "rating": 4,
+    "feedback": "Strong technical answers with concrete examples.",
+    "keyTakeaways": [f"Takeaway {i + 1}" for i in range(10)]
+}
+JOB_DIGEST = (
+    "Senior Python Developer. Must have: 5+ years of Python, FastAPI or Django, machine learning libraries, "
+    "SQL and NoSQL databases, RESTful APIs."
+)
+QUESTION_BANK = {
+    "questions": [
+        {"question": "Walk me through a FastAPI service you designed. How did you structure it and why?",
+         "skills": ["Python", "FastAPI"]},
+        {"question": "How have you deployed a scikit-learn model behind an API, and how did you monitor it?",
+         "skills": ["scikit-learn", "Python"]},
+        {"question": "Tell me about a slow database query you optimized. How did you find and fix the problem?",
+         "skills": ["SQL", "PostgreSQL"]},
+        {"question": "How do you version and document a RESTful API that other teams depend on?",
+         "skills": ["RESTful APIs"]},
+        {"question": "When would you choose a document store over a relational database? Give an example.",
+         "skills": ["MongoDB", "SQL"]},
+        {"question": "Describe a Django application you maintained. What would you change in its design today?",
+         "skills": ["Django", "Python"]}
+    ]
+}
+
+
+class StubBackendError(Exception):
+    """Injected failure, standing in for a provider error"""
+
+
+def latency_distribution(spec: str, seed: Optional[int] = None) -> Latency:
+    """
+    Build a latency from a short spec
+    
+    Args:
+        spec (str): "0.3" (fixed seconds), "uniform:low,high", "normal:mean,stddev" or
+            "lognormal:median,sigma"
+        seed (int): Seed for a reproducible sequence of samples
+        
+    Returns:
+        A fixed latency, or a function that samples one
+    """
+    kind, _, params = spec.partition(":")
+    if not params:
+        return float(kind)
+    rng = random.Random(seed)
+    a, b = (float(value) for value in params.split(","))
+    if kind == "uniform":
+        return lambda: rng.uniform(a, b)
+    if kind == "normal":
+        return lambda: max(0.0, rng.gauss(a, b))
+    if kind == "lognormal":
+        return lambda: rng.lognormvariate(math.log(a), b)
+    raise ValueError(f"Unknown latency distribution: {kind}")
+
+
+def sample(latency: Latency) -> float:
+    return latency() if callable(latency) else latency
+
+
+class StubChatModel:
+    def __init__(self, latency: Latency = 0.0, responder: Optional[Callable[[str], str]] = None,
+                 token_latency: Latency = 0.0, prompt_token_latency: float = 0.0,
+                 failure_rate: float = 0.0, seed: Optional[int] = None,
+                 record_prompts: bool = True, model_name: str = "chat",
+                 stall_rate: float = 0.0, stall_seconds: float = 30.0):
+        """
+        Initialize the stub chat model
+        
+        Args:
+            latency: Seconds to wait before the first token of each call (fixed or sampled)
+            responder: Optional function mapping the prompt text to a response text
+            token_latency: Seconds to generate each following token (word)
+            prompt_token_latency (float): Seconds of prefill per prompt token
+            failure_rate (float): Fraction of calls that fail with StubBackendError
+            seed (int): Seed for the failure injection
+            record_prompts (bool): Keep per-call prompt and cached token counts (and simulate
+                the provider prefix cache); disable for long-running servers
+            model_name (str): Model name reported to the call scheduler
+            stall_rate (float): Fraction of calls that stall before their first token
+            stall_seconds (float): How long a stalled call hangs
+        """
+        self.latency = latency
+        self.token_latency = token_latency
+        self.prompt_token_latency = prompt_token_latency
+        self.failure_rate = failure_rate
+        self.stall_rate = stall_rate
+        self.stall_seconds = stall_seconds
+        self.rng = random.Random(seed)
+        self.record_prompts = record_prompts
+        self.model_name = model_name
+        self.prompt_tokens: List[int] = []
+        # Simulated provider prompt cache: leading-message prefixes seen so far
+        self.cached_tokens: List[int] = []
+        self._seen_prefixes: List[str] = []
+        self._last_prompt_tokens = 0
+        self._last_cached_tokens = 0
+        self.responder = responder or self._default_response
+        self.calls = 0
+        self.failures = 0
+        self.stalls = 0
+        self.questions_asked = 0
+
+    def _prompt_text(self, messages: List[Any]) -> str:
+        prompt = "\n".join(str(message.content) for message in messages)
+        self._last_prompt_tokens = estimate_tokens(prompt)
+        self._last_cached_tokens = 0
+        if self.record_prompts:
+            self._last_cached_tokens = self._cached_prefix_tokens(str(messages[0].content))
+            self.prompt_tokens.append(self._last_prompt_tokens)
+            self.cached_tokens.append(self._last_cached_tokens)
+        return prompt
+
+    def _maybe_fail(self):
+        if self.failure_rate and self.rng.random() < self.failure_rate:
+            self.failures += 1
+            raise StubBackendError("Injected chat model failure")
+
+    def _cached_prefix_tokens(self, first_message: str) -> int:
+        """Tokens of the first message that a provider-side prefix cache would serve"""
+        cached = max(
+            (len(os.path.commonprefix([seen, first_message])) for seen in self._seen_prefixes),
+            default=0
+        )
+        if first_message not in self._seen_prefixes:
+            self._seen_prefixes.append(first_message)
+        return cached // 4
+
+    def _default_response(self, prompt: str) -> str:
+        """Return a canned response that matches the kind of prompt"""
+        if "Rewrite the output below as a single JSON object" in prompt:
+            # Repair prompt: the canned object for whichever schema it carries
+            if "keyTakeaways" in prompt:
+                return json.dumps(FEEDBACK)
+            return json.dumps(QUESTION_BANK if '"questions"' in prompt else PERSONAL_INFO)
+        if "compact requirements digest" in prompt:
+            return JOB_DIGEST
+        if "Write a question bank" in prompt:
+            return json.dumps(QUESTION_BANK)
+        if "Extract the following personal information" in prompt:
+            return json.dumps(PERSONAL_INFO)
+        if "keyTakeaways" in prompt:
+            return json.dumps(FEEDBACK)
+        if "Analyze the candidate's answer" in prompt:
+            return "Analysis: The answer was specific and technically sound. Explore scaling next.\nScore: 4"
+        if "Generate a professional closing message" in prompt:
+            return "Thank you for your time today. We will share detailed feedback shortly."
+        if "ask ONE specific technical question" in prompt:
+            self.questions_asked += 1
+            return (f"Question {self.questions_asked}: I see you have worked with FastAPI at ABC Tech. "
+                    "Can you describe a system you built there and the trade-offs you made?")
+        return "Hello Jane Smith, I'm your AI interviewer today."
+
+    def _tokens(self, text: str) -> List[str]:
+        return re.findall(r'\S+\s*', text)
+
+    def _stall(self) -> float:
+        if self.stall_rate and self.rng.random() < self.stall_rate:
+            self.stalls += 1
+            return self.stall_seconds
+        return 0.0
+
+    def _first_token_latency(self) -> float:
+        # Prefill is only charged for tokens that were not served from the prefix cache
+        return (sample(self.latency) + self._stall()
+                + self.prompt_token_latency * (self._last_prompt_tokens - self._last_cached_tokens))
+
+    def _total_latency(self, text: str) -> float:
+        return self._first_token_latency() + sum(
+            sample(self.token_latency) for _ in range(max(len(self._tokens(text)) - 1, 0)))
+
+    def invoke(self, messages: List[Any], **kwargs) -> AIMessage:
+        self.calls += 1
+        content = self.responder(self._prompt_text(messages))
+        time.sleep(self._total_latency(content))
+        self._maybe_fail()
+        return AIMessage(content=content)
+
+    async def ainvoke(self, messages: List[Any], **kwargs) -> AIMessage:
+        self.calls += 1
+        content = self.responder(self._prompt_text(messages))
+        await asyncio.sleep(self._total_latency(content))
+        self._maybe_fail()
+        return AIMessage(content=content)
+
+    async def astream(self, messages: List[Any], **kwargs) -> AsyncIterator[AIMessageChunk]:
+        self.calls += 1
+        content = self.responder(self._prompt_text(messages))
+        await asyncio.sleep(self._first_token_latency())
+        self._maybe_fail()
+        for index, token in enumerate(self._tokens(content)):
+            if index:
+                await asyncio.sleep(sample(self.token_latency))
+            yield AIMessageChunk(content=token)
+
+
+class _StubSpeechResponse:
+    def __init__(self, content: bytes):
+        self.content = content
+
+
+class StubSpeechClient:
+    """Synchronous stand-in for OpenAI().audio.speech"""
+
+    def __init__(self, latency: Latency = 0.0, char_latency: float = 0.0, failure_rate: float = 0.0,
+                 seed: Optional[int] = None, stall_rate: float = 0.0, stall_seconds: float = 30.0):
+        """
+        Args:
+            latency: Seconds per request (fixed or sampled)
+            char_latency (float): Additional seconds per character of input text
+            failure_rate (float): Fraction of requests that fail with StubBackendError
+            seed (int): Seed for the failure injection
+            stall_rate (float): Fraction of requests that stall
+            stall_seconds (float): How long a stalled request hangs
+        """
+        self.latency = latency
+        self.char_latency = char_latency
+        self.failure_rate = failure_rate
+        self.stall_rate = stall_rate
+        self.stall_seconds = stall_seconds
+        self.rng = random.Random(seed)
+        self.calls = 0
+        self.failures = 0
+        self.stalls = 0
+        # Mirror the client.audio.speech.create attribute chain
+        self.audio = self
+        self.speech = self
+
+    def _delay(self, text: str) -> float:
+        delay = sample(self.latency) + self.char_latency * len(text)
+        if self.stall_rate and self.rng.random() < self.stall_rate:
+            self.stalls += 1
+            delay += self.stall_seconds
+        return delay
+
+    def _synthesize(self, text: str) -> _StubSpeechResponse:
+        self.calls += 1
+        if self.failure_rate and self.rng.random() < self.failure_rate:
+            self.failures += 1
+            raise StubBackendError("Injected speech failure")
+        return _StubSpeechResponse(b"ID3" + text.encode("utf-8"))
+
+    def create(self, model: str, voice: str, input: str, **kwargs) -> _StubSpeechResponse:
+        time.sleep(self._delay(input))
+        return self._synthesize(input)
+
+
+class AsyncStubSpeechClient(StubSpeechClient):
+    """Asynchronous stand-in for AsyncOpenAI().audio.speech"""
+
+    async def create(self, model: str, voice: str, input: str, **kwargs) -> _StubSpeechResponse:
+        await asyncio.sleep(self._delay(input))
+        return self._synthesize(input)
+
+
+class StubBackends:
+    """Shared stub chat and speech clients, with the same interface as client_pool.ClientPool"""
+
+    def __init__(self, llm_latency: Latency = 0.0, token_latency: Latency = 0.0,
+                 tts_latency: Latency = 0.0, failure_rate: float = 0.0, seed: Optional[int] = None,
+                 model_name: str = "chat", stall_rate: float = 0.0, stall_seconds: float = 30.0):
+        """
+        Initialize the stubs
+        
+        Args:
+            llm_latency: Seconds before the first token of each chat call
+            token_latency: Seconds per following token
+            tts_latency: Seconds per speech request
+            failure_rate (float): Fraction of chat and speech calls that fail
+            seed (int): Seed for the failure injection
+            model_name (str): Chat model name reported to the call scheduler
+            stall_rate (float): Fraction of chat and speech calls that stall
+            stall_seconds (float): How long a stalled call hangs
+        """
+        stalls = {"stall_rate": stall_rate, "stall_seconds": stall_seconds}
+        self.llm_options = {"latency": llm_latency, "token_latency": token_latency,
+                            "failure_rate": failure_rate, "seed": seed, **stalls}
+        self.chat_models: Dict[str, StubChatModel] = {}
+        self.llm = self.chat_model(model_name)
+        self.openai_client = StubSpeechClient(latency=tts_latency, failure_rate=failure_rate, seed=seed, **stalls)
+        self.async_openai_client = AsyncStubSpeechClient(latency=tts_latency, failure_rate=failure_rate, seed=seed,
+                                                         **stalls)
+
+    @classmethod
+    def from_env(cls, model_name: str = "chat") -> "StubBackends":
+        """Configure from STUB_LLM_LATENCY, STUB_TOKEN_LATENCY, STUB_TTS_LATENCY (latency specs),
+        STUB_FAILURE_RATE, STUB_STALL_RATE, STUB_STALL_SECONDS and STUB_SEED"""
+        seed = os.getenv("STUB_SEED")
+        seed = int(seed) if seed else None
+        return cls(
+            llm_latency=latency_distribution(os.getenv("STUB_LLM_LATENCY", "0.5"), seed),
+            token_latency=latency_distribution(os.getenv("STUB_TOKEN_LATENCY", "0.01"), seed),
+            tts_latency=latency_distribution(os.getenv("STUB_TTS_LATENCY", "0.3"), seed),
+            failure_rate=float(os.getenv("STUB_FAILURE_RATE", 0)),
+            seed=seed,
+            model_name=model_name,
+            stall_rate=float(os.getenv("STUB_STALL_RATE", 0)),
+            stall_seconds=float(os.getenv("STUB_STALL_SECONDS", 30))
+        )
+
+    def chat_model(self, model_name: str) -> StubChatModel:
+        """Stub chat model reporting `model_name` (same latency and failure settings for every model)"""
+        if model_name not in self.chat_models:
+            self.chat_models[model_name] = StubChatModel(record_prompts=False, model_name=model_name,
+                                                         **self.llm_options)
+        return self.chat_models[model_name]
+
+    def agent_clients(self) -> Dict[str, Any]:
+        return {
+            "llm": self.llm,
+            "openai_client": self.openai_client,
+            "async_openai_client": self.async_openai_client
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "backend": "stub",
+            "llm_calls": sum(model.calls for model in self.chat_models.values()),
+            "llm_failures": sum(model.failures for model in self.chat_models.values()),
+            "llm_calls_by_model": {name: model.calls for name, model in self.chat_models.items()},
+            "tts_calls": self.async_openai_client.calls + self.openai_client.calls,
+            "tts_failures": self.async_openai_client.failures + self.openai_client.failures,
+            "stalls": (sum(model.stalls for model in self.chat_models.values())
+                       + self.async_openai_client.stalls + self.openai_client.stalls)
+        }
+
+    async def aclose(self):
+        pass
@@ -0,0 +1,237 @@
+"""
+Tests for the WebSocket transport in app.py, using in-memory sockets.
+"""
+
+import asyncio
+import base64
+import json
+import app
+import audio_protocol
+from app import ConnectionManager
+from interview_agent import InterviewAgent
+from replay_buffer import ReplayBuffer
+from stub_backends import AsyncStubSpeechClient, StubBackends
+from test_async_interview_agent import make_agent
+from fakes import FakeWebSocket, JOB_DESCRIPTION, RESUME, ANSWER, make_pdf
+
+
+def run_connected(encoding: str, steps=None, **manager_options):
+    """
+    Connect a fake socket and run `steps(manager)` in the same event loop (the writer
+    task lives in that loop), then return the manager and the socket
+    """
+    manager = ConnectionManager(**manager_options)
+    websocket = FakeWebSocket()
+
+    async def run():
+        await manager.connect(websocket, "client", encoding)
+        if steps:
+            await steps(manager)
+        await manager.flush("client")
+
+    asyncio.run(run())
+    return manager, websocket
+
+
+def test_connection_established_confirms_negotiated_encoding():
+    _, websocket = run_connected("binary")
+    assert json.loads(websocket.frames[0])["data"]["audio_encoding"] == "binary"
+
+    _, websocket = run_connected("something-else")
+    assert json.loads(websocket.frames[0])["data"]["audio_encoding"] == "base64"
+
+
+def test_binary_mode_sends_metadata_then_audio_frame():
+    audio = b"ID3 fake mp3 payload"
+
+    async def send(manager):
+        await manager.send_audio_message({
+            "event": "next_question",
+            "data": {'question_number': 3}
+        }, audio, "client")
+
+    _, websocket = run_connected("binary", send)
+    metadata, frame = websocket.frames[1:]
+    metadata = json.loads(metadata)
+    assert metadata["data"] == {'question_number': 3, 'question': None, 'audio_bytes': len(audio)}
+    assert audio_protocol.decode_audio_frame(frame) == ("next_question", 3, 0, audio)
+
+
+def test_base64_mode_embeds_audio_in_json():
+    async def send(manager):
+        await manager.send_audio_message({
+            "event": "next_question",
+            "data": {'question_number': 2}
+        }, b"audio", "client")
+
+    _, websocket = run_connected("base64", send)
+    message = json.loads(websocket.frames[1])
+    assert message["data"]["question"] == audio_protocol.encode_base64_audio(b"audio")
+
+
+def test_slow_consumer_is_disconnected_instead_of_blocking_senders():
+    manager = ConnectionManager(max_queue=2, send_timeout=0.05)
+    websocket = FakeWebSocket(send_delay=10)
+
+    async def run():
+        await manager.connect(websocket, "client")
+        return [await manager.send_personal_message({"event": "tick", "data": {}}, "client") for _ in range(5)]
+
+    results = asyncio.run(run())
+    assert results[-1] is False
+    assert websocket.closed
+    assert not manager.is_connected("client")
+    assert manager.stats()["slow_consumers"] == 1
+
+
+def test_reconnect_replaces_socket_and_stale_disconnect_is_ignored():
+    manager = ConnectionManager()
+    old, new = FakeWebSocket(), FakeWebSocket()
+
+    async def run():
+        await manager.connect(old, "client")
+        await manager.connect(new, "client")
+        manager.disconnect("client", old)  # the old handler cleaning up late
+        await manager.send_personal_message({"event": "tick", "data": {}}, "client")
+        await manager.flush("client")
+
+    asyncio.run(run())
+    assert old.closed
+    assert manager.is_connected("client", new)
+    assert [json.loads(frame)["event"] for frame in new.frames] == ["connection_established", "tick"]
+
+
+def test_replay_buffer_reports_gaps_once_events_are_dropped():
+    buffer = ReplayBuffer(max_events=2)
+    for number in range(3):
+        buffer.append({"event": "tick", "data": {"number": number}})
+    assert [seq for seq, *_ in buffer.since(1)] == [2, 3]
+    assert buffer.since(3) == []
+    assert buffer.since(0) is None
+
+
+def test_replay_buffer_reports_a_gap_for_a_seq_it_never_issued():
+    assert ReplayBuffer().since(5) is None
+    buffer = ReplayBuffer()
+    buffer.append({"event": "tick", "data": {}})
+    assert buffer.since(1) == []
+    assert buffer.since(7) is None
+
+
+def test_reconnect_replays_missed_events_in_the_new_encoding():
+    manager = ConnectionManager()
+    first, second = FakeWebSocket(), FakeWebSocket()
+
+    async def run():
+        await manager.connect(first, "client")
+        await manager.send_personal_message({"event": "interview_started", "data": {}}, "client")
+        await manager.flush("client")
+        manager.disconnect("client", first)
+        # Generated while the candidate had no signal
+        await manager.send_audio_message({"event": "next_question", "data": {'question_number': 2}},
+                                         b"audio", "client")
+        await manager.connect(second, "client", audio_protocol.BINARY, last_seq=1)
+        await manager.flush("client")
+
+    asyncio.run(run())
+    established, metadata, frame = second.frames
+    assert json.loads(established)["data"]["resumed"] is True
+    assert json.loads(metadata)["seq"] == 2
+    assert audio_protocol.decode_audio_frame(frame) == ("next_question", 2, 0, b"audio")
+
+
+def test_streamed_sentence_without_speech_is_sent_as_text(monkeypatch):
+    agent = make_agent(latency=0)
+    agent.async_openai_client = AsyncStubSpeechClient(failure_rate=1.0)
+
+    async def stream(manager):
+        monkeypatch.setattr(app, "manager", manager)
+        await app.stream_question("client", agent.astream_start_interview())
+
+    _, websocket = run_connected("binary", stream)
+    chunks = [json.loads(frame) for frame in websocket.frames[1:-1]]
+    assert chunks and all(chunk["event"] == "question_chunk" for chunk in chunks)
+    assert all(chunk["data"]["audio_unavailable"] and chunk["data"]["audio"] is None for chunk in chunks)
+    assert " ".join(chunk["data"]["text"] for chunk in chunks) == agent.context.turns[0].question
+    assert json.loads(websocket.frames[-1])["event"] == "question_end"
+
+
+def count_calls(backends: StubBackends) -> int:
+    stats = backends.stats()
+    return stats["llm_calls"] + stats["tts_calls"]
+
+
+def test_reconnect_avoids_recomputing_model_calls(monkeypatch):
+    backends = StubBackends()
+    manager = ConnectionManager(grace_seconds=60)
+    monkeypatch.setattr(app, "client_pool", backends)
+    monkeypatch.setattr(app, "scheduler", None)
+    monkeypatch.setattr(app, "manager", manager)
+    start = {"job_description": JOB_DESCRIPTION, "resume": base64.b64encode(make_pdf([RESUME])).decode()}
+
+    async def run():
+        first = FakeWebSocket()
+        await manager.connect(first, "resuming")
+        await app.handle_start_interview("resuming", start)
+        await manager.flush("resuming")
+        last_seq = json.loads(first.frames[-1])["seq"]
+
+        # The signal drops while the answer is being processed
+        answer = asyncio.create_task(app.handle_submit_answer("resuming", {"answer": ANSWER}))
+        manager.disconnect("resuming", first)
+        await answer
+        calls_before_reconnect = count_calls(backends)
+
+        second = FakeWebSocket()
+        await manager.connect(second, "resuming", last_seq=last_seq)
+        await manager.flush("resuming")
+        resume_calls = count_calls(backends) - calls_before_reconnect
+
+        # What the candidate had to do before: start over and answer again
+        await manager.connect(FakeWebSocket(), "restarting")
+        await app.handle_start_interview("restarting", start)
+        await app.handle_submit_answer("restarting", {"answer": ANSWER})
+        restart_calls = count_calls(backends) - calls_before_reconnect - resume_calls
+        for client_id in ("resuming", "restarting"):
+            app.end_session(client_id)
+            await app.session_store.delete(client_id)
+        return second, resume_calls, restart_calls
+
+    second, resume_calls, restart_calls = asyncio.run(run())
+    events = [json.loads(frame)["event"] for frame in second.frames]
+    assert events == ["connection_established", "next_question"]
+    assert json.loads(second.frames[1])["data"]["question"]
+    assert resume_calls == 0
+    assert restart_calls >= 4
+
+
+def test_live_agent_is_replaced_when_another_worker_saved_the_session(monkeypatch):
+    backends = StubBackends()
+    manager = ConnectionManager(grace_seconds=60)
+    monkeypatch.setattr(app, "client_pool", backends)
+    monkeypatch.setattr(app, "scheduler", None)
+    monkeypatch.setattr(app, "manager", manager)
+    monkeypatch.setattr(app.session_store, "shared", True)
+    start = {"job_description": JOB_DESCRIPTION, "resume": base64.b64encode(make_pdf([RESUME])).decode()}
+
+    async def run():
+        await manager.connect(FakeWebSocket(), "moving")
+        await app.handle_start_interview("moving", start)
+        stale = app.live_sessions.get("moving")
+        assert await app.get_session("moving") is stale
+
+        # The candidate reconnects to another worker and answers there
+        state = await app.session_store.load("moving")
+        other = InterviewAgent.from_state(state["agent"], **app.agent_options("moving"))
+        await other.aprocess_answer(ANSWER)
+        await app.session_store.save("moving", {**state, "agent": other.to_state(), "revision": "other-worker"})
+
+        current = await app.get_session("moving")
+        again = await app.get_session("moving")
+        app.end_session("moving")
+        await app.session_store.delete("moving")
+        return stale, current, again
+
+    stale, current, again = asyncio.run(run())
+    assert current is not stale and again is current
+    assert current.current_question_number == 2
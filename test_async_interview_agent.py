@@ -0,0 +1,228 @@
+"""
+Load test for the async InterviewAgent API.
+Uses local stub backends with artificial latency, so no OpenAI API key is needed.
+Run with pytest, or directly to print the timings.
+"""
+
+import asyncio
+import time
+from interview_agent import InterviewAgent
+from stub_backends import StubChatModel, StubSpeechClient, AsyncStubSpeechClient
+
+LATENCY = 0.02
+CONCURRENT_SESSIONS = 25
+
+
+def make_agent(latency: float = LATENCY, max_questions: int = 3, **kwargs) -> InterviewAgent:
+    return InterviewAgent(
+        job_description="Senior Python Developer with FastAPI experience",
+        resume="Jane Smith, Senior Python Developer, 6 years of experience",
+        max_questions=max_questions,
+        llm=StubChatModel(latency=latency),
+        openai_client=StubSpeechClient(latency=latency),
+        async_openai_client=AsyncStubSpeechClient(latency=latency),
+        **kwargs
+    )
+
+
+async def run_session(agent: InterviewAgent) -> dict:
+    """Drive one full interview through the async API"""
+    await agent.astart_interview()
+    response = {}
+    while not response.get("interview_complete", False):
+        response = await agent.aprocess_answer("I built a FastAPI service backed by PostgreSQL.")
+    return await agent.agenerate_feedback()
+
+
+async def time_sessions(count: int) -> float:
+    agents = [make_agent() for _ in range(count)]
+    start = time.perf_counter()
+    await asyncio.gather(*(run_session(agent) for agent in agents))
+    return time.perf_counter() - start
+
+
+def test_async_interview_flow():
+    agent = make_agent(latency=0)
+    response = asyncio.run(agent.astart_interview())
+    assert response["question_number"] == 1
+
+    response = asyncio.run(agent.aprocess_answer("An answer"))
+    assert response["interview_complete"] is False
+    assert response["question_number"] == 2
+
+    feedback = asyncio.run(agent.agenerate_feedback())
+    assert feedback["rating"] == 4
+    assert len(feedback["keyTakeaways"]) == 10
+
+
+class ConcurrencyRecordingModel(StubChatModel):
+    """Stub that records the most calls it had in flight at once"""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.active = 0
+        self.max_active = 0
+
+    async def ainvoke(self, messages, **kwargs):
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            return await super().ainvoke(messages, **kwargs)
+        finally:
+            self.active -= 1
+
+
+def test_start_interview_runs_introduction_alongside_first_question():
+    agent = make_agent(latency=0.1)
+    agent.llm = ConcurrencyRecordingModel(latency=0.1)
+    asyncio.run(agent.astart_interview())
+    # Extraction, then introduction || (question -> TTS): both calls were in flight at once
+    assert agent.llm.max_active == 2
+    assert agent.conversation_history[0].content.startswith("Hello")
+    assert agent.conversation_history[-1].content.startswith("Question 1")
+
+    agent = make_agent(latency=0, generate_introduction=False)
+    asyncio.run(agent.astart_interview())
+    assert agent.llm.calls == 2
+    assert len(agent.conversation_history) == 1
+
+
+def make_agent_with_failing_introduction(**kwargs) -> InterviewAgent:
+    agent = make_agent(**kwargs)
+    default = agent.llm._default_response
+
+    def responder(prompt):
+        if "respond with ONLY this introduction" in prompt:
+            raise RuntimeError("Introduction call failed")
+        return default(prompt)
+
+    agent.llm = StubChatModel(responder=responder)
+    return agent
+
+
+def test_failed_introduction_does_not_stop_the_interview():
+    agent = make_agent_with_failing_introduction(latency=0)
+    response = asyncio.run(agent.astart_interview())
+    assert response["question_number"] == 1
+    assert agent.introduction == ""
+    assert asyncio.run(agent.aprocess_answer("An answer"))["question_number"] == 2
+
+
+def test_failed_introduction_does_not_lose_the_streamed_first_question():
+    async def scenario():
+        agent = make_agent_with_failing_introduction(latency=0)
+        events = [event async for event in agent.astream_start_interview()]
+        return agent, events, await agent.aprocess_answer("An answer")
+
+    agent, events, response = asyncio.run(scenario())
+    assert events[-1]["event"] == "question_end" and events[-1]["question_number"] == 1
+    assert agent.context.turns[0].question == events[-1]["text"]
+    assert response["question_number"] == 2
+
+
+def test_overlapped_analysis_is_attached_after_the_answer():
+    async def scenario():
+        agent = make_agent(latency=0.1, overlap_analysis=True, generate_introduction=False)
+        agent.llm = ConcurrencyRecordingModel(latency=0.1)
+        await agent.astart_interview()
+        await agent.aprocess_answer("An answer")
+        await agent.await_pending_analyses()
+        return agent
+
+    agent = asyncio.run(scenario())
+    # The analysis ran while the next question was generated, off its critical path
+    assert agent.llm.max_active == 2
+    answer, analysis, question = agent.conversation_history[-3:]
+    assert answer.content == "An answer"
+    assert analysis.content.startswith("Analysis:")
+    assert question.content.startswith("Question 2")
+
+
+class PrefixRecordingModel(StubChatModel):
+    def __init__(self):
+        super().__init__()
+        self.prefixes = []
+
+    def _prompt_text(self, messages):
+        self.prefixes.append(messages[0].content.encode("utf-8"))
+        return super()._prompt_text(messages)
+
+
+def test_session_prefix_is_byte_identical_across_calls():
+    async def scenario():
+        agent = make_agent(latency=0, overlap_analysis=True)
+        agent.llm = PrefixRecordingModel()
+        await agent.astart_interview()
+        for _ in range(agent.max_questions):
+            async for _ in agent.astream_process_answer("An answer"):
+                pass
+        await agent.agenerate_feedback()
+        return agent
+
+    agent = asyncio.run(scenario())
+    extraction, *rest = agent.llm.prefixes
+    # Extraction, introduction, first question, analysis + question/closing per answer, feedback
+    assert len(rest) == 2 + 2 * agent.max_questions + 1
+    assert all(prefix == rest[0] for prefix in rest)
+    assert rest[0] == agent.session_prefix.encode("utf-8")
+    # The extraction call runs before the profile exists; its prefix is a byte prefix of the rest
+    assert rest[0].startswith(extraction)
+    assert b"CANDIDATE'S INFORMATION" in rest[0]
+
+
+def test_concurrent_sessions_do_not_block_each_other():
+    single = asyncio.run(time_sessions(1))
+    concurrent = asyncio.run(time_sessions(CONCURRENT_SESSIONS))
+    # Serialized sessions would take CONCURRENT_SESSIONS times as long
+    assert concurrent < single * 3
+
+
+def test_feedback_is_generated_while_the_closing_message_is_produced():
+    async def scenario():
+        agent = make_agent(latency=0.1, max_questions=1)
+        await agent.astart_interview()
+        response = await agent.aprocess_answer("An answer")
+        # Started right after the analysis, it finished alongside the closing call and its TTS
+        finished_with_closing = agent._feedback_task is not None and agent._feedback_task.done()
+        calls = agent.llm.calls
+        feedback = await agent.agenerate_feedback()
+        return agent, response, feedback, finished_with_closing, agent.llm.calls - calls
+
+    agent, response, feedback, finished_with_closing, feedback_calls = asyncio.run(scenario())
+    assert response["interview_complete"]
+    assert finished_with_closing
+    assert feedback_calls == 0
+    assert feedback["rating"] == 4
+    feedback_prompt = agent._feedback_messages()[1].content
+    assert "[4/5] Q1:" in feedback_prompt
+    assert "A1:" not in feedback_prompt
+
+
+def test_speculative_closing_is_used_unless_the_last_answer_asks_something():
+    async def scenario(answer):
+        agent = make_agent(latency=0.1, max_questions=1, speculate_closing=True)
+        await agent.astart_interview()
+        await asyncio.sleep(0.25)  # the candidate answers while the closing is prepared
+        calls = agent.llm.calls
+        response = await agent.aprocess_answer(answer)
+        await agent.agenerate_feedback()
+        return agent, response, agent.llm.calls - calls
+
+    agent, response, calls_for_answer = asyncio.run(scenario("I would shard by tenant."))
+    assert agent.speculation == {"used": 1, "discarded": 0}
+    assert response["interview_complete"]
+    assert any(key.startswith("Thank you") for key in response)
+    # The analysis and the feedback, but no closing call after the answer
+    assert calls_for_answer == 2
+
+    agent, response, calls_for_answer = asyncio.run(scenario("What does the team work on next?"))
+    assert agent.speculation == {"used": 0, "discarded": 1}
+    assert calls_for_answer == 3
+
+
+if __name__ == "__main__":
+    single = asyncio.run(time_sessions(1))
+    concurrent = asyncio.run(time_sessions(CONCURRENT_SESSIONS))
+    print(f"1 session: {single:.3f}s")
+    print(f"{CONCURRENT_SESSIONS} concurrent sessions: {concurrent:.3f}s")
+    print(f"Serialized estimate: {single * CONCURRENT_SESSIONS:.3f}s")
@@ -0,0 +1,112 @@
+"""
+Tests for the outbound call scheduler.
+"""
+
+import asyncio
+import time
+import pytest
+from call_scheduler import (CallScheduler, SchedulerBusy, PRIORITY_INTERACTIVE, PRIORITY_BACKGROUND,
+                            PRIORITY_FEEDBACK)
+from interview_agent import TTS_MODEL
+from test_async_interview_agent import make_agent
+
+
+async def queue_calls(scheduler, requests):
+    """Hold the only slot, queue (session, priority) requests, then record the grant order"""
+    order = []
+    await scheduler.acquire("model")
+
+    async def call(session_id, priority):
+        async with scheduler.slot("model", session_id, priority):
+            order.append((session_id, priority))
+
+    tasks = [asyncio.create_task(call(*request)) for request in requests]
+    await asyncio.sleep(0)
+    scheduler.release("model")
+    await asyncio.gather(*tasks)
+    return order
+
+
+def test_token_bucket_limits_request_rate():
+    async def scenario():
+        scheduler = CallScheduler({"model": {"requests_per_second": 50, "burst": 1}})
+        start = time.perf_counter()
+        for _ in range(6):
+            async with scheduler.slot("model"):
+                pass
+        return time.perf_counter() - start
+
+    assert asyncio.run(scenario()) >= 0.09
+
+
+def test_interactive_calls_jump_ahead_of_feedback():
+    scheduler = CallScheduler({"model": {"max_concurrency": 1}})
+    order = asyncio.run(queue_calls(scheduler, [("a", PRIORITY_FEEDBACK), ("b", PRIORITY_BACKGROUND),
+                                                ("c", PRIORITY_INTERACTIVE)]))
+    assert [session for session, _ in order] == ["c", "b", "a"]
+
+
+def test_sessions_are_served_round_robin():
+    scheduler = CallScheduler({"model": {"max_concurrency": 1}})
+    order = asyncio.run(queue_calls(scheduler, [("a", 0), ("a", 0), ("a", 0), ("b", 0)]))
+    assert [session for session, _ in order] == ["a", "b", "a", "a"]
+    assert scheduler.stats()["models"]["model"]["started"] == 5
+
+
+def test_full_queue_rejects_with_retry_hint():
+    async def scenario():
+        scheduler = CallScheduler({"model": {"max_concurrency": 1}}, max_queue=1)
+        notices = []
+
+        async def on_wait(info):
+            notices.append(info)
+
+        await scheduler.acquire("model")
+        waiting = asyncio.create_task(scheduler.acquire("model", "a", on_wait=on_wait))
+        await asyncio.sleep(0)
+        with pytest.raises(SchedulerBusy) as busy:
+            await scheduler.acquire("model", "b")
+        waiting.cancel()
+        await asyncio.gather(waiting, return_exceptions=True)
+        return scheduler, notices, busy.value
+
+    scheduler, notices, busy = asyncio.run(scenario())
+    assert notices[0]["position"] == 1
+    assert busy.retry_after > 0
+    assert scheduler.stats()["rejected"] == 1
+    assert scheduler.queue_depth() == 0
+
+
+def test_agent_calls_go_through_the_scheduler():
+    scheduler = CallScheduler()
+    agent = make_agent(latency=0, scheduler=scheduler, session_id="client")
+    asyncio.run(agent.astart_interview())
+    models = scheduler.stats()["models"]
+    # Extraction, introduction and first question; one TTS call
+    assert models["chat"]["started"] == 3
+    assert models[TTS_MODEL]["started"] == 1
+    assert models["chat"]["active"] == 0
+
+
+class RecordingScheduler(CallScheduler):
+    def __init__(self):
+        super().__init__()
+        self.requests = []
+
+    async def acquire(self, model, session_id="", priority=PRIORITY_INTERACTIVE, on_wait=None):
+        self.requests.append((model, priority))
+        return await super().acquire(model, session_id, priority, on_wait)
+
+
+def test_background_speech_does_not_take_interactive_slots():
+    async def scenario():
+        scheduler = RecordingScheduler()
+        agent = make_agent(latency=0, max_questions=1, speculate_closing=True, scheduler=scheduler)
+        await agent.astart_interview()
+        # The closing message and its audio are prepared while the candidate answers
+        await agent._closing_task
+        return scheduler
+
+    scheduler = asyncio.run(scenario())
+    speech = [priority for model, priority in scheduler.requests if model == TTS_MODEL]
+    assert speech == [PRIORITY_INTERACTIVE, PRIORITY_BACKGROUND]
@@ -0,0 +1,35 @@
+"""
+Tests for the shared OpenAI client pool.
+"""
+
+from client_pool import ClientPool
+from interview_agent import InterviewAgent
+
+
+def test_sessions_borrow_the_same_clients():
+    pool = ClientPool(api_key="test-key", max_connections=7, max_keepalive_connections=3, http2=False)
+    first = InterviewAgent("JD", "Resume", client_pool=pool)
+    second = InterviewAgent("JD", "Resume", client_pool=pool)
+
+    assert first.llm is second.llm
+    assert first.async_openai_client is second.async_openai_client
+    assert first.llm.async_client is pool.async_openai_client.chat.completions
+    assert pool.stats()["max_connections"] == 7
+    assert pool.async_openai_client._client._transport._pool._max_connections == 7
+
+
+def test_explicit_clients_take_precedence():
+    pool = ClientPool(api_key="test-key")
+    llm = object()
+    agent = InterviewAgent("JD", "Resume", llm=llm, client_pool=pool)
+    assert agent.llm is llm
+    assert agent.openai_client is pool.openai_client
+    assert not any(name.startswith("llm") for name in pool.stats()["clients"])
+
+
+def test_chat_models_share_the_pooled_clients():
+    pool = ClientPool(api_key="test-key")
+    fast = pool.chat_model("gpt-3.5-turbo")
+    assert fast is pool.chat_model("gpt-3.5-turbo")
+    assert fast.model_name == "gpt-3.5-turbo" and pool.llm.model_name == "gpt-4"
+    assert fast.async_client is pool.llm.async_client
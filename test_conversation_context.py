@@ -0,0 +1,68 @@
+"""
+Tests for the bounded conversation context.
+"""
+
+import asyncio
+from conversation_context import ConversationContext, estimate_tokens
+from test_async_interview_agent import make_agent
+
+
+def fill(context: ConversationContext, turns: int):
+    for number in range(1, turns + 1):
+        context.add_question(f"Question {number} about caching?")
+        context.add_answer("A long answer " * 20, f"Analysis: Answer {number} was solid.")
+
+
+def test_recent_turns_in_full_and_older_turns_summarized():
+    context = ConversationContext(max_tokens=10_000, recent_turns=2)
+    fill(context, 4)
+    transcript = context.render()
+    assert "Q1: Question 1 about caching? -> Answer 1 was solid." in transcript
+    assert "A1:" not in transcript
+    assert "A4: A long answer" in transcript
+    assert "A3: A long answer" in transcript
+
+
+def test_render_respects_token_budget():
+    context = ConversationContext(max_tokens=150, recent_turns=3)
+    fill(context, 10)
+    transcript = context.render()
+    assert estimate_tokens(transcript) <= 150 + 10
+    assert "Q10:" in transcript
+    assert "earlier questions omitted" in transcript
+
+
+def test_prompts_do_not_contain_message_reprs():
+    agent = make_agent(latency=0)
+    asyncio.run(agent.astart_interview())
+    asyncio.run(agent.aprocess_answer("I built a FastAPI service."))
+    prompt = agent._next_question_prompt()
+    assert "SystemMessage" not in prompt
+    assert "A1: I built a FastAPI service." in prompt
+    # Session prefix plus instructions; the history is not appended as messages
+    assert len(agent._feedback_messages()) == 2
+
+
+def test_turn_records_are_compact():
+    context = ConversationContext()
+    fill(context, 1)
+    turn = context.turns[0]
+    assert not hasattr(turn, "__dict__")
+    assert turn.question_tokens == estimate_tokens(turn.question)
+    assert turn.answer_tokens == estimate_tokens(turn.answer)
+    assert turn.answered_at >= turn.asked_at > 0
+
+
+def test_assessment_folds_scores_from_each_analysis():
+    context = ConversationContext()
+    context.add_question("Question 1?")
+    context.add_answer("Answer", "Analysis: Solid.\nScore: 4")
+    context.add_question("Question 2?")
+    context.add_answer("Answer", "Analysis: Vague.\nScore: 2")
+    context.add_question("Question 3?")
+    assessment = context.assessment()
+    assert assessment.splitlines() == [
+        "Average score: 3.0/5 over 2 scored answers",
+        "[4/5] Q1: Question 1? -> Solid.",
+        "[2/5] Q2: Question 2? -> Vague.",
+    ]
@@ -0,0 +1,82 @@
+"""
+Tests for turn deadlines, call timeouts, hedged requests and retries.
+"""
+
+import asyncio
+import time
+import pytest
+from deadlines import CallPolicy, DeadlineExceeded, bounded_stream, deadline, detached, remaining
+from langchain_core.messages import HumanMessage
+from stub_backends import StubChatModel, AsyncStubSpeechClient
+from test_async_interview_agent import make_agent
+
+
+def test_nested_deadlines_only_tighten_and_detached_clears_them():
+    with deadline(10):
+        with deadline(60):
+            assert remaining() <= 10
+        with detached():
+            assert remaining() is None
+    assert remaining() is None
+
+
+def test_slow_call_is_hedged_and_the_duplicate_wins():
+    policy = CallPolicy("test", hedge_percentile=0.9, hedge_min_samples=3)
+    for _ in range(5):
+        policy._window("kind").add(policy.clock(), 0.01)
+    delays = iter([1.0, 0.01])
+
+    async def call():
+        await asyncio.sleep(next(delays))
+        return "answer"
+
+    start = time.perf_counter()
+    assert asyncio.run(policy.call("kind", call)) == "answer"
+    assert time.perf_counter() - start < 0.5
+    assert (policy.hedges, policy.hedge_wins) == (1, 1)
+
+
+def test_retries_stop_at_the_turn_deadline():
+    policy = CallPolicy("test", timeout=0.05, max_retries=5, retry_backoff=0.01, hedge_percentile=0)
+    calls = []
+
+    async def stalled():
+        calls.append(1)
+        await asyncio.sleep(10)
+
+    async def run():
+        with deadline(0.2):
+            await policy.call("kind", stalled)
+
+    start = time.perf_counter()
+    with pytest.raises(DeadlineExceeded):
+        asyncio.run(run())
+    assert time.perf_counter() - start < 0.5
+    assert 1 < len(calls) <= 4
+    assert policy.timeouts == len(calls)
+
+
+def test_stalled_stream_fails_at_the_first_token_timeout():
+    model = StubChatModel(stall_rate=1.0, stall_seconds=10)
+
+    async def run():
+        async for _ in bounded_stream(model.astream([HumanMessage(content="Hello")]), "llm", first_timeout=0.05):
+            pass
+
+    with pytest.raises(DeadlineExceeded):
+        asyncio.run(run())
+
+
+def test_stalled_speech_gives_the_question_without_audio_within_the_deadline():
+    agent = make_agent(latency=0, tts_policy=CallPolicy("tts", timeout=0.1, hedge_percentile=0))
+    agent.async_openai_client = AsyncStubSpeechClient(stall_rate=1.0, stall_seconds=10)
+
+    async def run():
+        with deadline(1):
+            return await agent.astart_interview()
+
+    start = time.perf_counter()
+    response = asyncio.run(run())
+    assert time.perf_counter() - start < 1
+    question = next(key for key in response if key != "question_number")
+    assert question.startswith("Question 1") and response[question] == b""
@@ -0,0 +1,51 @@
+"""
+Tests for the resume extraction cache.
+"""
+
+import asyncio
+from extraction_cache import ExtractionCache
+from test_async_interview_agent import make_agent
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_entries_expire_after_ttl():
+    clock = FakeClock()
+    cache = ExtractionCache(ttl_seconds=60, clock=clock)
+    cache.put("Jane Smith\nPython", {"name": "Jane Smith"}, elapsed=1.5)
+
+    # Whitespace differences from re-extracting the same PDF still hit
+    assert cache.get("Jane   Smith Python ") == {"name": "Jane Smith"}
+    clock.now = 61
+    assert cache.get("Jane Smith\nPython") is None
+    assert cache.stats()["expirations"] == 1
+    assert cache.stats()["saved_seconds"] == 1.5
+
+
+def test_size_bound_evicts_least_recently_used():
+    cache = ExtractionCache(max_entries=2)
+    cache.put("a", {"name": "A"})
+    cache.put("b", {"name": "B"})
+    cache.get("a")
+    cache.put("c", {"name": "C"})
+    assert cache.get("b") is None
+    assert cache.get("a") == {"name": "A"}
+    assert cache.stats()["evictions"] == 1
+
+
+def test_repeat_start_skips_extraction_call():
+    cache = ExtractionCache()
+    first = make_agent(latency=0, extraction_cache=cache, generate_introduction=False)
+    asyncio.run(first.astart_interview())
+    assert first.llm.calls == 2
+
+    retry = make_agent(latency=0, extraction_cache=cache, generate_introduction=False)
+    asyncio.run(retry.astart_interview())
+    assert retry.llm.calls == 1
+    assert cache.stats()["hits"] == 1
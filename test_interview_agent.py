@@ -2,9 +2,11 @@
 """
 Test script for the InterviewAgent class.
 This script allows you to test the interview agent without running the web server.
+Set MODEL_BACKEND=stub to run it against the local stub backends instead of OpenAI.
 """
 
 from interview_agent import InterviewAgent
+from stub_backends import StubBackends
 import os
 from dotenv import load_dotenv
 
@@ -74,7 +76,8 @@ def test_interview():
     agent = InterviewAgent(
         job_description=job_description,
         resume=resume,
-        max_questions=3  # Using 3 for testing purposes
+        max_questions=3,  # Using 3 for testing purposes
+        client_pool=StubBackends() if os.getenv("MODEL_BACKEND") == "stub" else None
     )
     
     # Start the interview
@@ -97,15 +100,16 @@ def test_interview():
             print("Interview complete!\n")
             break
         else:
-            print(f"Question {response['question_number']}: {response['next_question']}\n")
+            next_question = next(k for k in response if k not in ("question_number", "interview_complete"))
+            print(f"Question {response['question_number']}: {next_question}\n")
     
     # Generate feedback
     feedback = agent.generate_feedback()
     print("Interview Feedback:")
-    print(feedback["detailed_feedback"])
+    print(feedback["feedback"])
 
 if __name__ == "__main__":
-    if not os.getenv("OPENAI_API_KEY"):
+    if not os.getenv("OPENAI_API_KEY") and os.getenv("MODEL_BACKEND") != "stub":
         print("Error: OPENAI_API_KEY environment variable not set. Please create a .env file with your API key.")
     else:
         test_interview()
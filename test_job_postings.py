@@ -0,0 +1,107 @@
+"""
+Tests for the job posting registry: the requirements digest and the seed question bank.
+"""
+
+import asyncio
+from interview_agent import InterviewAgent
+from job_postings import JobPosting, JobPostingRegistry
+from stub_backends import JOB_DIGEST, QUESTION_BANK
+from tts_cache import TTSCache
+from test_async_interview_agent import make_agent
+
+
+def make_registry(tts_cache):
+    return JobPostingRegistry(lambda job_description: make_agent(latency=0, tts_cache=tts_cache), bank_size=6)
+
+
+def test_posting_is_built_once_per_job_description():
+    tts_cache = TTSCache()
+    registry = make_registry(tts_cache)
+
+    async def run():
+        posting = registry.get("Senior Python Developer")
+        await posting.ready.wait()
+        return posting, registry.get("  Senior   Python Developer ")
+
+    posting, again = asyncio.run(run())
+    assert again is posting and posting.candidates == 2
+    assert posting.digest == JOB_DIGEST
+    assert len(posting.questions) == len(QUESTION_BANK["questions"])
+    assert registry.stats()["builds"] == 1
+    # The seed questions' audio is already cached
+    assert all(tts_cache.get("tts-1", "alloy", seed["question"]) for seed in posting.questions)
+
+
+def test_sessions_use_the_digest_and_draw_questions_from_the_bank():
+    tts_cache = TTSCache()
+    registry = make_registry(tts_cache)
+
+    async def run():
+        posting = registry.get("Senior Python Developer with FastAPI experience")
+        await posting.ready.wait()
+        agent = make_agent(latency=0, max_questions=4, tts_cache=tts_cache, job_posting=posting)
+        await agent.astart_interview()
+        await agent.aprocess_answer("An answer")
+        await agent.aprocess_answer("Another answer")
+        await agent.await_pending_analyses()
+        return agent
+
+    agent = asyncio.run(run())
+    questions = [turn.question for turn in agent.context.turns]
+    # Questions 1 and 3 come from the bank (best skill match first), question 2 is a generated follow-up
+    assert questions[0] == QUESTION_BANK["questions"][0]["question"]
+    assert questions[1].startswith("Question 1:")
+    assert questions[2] in {seed["question"] for seed in QUESTION_BANK["questions"][1:]}
+    assert JOB_DIGEST in agent.session_prefix and "JOB DESCRIPTION" not in agent.session_prefix
+
+    restored = InterviewAgent.from_state(agent.to_state(), llm=agent.llm, openai_client=agent.openai_client,
+                                         async_openai_client=agent.async_openai_client)
+    assert restored.session_prefix == agent.session_prefix
+
+
+class FailingBuilder:
+    def __init__(self):
+        self.builds = 0
+
+    def __call__(self, job_description):
+        return self
+
+    async def aprepare_job_posting(self, digest_messages, bank_messages):
+        self.builds += 1
+        raise RuntimeError("model unavailable")
+
+
+def test_failed_build_is_retried_only_after_a_backoff():
+    now = [0.0]
+    builder = FailingBuilder()
+    registry = JobPostingRegistry(builder, retry_seconds=10, clock=lambda: now[0])
+
+    async def build(candidates):
+        for _ in range(candidates):
+            posting = registry.get("Senior Python Developer")
+        await posting.ready.wait()
+        return posting
+
+    async def run():
+        posting = await build(3)
+        assert builder.builds == 1 and posting.candidates == 3 and posting.digest is None
+        now[0] = 10
+        await build(1)
+        assert builder.builds == 2
+        # The wait doubles after each failure in a row
+        now[0] = 25
+        await build(1)
+        assert builder.builds == 2
+        now[0] = 30
+        return await build(1)
+
+    posting = asyncio.run(run())
+    assert builder.builds == 3 and posting.failures == 3
+    assert registry.stats()["failures"] == 3 and registry.stats()["postings"] == 1
+
+
+def test_empty_skills_do_not_match_every_seed():
+    posting = JobPosting("key")
+    posting.questions = [{"question": "Tell me about Kubernetes", "skills": ["Kubernetes", ""]},
+                         {"question": "Tell me about Python", "skills": ["Python"]}]
+    assert posting.pick_question(["", " ", "python"], set()) == "Tell me about Python"
@@ -0,0 +1,55 @@
+"""
+Tests for per-prompt-kind model routing.
+"""
+
+import asyncio
+from model_router import ModelRouter, parse_mapping
+from stub_backends import StubBackends
+from test_async_interview_agent import make_agent
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_router(clock, **kwargs):
+    return ModelRouter({"quality": "gpt-4", "fast": "gpt-3.5-turbo"}, lambda model_name: model_name,
+                       clock=clock, **kwargs)
+
+
+def test_kinds_go_to_their_configured_tier():
+    router = make_router(FakeClock(), routes=parse_mapping("analysis=fast, closing=fast"))
+    assert router.route("analysis") == ("fast", "gpt-3.5-turbo")
+    assert router.route("next_question") == ("quality", "gpt-4")
+
+
+def test_falls_back_to_a_faster_tier_over_budget_until_the_samples_age_out():
+    clock = FakeClock()
+    router = make_router(clock, budgets={"next_question": 2.0}, window_seconds=60)
+    for _ in range(5):
+        router.observe("quality", "next_question", 5.0)
+    assert router.route("next_question") == ("fast", "gpt-3.5-turbo")
+    assert router.stats()["decisions"]["next_question/fast/over_budget"] == 1
+
+    clock.now += 61
+    assert router.route("next_question") == ("quality", "gpt-4")
+
+
+def test_agent_sends_each_kind_to_the_routed_model():
+    backends = StubBackends()
+    router = ModelRouter({"quality": "gpt-4", "fast": "gpt-3.5-turbo"}, backends.chat_model,
+                         routes={"extraction": "fast", "analysis": "fast"})
+    agent = make_agent(latency=0, router=router)
+
+    async def run():
+        await agent.astart_interview()
+        await agent.aprocess_answer("An answer")
+
+    asyncio.run(run())
+    calls = backends.stats()["llm_calls_by_model"]
+    # extraction and analysis on the fast tier; introduction and two questions on the quality tier
+    assert calls == {"chat": 0, "gpt-3.5-turbo": 2, "gpt-4": 3}
@@ -0,0 +1,52 @@
+"""
+Tests for the in-process metrics and sampled logging.
+"""
+
+import asyncio
+import logging
+from observability import (MetricsRegistry, SampledLogger, STAGE_SECONDS, LLM_PROMPT_TOKENS, TTS_AUDIO_BYTES,
+                           REGISTRY)
+from test_async_interview_agent import make_agent
+
+
+def test_registry_renders_prometheus_text():
+    registry = MetricsRegistry()
+    sent = registry.counter("messages_total", "Messages sent", ("event",))
+    latency = registry.histogram("latency_seconds", "Latency", ("stage",), buckets=(0.1, 1.0))
+    sent.inc(event="next_question")
+    sent.inc(2, event="next_question")
+    latency.observe(0.05, stage="llm")
+    latency.observe(5.0, stage="llm")
+
+    text = registry.render()
+    assert "# TYPE messages_total counter" in text
+    assert 'messages_total{event="next_question"} 3' in text
+    assert 'latency_seconds_bucket{stage="llm",le="0.1"} 1' in text
+    assert 'latency_seconds_bucket{stage="llm",le="1"} 1' in text
+    assert 'latency_seconds_bucket{stage="llm",le="+Inf"} 2' in text
+    assert 'latency_seconds_count{stage="llm"} 2' in text
+
+
+def test_sampled_logger_drops_info_but_keeps_warnings(caplog):
+    logger = SampledLogger(logging.getLogger("test_sampled"), rate=0.0)
+    with caplog.at_level(logging.INFO, logger="test_sampled"):
+        logger.info("per-message detail")
+        logger.warning("something went wrong")
+    assert [record.getMessage() for record in caplog.records] == ["something went wrong"]
+
+
+def test_agent_calls_are_timed_and_counted():
+    analyses = STAGE_SECONDS.count(stage="llm", kind="analysis")
+    tts_calls = STAGE_SECONDS.count(stage="tts")
+    prompt_tokens = LLM_PROMPT_TOKENS.value(kind="analysis")
+    audio_bytes = TTS_AUDIO_BYTES.value()
+
+    agent = make_agent(latency=0)
+    asyncio.run(agent.astart_interview())
+    asyncio.run(agent.aprocess_answer("An answer"))
+
+    assert STAGE_SECONDS.count(stage="llm", kind="analysis") == analyses + 1
+    assert STAGE_SECONDS.count(stage="tts") > tts_calls
+    assert LLM_PROMPT_TOKENS.value(kind="analysis") > prompt_tokens
+    assert TTS_AUDIO_BYTES.value() > audio_bytes
+    assert 'interview_stage_seconds_count{stage="llm",kind="analysis"}' in REGISTRY.render()
@@ -0,0 +1,70 @@
+"""
+Tests for process-pool resume ingestion.
+"""
+
+import asyncio
+import base64
+import pytest
+from resume_ingest import ResumeIngestor, ResumeIngestionError, normalize_text
+from fakes import make_pdf
+
+
+@pytest.fixture(scope="module")
+def ingestor():
+    ingestor = ResumeIngestor(max_workers=2, max_pages=5, max_bytes=200_000)
+    yield ingestor
+    ingestor.shutdown()
+
+
+def test_pages_are_extracted_in_order(ingestor):
+    pdf = make_pdf([f"Page {number}\nExperience with Python" for number in range(1, 5)])
+    result = asyncio.run(ingestor.ingest_base64("data:application/pdf;base64," + base64.b64encode(pdf).decode()))
+    assert result["pages"] == 4
+    assert [line for line in result["text"].split("\n") if line.startswith("Page")] == \
+        ["Page 1", "Page 2", "Page 3", "Page 4"]
+    assert set(result["timings"]) == {"count_seconds", "extract_seconds", "parse_seconds",
+                                      "decode_seconds", "total_seconds"}
+
+
+def test_limits_are_enforced(ingestor):
+    with pytest.raises(ResumeIngestionError, match="pages"):
+        asyncio.run(ingestor.ingest(make_pdf(["page"] * 6)))
+    with pytest.raises(ResumeIngestionError, match="larger"):
+        asyncio.run(ingestor.ingest_base64("A" * 300_000))
+    with pytest.raises(ResumeIngestionError, match="Could not read PDF"):
+        asyncio.run(ingestor.ingest(b"not a pdf"))
+
+
+def test_timeout_replaces_the_pool():
+    ingestor = ResumeIngestor(max_workers=1, timeout_seconds=0.001)
+    try:
+        with pytest.raises(ResumeIngestionError, match="longer than"):
+            asyncio.run(ingestor.ingest(make_pdf(["slow"])))
+        assert ingestor.executor is None
+    finally:
+        ingestor.shutdown()
+
+
+def test_a_timeout_does_not_fail_other_parses_in_the_pool():
+    ingestor = ResumeIngestor(max_workers=2)
+
+    async def scenario():
+        other = asyncio.create_task(ingestor.ingest(make_pdf(["Jane Smith", "Python"])))
+        await asyncio.sleep(0)
+        retired = ingestor.executor
+        # As a stuck parse in the same pool would when it hits the time limit
+        ingestor._retire_pool(retired, stuck=None)
+        result = await other
+        await asyncio.gather(*ingestor._retiring)
+        return retired, result
+
+    try:
+        retired, result = asyncio.run(scenario())
+        assert result["pages"] == 2
+        assert ingestor.executor is not retired and retired not in ingestor.in_flight
+    finally:
+        ingestor.shutdown()
+
+
+def test_normalize_text():
+    assert normalize_text(["Jane  \nSmith\n\n\n\n", "Python"]) == "Jane\nSmith\n\nPython"
@@ -0,0 +1,89 @@
+"""
+Tests for the live session lifecycle: idle expiry, spilling to disk and rehydration.
+"""
+
+import asyncio
+from interview_agent import InterviewAgent
+from session_lifecycle import SessionLifecycle
+from stub_backends import StubChatModel, StubSpeechClient, AsyncStubSpeechClient
+from test_async_interview_agent import make_agent
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def snapshot(session_id, agent):
+    return {'agent': agent.to_state(), 'stream': False}
+
+
+async def started_agent():
+    agent = make_agent(latency=0)
+    await agent.astart_interview()
+    await agent.aprocess_answer("First answer")
+    return agent
+
+
+def test_idle_sessions_expire_but_busy_ones_do_not(tmp_path):
+    async def scenario():
+        clock = FakeClock()
+        sessions = SessionLifecycle(snapshot, idle_seconds=60, spill_dir=str(tmp_path), clock=clock)
+        sessions.add("idle", await started_agent())
+        sessions.add("busy", await started_agent())
+        async with sessions.active("busy"):
+            clock.now += 120
+            expired = await sessions.reap()
+        return sessions, expired
+
+    sessions, expired = asyncio.run(scenario())
+    assert expired == ["idle"]
+    assert "busy" in sessions and "idle" not in sessions
+
+
+def test_session_added_during_a_request_is_busy(tmp_path):
+    async def scenario():
+        clock = FakeClock()
+        sessions = SessionLifecycle(snapshot, idle_seconds=60, max_bytes=1, spill_dir=str(tmp_path), clock=clock)
+        async with sessions.active("new"):
+            # The request starts the interview (or restores it) and registers its agent
+            agent = await started_agent()
+            sessions.add("new", agent)
+            sessions.record("new", snapshot("new", agent))
+            clock.now += 120
+            spilled = await sessions.spill("new")
+            expired = await sessions.reap()
+        return sessions, spilled, expired
+
+    sessions, spilled, expired = asyncio.run(scenario())
+    assert not spilled and expired == []
+    assert "new" in sessions and sessions.busy == {}
+
+
+def test_least_recently_active_sessions_spill_and_rehydrate(tmp_path):
+    async def scenario():
+        clock = FakeClock()
+        sessions = SessionLifecycle(snapshot, max_bytes=1, spill_dir=str(tmp_path), clock=clock)
+        for session_id in ("a", "b"):
+            agent = await started_agent()
+            sessions.add(session_id, agent)
+            sessions.record(session_id, snapshot(session_id, agent))
+            clock.now += 1
+        # Only "b" is being answered, so only "a" can be spilled
+        async with sessions.active("b"):
+            await sessions.reap()
+        stats = sessions.stats()
+        state = await sessions.take_spilled("a")
+        return sessions, stats, state
+
+    sessions, stats, state = asyncio.run(scenario())
+    assert stats["resident_sessions"] == 1 and stats["spilled_sessions"] == 1
+    assert stats["spilled_bytes"] > 0
+    assert "a" not in sessions and sessions.stats()["rehydrated"] == 1
+
+    agent = InterviewAgent.from_state(state['agent'], llm=StubChatModel(), openai_client=StubSpeechClient(),
+                                      async_openai_client=AsyncStubSpeechClient())
+    assert agent.current_question_number == 2
@@ -0,0 +1,67 @@
+"""
+Tests for serialized interview state and the session stores.
+"""
+
+import asyncio
+from interview_agent import InterviewAgent
+from session_store import InMemorySessionStore, SQLiteSessionStore
+from stub_backends import StubChatModel, StubSpeechClient, AsyncStubSpeechClient
+from test_async_interview_agent import make_agent
+
+
+def stub_clients():
+    return {
+        "llm": StubChatModel(),
+        "openai_client": StubSpeechClient(),
+        "async_openai_client": AsyncStubSpeechClient()
+    }
+
+
+def test_state_round_trip_resumes_the_interview():
+    async def scenario():
+        agent = make_agent(latency=0, overlap_analysis=True)
+        await agent.astart_interview()
+        await agent.aprocess_answer("First answer")
+        await agent.await_pending_analyses()
+
+        restored = InterviewAgent.from_state(agent.to_state(), **stub_clients())
+        assert restored.session_prefix == agent.session_prefix
+        assert restored._transcript() == agent._transcript()
+        assert restored._analysis_prompt("x") == agent._analysis_prompt("x")
+
+        response = await restored.aprocess_answer("Second answer")
+        return restored, response
+
+    restored, response = asyncio.run(scenario())
+    assert response["question_number"] == 3
+    assert [turn.answer for turn in restored.context.turns[:2]] == ["First answer", "Second answer"]
+
+
+def test_states_saved_before_the_job_digest_are_restored():
+    agent = make_agent(latency=0)
+    asyncio.run(agent.astart_interview())
+    state = agent.to_state()
+    del state["job_digest"]
+    state["version"] = 1
+
+    restored = InterviewAgent.from_state(state, **stub_clients())
+    assert restored.job_digest is None
+    assert restored.session_prefix == agent.session_prefix
+
+
+def test_sqlite_store_is_shared_between_workers(tmp_path):
+    path = str(tmp_path / "sessions.db")
+    worker_a, worker_b = SQLiteSessionStore(path), SQLiteSessionStore(path)
+    state = make_agent(latency=0).to_state()
+
+    asyncio.run(worker_a.save("client", {"agent": state, "stream": False}))
+    assert asyncio.run(worker_b.load("client")) == {"agent": state, "stream": False}
+
+    asyncio.run(worker_b.delete("client"))
+    assert asyncio.run(worker_a.load("client")) is None
+
+
+def test_expired_sessions_are_not_loaded():
+    store = InMemorySessionStore(ttl_seconds=-1)
+    asyncio.run(store.save("client", {"agent": {}}))
+    assert asyncio.run(store.load("client")) is None
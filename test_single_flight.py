@@ -0,0 +1,109 @@
+"""
+Tests for single-flight coalescing of duplicate in-flight requests.
+"""
+
+import asyncio
+import pytest
+from single_flight import SingleFlight, SingleFlightConflict, payload_hash
+from observability import SINGLE_FLIGHT_COALESCED
+from test_async_interview_agent import make_agent
+
+
+def test_concurrent_duplicates_share_one_call():
+    flights = SingleFlight("test")
+    calls = []
+
+    async def call():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return {"question_number": 1}
+
+    async def run():
+        first = await asyncio.gather(*(flights.do("session:start", call) for _ in range(3)))
+        # Once finished, the next request runs again
+        second = await flights.do("session:start", call)
+        return first, second
+
+    before = SINGLE_FLIGHT_COALESCED.value(operation="test")
+    first, second = asyncio.run(run())
+    assert len(calls) == 2
+    assert first[0] is first[1] is first[2]
+    assert second == {"question_number": 1}
+    assert SINGLE_FLIGHT_COALESCED.value(operation="test") == before + 2
+    assert flights.stats() == {"in_flight": 0, "calls": 2, "coalesced": 2}
+
+
+def test_errors_reach_every_waiter_and_leader_cancellation_does_not():
+    flights = SingleFlight("test")
+
+    async def failing():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("429 Too Many Requests")
+
+    async def slow():
+        await asyncio.sleep(0.02)
+        return "done"
+
+    async def run():
+        results = await asyncio.gather(flights.do("a", failing), flights.do("a", failing), return_exceptions=True)
+        leader = asyncio.create_task(flights.do("b", slow))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(flights.do("b", slow))
+        await asyncio.sleep(0)
+        leader.cancel()
+        return results, await follower
+
+    results, follower = asyncio.run(run())
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert follower == "done"
+
+
+def test_a_different_payload_for_a_key_in_flight_is_refused():
+    flights = SingleFlight("test")
+
+    async def answer(text):
+        await asyncio.sleep(0.01)
+        return text
+
+    async def run():
+        first = asyncio.create_task(flights.do("client:submit_answer", lambda: answer("A"),
+                                               fingerprint=payload_hash({"answer": "A"})))
+        await asyncio.sleep(0)
+        duplicate = asyncio.create_task(flights.do("client:submit_answer", lambda: answer("A"),
+                                                   fingerprint=payload_hash({"answer": "A"})))
+        await asyncio.sleep(0)
+        with pytest.raises(SingleFlightConflict):
+            await flights.do("client:submit_answer", lambda: answer("B"), fingerprint=payload_hash({"answer": "B"}))
+        return await first, await duplicate, await flights.do("client:submit_answer", lambda: answer("B"))
+
+    first, duplicate, after = asyncio.run(run())
+    assert first == duplicate == "A" and after == "B"
+    assert flights.stats() == {"in_flight": 0, "calls": 2, "coalesced": 1}
+
+
+def test_sessions_starting_with_the_same_resume_share_one_extraction():
+    agents = [make_agent(latency=0.02) for _ in range(3)]
+    for agent in agents[1:]:
+        agent.llm = agents[0].llm
+        agent.async_openai_client = agents[0].async_openai_client
+
+    async def run():
+        return await asyncio.gather(*(agent.astart_interview() for agent in agents))
+
+    asyncio.run(run())
+    # One extraction, introduction and first question per session would be 9 calls
+    assert agents[0].llm.calls == 1 + 2 * len(agents)
+    assert all(agent.personal_info == agents[0].personal_info for agent in agents)
+
+
+def test_identical_speech_in_flight_is_synthesized_once():
+    agents = [make_agent(latency=0.02) for _ in range(3)]
+    for agent in agents[1:]:
+        agent.async_openai_client = agents[0].async_openai_client
+
+    async def run():
+        return await asyncio.gather(*(agent._agenerate_audio("Thank you for your time today.") for agent in agents))
+
+    audio = asyncio.run(run())
+    assert agents[0].async_openai_client.calls == 1
+    assert audio[0] and audio[0] == audio[1] == audio[2]
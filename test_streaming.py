@@ -0,0 +1,60 @@
+"""
+Tests for the sentence-chunked streaming pipeline.
+"""
+
+import asyncio
+import time
+from streaming import SentenceChunker, stream_sentence_audio
+from test_async_interview_agent import make_agent
+
+
+async def words(text: str, delay: float = 0.0):
+    for word in text.split(" "):
+        await asyncio.sleep(delay)
+        yield word + " "
+
+
+def test_chunker_cuts_at_sentence_boundaries():
+    chunker = SentenceChunker(min_chars=10)
+    sentences = []
+    for part in ["Hello there, candidate. Dr. ", "Smith will ", "join us. What is your ", "name?"]:
+        sentences += chunker.feed(part)
+    assert sentences == ["Hello there, candidate.", "Dr. Smith will join us."]
+    assert chunker.flush() == ["What is your name?"]
+
+
+def test_audio_is_yielded_in_order_while_text_is_streaming():
+    async def synthesize(sentence: str) -> str:
+        # Later sentences finish first; output must still be in order
+        await asyncio.sleep(0.05 if sentence.startswith("First") else 0.0)
+        return sentence.upper()
+
+    async def collect():
+        start = time.perf_counter()
+        results = []
+        text = "First sentence is here. Second sentence follows it. Third one ends it."
+        async for index, sentence, audio in stream_sentence_audio(words(text, 0.01), synthesize):
+            results.append((index, audio, time.perf_counter() - start))
+        return results
+
+    results = asyncio.run(collect())
+    assert [index for index, _, _ in results] == [0, 1, 2]
+    assert results[0][1] == "FIRST SENTENCE IS HERE."
+    # First audio arrives before the whole text has streamed and been synthesized
+    assert results[0][2] < results[-1][2]
+
+
+def test_streamed_interview_matches_recorded_history():
+    async def scenario():
+        agent = make_agent(latency=0)
+        events = [event async for event in agent.astream_start_interview()]
+        events += [event async for event in agent.astream_process_answer("An answer")]
+        return agent, events
+
+    agent, events = asyncio.run(scenario())
+    ends = [event for event in events if event["event"] == "question_end"]
+    assert [end["question_number"] for end in ends] == [1, 2]
+    chunks = [event for event in events if event["event"] == "question_chunk"]
+    assert len(chunks) == 4
+    assert agent.conversation_history[-1].content == ends[-1]["text"]
+    assert agent.conversation_history[0].content.startswith("Hello")
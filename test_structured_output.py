@@ -0,0 +1,74 @@
+"""
+Tests for structured outputs: tolerant parsing, schema validation and the repair call.
+"""
+
+import asyncio
+import json
+import pytest
+from langchain_core.messages import AIMessage
+from stub_backends import StubChatModel, PERSONAL_INFO
+from structured_output import (FEEDBACK_SCHEMA, PERSONAL_INFO_SCHEMA, StructuredOutputError, parse_json,
+                               parse_structured, response_format, response_text)
+from test_async_interview_agent import make_agent
+
+
+@pytest.mark.parametrize("text", [
+    'Here is the profile:\n```json\n{"name": "Jane", "skills": ["Python",],}\n```\nLet me know!',
+    "{'name': 'Jane'} is not JSON, but {\"name\": \"Jane\", \"skills\": [\"Python\"]} is",
+    '{"name": “Jane”, "skills": ["Python", "Fast',
+    '{"name": "Jane", "skills": ["Python"], "remote": True, "manag',
+])
+def test_json_is_recovered_from_wrapped_and_cut_off_outputs(text):
+    data, clean = parse_json(text)
+    assert not clean
+    assert data["name"] == "Jane" and data["skills"][0] == "Python"
+
+
+def test_prose_without_an_object_is_an_error():
+    with pytest.raises(StructuredOutputError):
+        parse_json("I'm sorry, I can't help with that.")
+
+
+@pytest.mark.parametrize("text", ['{"name": Müller}', '{"a": ñ}'])
+def test_non_ascii_bare_words_are_a_structured_output_error(text):
+    with pytest.raises(StructuredOutputError):
+        parse_json(text)
+
+
+def test_cut_off_member_with_a_non_ascii_bare_word_is_dropped():
+    assert parse_json('{"name": "Jane", "city": Zürich, "x')[0] == {"name": "Jane"}
+
+
+def test_validation_coerces_types_and_keeps_real_takeaways():
+    feedback, clean = parse_structured(json.dumps({
+        "rating": "4/5", "feedback": "Solid.", "keyTakeaways": "- Clear answers\n- Knows FastAPI", "extra": 1
+    }), FEEDBACK_SCHEMA)
+    assert clean
+    assert feedback == {"rating": 4, "feedback": "Solid.", "keyTakeaways": ["Clear answers", "Knows FastAPI"]}
+    with pytest.raises(StructuredOutputError):
+        parse_structured('{"rating": 4}', FEEDBACK_SCHEMA)
+
+
+def test_function_call_format_and_response():
+    options = response_format(PERSONAL_INFO_SCHEMA, "function")
+    assert options["function_call"] == {"name": "personal_info"}
+    assert "minItems" not in json.dumps(response_format(FEEDBACK_SCHEMA, "json_schema"))
+    message = AIMessage(content="", additional_kwargs={"function_call": {"name": "personal_info", "arguments": "{}"}})
+    assert response_text(message) == "{}"
+
+
+def test_unusable_extraction_is_repaired_with_a_short_call():
+    agent = make_agent(latency=0)
+    default = agent.llm._default_response
+
+    def responder(prompt):
+        if "Extract the following personal information" in prompt:
+            return "The candidate is Jane Smith, a Senior Python Developer with 6 years of experience."
+        return default(prompt)
+
+    agent.llm = StubChatModel(responder=responder)
+    personal_info = asyncio.run(agent._aextract_uncached())
+    assert personal_info == PERSONAL_INFO
+    # The repair prompt carries the broken output, not the session prefix
+    assert agent.llm.calls == 2
+    assert agent.llm.prompt_tokens[1] < agent.llm.prompt_tokens[0]
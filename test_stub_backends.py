@@ -0,0 +1,49 @@
+"""
+Tests for the local stub backends.
+"""
+
+import asyncio
+import pytest
+from langchain_core.messages import HumanMessage
+from stub_backends import StubBackends, StubBackendError, StubChatModel, latency_distribution, sample
+
+
+def test_latency_distributions_are_reproducible():
+    first = latency_distribution("lognormal:0.3,0.5", seed=7)
+    second = latency_distribution("lognormal:0.3,0.5", seed=7)
+    samples = [sample(first) for _ in range(200)]
+    assert samples == [sample(second) for _ in range(200)]
+    assert 0.2 < sorted(samples)[100] < 0.45
+    assert latency_distribution("0.25") == 0.25
+    assert all(0.1 <= sample(latency_distribution("uniform:0.1,0.2")) <= 0.2 for _ in range(50))
+    with pytest.raises(ValueError):
+        latency_distribution("pareto:1,2")
+
+
+def test_failure_injection():
+    model = StubChatModel(failure_rate=0.3, seed=1)
+
+    async def call():
+        try:
+            await model.ainvoke([HumanMessage(content="hi")])
+            return True
+        except StubBackendError:
+            return False
+
+    async def run():
+        return await asyncio.gather(*(call() for _ in range(200)))
+
+    results = asyncio.run(run())
+    assert model.failures == results.count(False)
+    assert 40 < model.failures < 80
+
+
+def test_stub_backends_drive_an_agent():
+    from interview_agent import InterviewAgent
+
+    backends = StubBackends()
+    agent = InterviewAgent("JD", "Resume", max_questions=1, client_pool=backends)
+    asyncio.run(agent.astart_interview())
+    assert backends.stats()["llm_calls"] == 3
+    # Long-running servers don't accumulate per-call records
+    assert backends.llm.prompt_tokens == []
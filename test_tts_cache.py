@@ -0,0 +1,46 @@
+"""
+Tests for the content-addressed TTS cache.
+"""
+
+import asyncio
+import audio_protocol
+from tts_cache import TTSCache, CachedAudio
+from test_async_interview_agent import make_agent
+
+
+def test_lru_is_bounded_by_bytes():
+    cache = TTSCache(max_bytes=CachedAudio(b"x" * 30).cost * 2)
+    for text in ("one", "two", "three"):
+        cache.put("tts-1", "alloy", text, b"x" * 30)
+    assert cache.get("tts-1", "alloy", "one") is None
+    assert cache.get("tts-1", "alloy", "three") == b"x" * 30
+    assert cache.stats()["evictions"] == 1
+    assert cache.stats()["misses"] == 1
+    assert cache.stats()["hits"] == 1
+
+
+def test_key_covers_model_and_voice():
+    cache = TTSCache()
+    cache.put("tts-1", "alloy", "Hello", b"alloy audio")
+    assert cache.get("tts-1", "nova", "Hello") is None
+    assert cache.get("tts-1-hd", "alloy", "Hello") is None
+
+
+def test_disk_tier_survives_restart(tmp_path):
+    TTSCache(disk_dir=str(tmp_path)).put("tts-1", "alloy", "Thank you", b"closing audio")
+
+    restarted = TTSCache(disk_dir=str(tmp_path))
+    assert restarted.get("tts-1", "alloy", "Thank you") == b"closing audio"
+    assert restarted.stats()["disk_hits"] == 1
+    assert restarted.stats()["disk_bytes"] == len(b"closing audio")
+
+
+def test_hits_skip_tts_and_base64_reencoding():
+    cache = TTSCache()
+    first, second = make_agent(latency=0, tts_cache=cache), make_agent(latency=0, tts_cache=cache)
+    audio = asyncio.run(first._agenerate_audio("Thank you for your time."))
+    cached = asyncio.run(second._agenerate_audio("Thank you for your time."))
+
+    assert second.async_openai_client.calls == 0
+    assert cached is audio
+    assert audio_protocol.encode_base64_audio(cached) is audio_protocol.encode_base64_audio(audio)
@@ -0,0 +1,161 @@
+"""
+Content-addressed cache for text-to-speech audio.
+
+Entries are keyed by a hash of (model, voice, text). A byte-bounded in-memory LRU
+sits in front of an optional on-disk tier (one file per key, read through mmap) that
+survives restarts. Cached audio remembers its base64 form, so a hit can be written
+to the WebSocket without being re-encoded.
+"""
+
+import base64
+import hashlib
+import mmap
+import os
+import tempfile
+from collections import OrderedDict
+from typing import Dict, Optional
+from observability import get_logger
+
+logger = get_logger(__name__)
+
+
+class CachedAudio(bytes):
+    """Audio bytes that keep their base64 encoding once it has been computed"""
+
+    _base64: Optional[str] = None
+
+    def base64(self) -> str:
+        if self._base64 is None:
+            self._base64 = base64.b64encode(self).decode('utf-8')
+        return self._base64
+
+    @property
+    def cost(self) -> int:
+        """Bytes charged against the cache budget: raw audio plus its base64 form"""
+        return len(self) + 4 * ((len(self) + 2) // 3)
+
+
+def cache_key(model: str, voice: str, text: str) -> str:
+    return hashlib.sha256(f"{model}\0{voice}\0{text}".encode("utf-8")).hexdigest()
+
+
+class TTSCache:
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024, disk_dir: Optional[str] = None,
+                 max_disk_bytes: int = 1024 * 1024 * 1024):
+        """
+        Initialize the cache
+        
+        Args:
+            max_bytes (int): Memory budget for the LRU tier
+            disk_dir (str): Optional directory for the persistent tier
+            max_disk_bytes (int): Size budget for the persistent tier
+        """
+        self.max_bytes = max_bytes
+        self.disk_dir = disk_dir
+        self.max_disk_bytes = max_disk_bytes
+        self.entries: "OrderedDict[str, CachedAudio]" = OrderedDict()
+        self.current_bytes = 0
+        self.disk_bytes = 0
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.disk_evictions = 0
+
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+            self.disk_bytes = sum(entry.stat().st_size for entry in os.scandir(disk_dir) if entry.name.endswith(".mp3"))
+
+    def _disk_path(self, key: str) -> str:
+        return os.path.join(self.disk_dir, f"{key}.mp3")
+
+    def get(self, model: str, voice: str, text: str) -> Optional[CachedAudio]:
+        """Return the cached audio for this text, or None"""
+        key = cache_key(model, voice, text)
+        audio = self.entries.get(key)
+        if audio is not None:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return audio
+
+        audio = self._read_disk(key)
+        if audio is not None:
+            self.disk_hits += 1
+            self._remember(key, audio)
+            return audio
+
+        self.misses += 1
+        return None
+
+    def put(self, model: str, voice: str, text: str, audio: bytes) -> CachedAudio:
+        """Store audio in both tiers and return it as CachedAudio"""
+        key = cache_key(model, voice, text)
+        audio = CachedAudio(audio)
+        self._remember(key, audio)
+        self._write_disk(key, audio)
+        return audio
+
+    def _remember(self, key: str, audio: CachedAudio):
+        if audio.cost > self.max_bytes:
+            return
+        if key in self.entries:
+            self.current_bytes -= self.entries.pop(key).cost
+        self.entries[key] = audio
+        self.current_bytes += audio.cost
+        while self.current_bytes > self.max_bytes:
+            _, evicted = self.entries.popitem(last=False)
+            self.current_bytes -= evicted.cost
+            self.evictions += 1
+
+    def _read_disk(self, key: str) -> Optional[CachedAudio]:
+        if not self.disk_dir:
+            return None
+        try:
+            with open(self._disk_path(key), "rb") as f:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    audio = CachedAudio(mapped)
+            # Refresh the mtime so disk eviction is least-recently-used too
+            os.utime(self._disk_path(key))
+            return audio
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def _write_disk(self, key: str, audio: bytes):
+        if not self.disk_dir or os.path.exists(self._disk_path(key)):
+            return
+        try:
+            # Write to a temporary file first so readers never see a partial entry
+            fd, temp_path = tempfile.mkstemp(dir=self.disk_dir, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(audio)
+            os.replace(temp_path, self._disk_path(key))
+            self.disk_bytes += len(audio)
+            if self.disk_bytes > self.max_disk_bytes:
+                self._evict_disk()
+        except OSError as e:
+            logger.error("Error writing TTS cache entry: %s", e)
+
+    def _evict_disk(self):
+        files = sorted(
+            (entry for entry in os.scandir(self.disk_dir) if entry.name.endswith(".mp3")),
+            key=lambda entry: entry.stat().st_mtime
+        )
+        for entry in files:
+            if self.disk_bytes <= self.max_disk_bytes:
+                break
+            size = entry.stat().st_size
+            os.remove(entry.path)
+            self.disk_bytes -= size
+            self.disk_evictions += 1
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "disk_evictions": self.disk_evictions,
+            "entries": len(self.entries),
+            "bytes": self.current_bytes,
+            "disk_bytes": self.disk_bytes,
+        }